@@ -1,11 +1,14 @@
 """
 AI API endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel, Field
 from backend.services import ai_service, recommendation_service, mood_service, journal_service
 from backend.core.dependencies import get_current_user
+from backend.core.etag import not_modified
+from backend.core.pagination import decode_cursor, listing_scope, set_next_cursor
+from backend.core.responses import FastJSONResponse, model_response
 
 router = APIRouter()
 
@@ -65,11 +68,23 @@ async def chat_with_ai(
 
 @router.get("/chat/history", response_model=List[ChatHistoryItem])
 async def get_chat_history(
+    response: Response,
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
-    """Get chat history for the current user."""
-    chat_history = await ai_service.get_chat_history(current_user["user_id"], limit)
+    """Get the latest chat history of the current user, oldest first.
+
+    When older messages exist, the X-Next-Cursor header holds the ``cursor``
+    of the page before this one.
+    """
+    scope = listing_scope(current_user["user_id"], "chat_history")
+    chat_history, position = await ai_service.get_chat_history_page(
+        current_user["user_id"],
+        limit,
+        after=decode_cursor(cursor, scope)
+    )
+    set_next_cursor(response, position, scope)
 
     # Format response
     history_items = [
@@ -82,7 +97,7 @@ async def get_chat_history(
         for message in chat_history
     ]
 
-    return history_items
+    return model_response(List[ChatHistoryItem], history_items, response)
 
 @router.get("/legacy-recommendations", response_model=Recommendations)
 async def get_legacy_recommendations(
@@ -121,9 +136,18 @@ async def get_ai_recommendations(
 
 @router.get("/suggestions")
 async def get_ai_suggestions(
+    request: Request,
+    response: Response,
     current_user: dict = Depends(get_current_user)
 ):
-    """Get AI suggestions based on user context (legacy endpoint)."""
+    """Get AI suggestions based on user context (legacy endpoint).
+
+    Returned with an ETag; ``If-None-Match`` with it gets 304 until a mood
+    entry or medication changes.
+    """
+    cached = await not_modified(request, response, current_user["user_id"], "ai/suggestions", ["moods", "medications"])
+    if cached:
+        return cached
     suggestions = await ai_service.generate_ai_suggestions(current_user["user_id"])
     return suggestions
 
@@ -134,7 +158,8 @@ async def get_visualization_data(
 ):
     """Get data for visualizations."""
     data = await ai_service.get_visualization_data(current_user["user_id"], data_type)
-    return data
+    # The raw items need no jsonable_encoder pass
+    return FastJSONResponse(data)
 
 @router.post("/feedback")
 async def submit_feedback(
@@ -1,10 +1,11 @@
 """
 Authentication API endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from backend.schemas.auth import UserCreate, UserLogin, UserUpdate, PasswordChange, Token, UserResponse
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from backend.schemas.auth import UserCreate, UserLogin, UserUpdate, PasswordChange, Token, RefreshRequest, UserResponse
 from backend.services import auth_service
-from backend.core.dependencies import get_current_user
+from backend.core.dependencies import get_current_user, get_current_user_profile
 from backend.core.exceptions import AuthException, NotFoundException
 
 router = APIRouter()
@@ -19,23 +20,37 @@ async def register(user_data: UserCreate):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 @router.post("/login", response_model=Token)
-async def login(user_data: UserLogin):
+async def login(user_data: UserLogin, request: Request):
     """Login a user."""
+    client_ip = request.client.host if request.client else None
     try:
-        user = await auth_service.authenticate_user(user_data.email, user_data.password)
-        access_token = await auth_service.create_user_token(user["user_id"])
-        return {"access_token": access_token, "token_type": "bearer"}
+        user = await auth_service.authenticate_user(user_data.email, user_data.password, client_ip)
+        access_token = await auth_service.create_user_token(user["user_id"], user.get("email"))
+        refresh_token = await auth_service.create_refresh_token(user["user_id"], user.get("email"))
+        return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
     except AuthException as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
 
 @router.post("/refresh", response_model=Token)
-async def refresh_token(current_user: dict = Depends(get_current_user)):
-    """Refresh a user's token."""
-    access_token = await auth_service.create_user_token(current_user["user_id"])
-    return {"access_token": access_token, "token_type": "bearer"}
+async def refresh_token(refresh_data: Optional[RefreshRequest] = None):
+    """Exchange a refresh token for a new access token and refresh token."""
+    if refresh_data is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token required")
+    try:
+        return await auth_service.refresh_session(refresh_data.refresh_token)
+    except AuthException as e:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(refresh_data: RefreshRequest):
+    """End the session of a refresh token."""
+    try:
+        await auth_service.revoke_refresh_token(refresh_data.refresh_token)
+    except AuthException as e:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
 
 @router.get("/me", response_model=UserResponse)
-async def get_user_profile(current_user: dict = Depends(get_current_user)):
+async def get_user_profile(current_user: dict = Depends(get_current_user_profile)):
     """Get the current user's profile."""
     return current_user
 
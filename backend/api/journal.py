@@ -1,11 +1,13 @@
 """
 Journal API endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from typing import List, Optional
 from backend.schemas.journal import JournalCreate, JournalUpdate, JournalResponse
 from backend.services import journal_service
 from backend.core.dependencies import get_current_user
+from backend.core.pagination import decode_cursor, listing_scope, set_next_cursor
+from backend.core.responses import model_response
 from backend.core.exceptions import NotFoundException
 
 router = APIRouter()
@@ -24,19 +26,28 @@ async def create_journal_entry(
 
 @router.get("", response_model=List[JournalResponse])
 async def list_journal_entries(
+    response: Response,
     limit: int = Query(100, ge=1, le=1000),
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
-    """List journal entries for the current user."""
-    journal_entries = await journal_service.list_journal_entries(
+    """List journal entries for the current user, newest first.
+
+    When more entries follow, the X-Next-Cursor header holds the ``cursor``
+    of the next page.
+    """
+    scope = listing_scope(current_user["user_id"], "journal", start_date, end_date)
+    journal_entries, position = await journal_service.list_journal_entries_page(
         current_user["user_id"],
         limit,
         start_date,
-        end_date
+        end_date,
+        after=decode_cursor(cursor, scope)
     )
-    return journal_entries
+    set_next_cursor(response, position, scope)
+    return model_response(List[JournalResponse], journal_entries, response)
 
 @router.get("/search", response_model=List[JournalResponse])
 async def search_journal_entries(
@@ -52,7 +63,7 @@ async def search_journal_entries(
         tags,
         limit
     )
-    return journal_entries
+    return model_response(List[JournalResponse], journal_entries)
 
 @router.get("/{entry_id}", response_model=JournalResponse)
 async def get_journal_entry(
@@ -1,11 +1,13 @@
 """
 Medication API endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, File, UploadFile, Query
 from typing import List, Optional
 from backend.schemas.medication import MedicationCreate, MedicationUpdate, MedicationResponse
 from backend.services import medication_service
 from backend.core.dependencies import get_current_user
+from backend.core.pagination import DEFAULT_PAGE_SIZE, decode_cursor, listing_scope, set_next_cursor
+from backend.core.responses import model_response
 from backend.core.exceptions import NotFoundException
 
 router = APIRouter()
@@ -24,15 +26,34 @@ async def create_medication(
 
 @router.get("", response_model=List[MedicationResponse])
 async def list_medications(
+    response: Response,
     query: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
-    """List all medications for the current user."""
+    """List the medications of the current user.
+
+    Without ``limit`` or ``cursor`` all medications are returned. Otherwise
+    one page is, and when more medications follow, the X-Next-Cursor header
+    holds the ``cursor`` of the next page. Searching with ``query`` returns
+    every match and ignores paging.
+    """
     if query:
         medications = await medication_service.search_medications(current_user["user_id"], query)
-    else:
+        return model_response(List[MedicationResponse], medications)
+    if limit is None and cursor is None:
         medications = await medication_service.list_medications(current_user["user_id"])
-    return medications
+        return model_response(List[MedicationResponse], medications)
+
+    scope = listing_scope(current_user["user_id"], "medications")
+    medications, position = await medication_service.list_medications_page(
+        current_user["user_id"],
+        limit or DEFAULT_PAGE_SIZE,
+        after=decode_cursor(cursor, scope)
+    )
+    set_next_cursor(response, position, scope)
+    return model_response(List[MedicationResponse], medications, response)
 
 @router.get("/{medication_id}", response_model=MedicationResponse)
 async def get_medication(
@@ -1,11 +1,14 @@
 """
 Mood tracking API endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
 from typing import List, Optional
 from backend.schemas.mood import MoodCreate, MoodUpdate, MoodResponse, MoodStats
 from backend.services import mood_service
 from backend.core.dependencies import get_current_user
+from backend.core.etag import not_modified, window_end
+from backend.core.pagination import decode_cursor, listing_scope, set_next_cursor
+from backend.core.responses import model_response
 from backend.core.exceptions import NotFoundException
 
 router = APIRouter()
@@ -24,27 +27,47 @@ async def create_mood_entry(
 
 @router.get("", response_model=List[MoodResponse])
 async def list_mood_entries(
+    response: Response,
     limit: int = Query(100, ge=1, le=1000),
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
-    """List mood entries for the current user."""
-    mood_entries = await mood_service.list_mood_entries(
+    """List mood entries for the current user, newest first.
+
+    When more entries follow, the X-Next-Cursor header holds the ``cursor``
+    of the next page.
+    """
+    scope = listing_scope(current_user["user_id"], "moods", start_date, end_date)
+    mood_entries, position = await mood_service.list_mood_entries_page(
         current_user["user_id"],
         limit,
         start_date,
-        end_date
+        end_date,
+        after=decode_cursor(cursor, scope)
     )
-    return mood_entries
+    set_next_cursor(response, position, scope)
+    return model_response(List[MoodResponse], mood_entries, response)
 
 @router.get("/stats", response_model=MoodStats)
 async def get_mood_statistics(
+    request: Request,
+    response: Response,
     days: int = Query(30, ge=1, le=365),
     current_user: dict = Depends(get_current_user)
 ):
-    """Get mood statistics for the current user."""
-    stats = await mood_service.get_mood_statistics(current_user["user_id"], days)
+    """Get mood statistics for the current user.
+
+    The statistics run up to the end of the current ETag window and are
+    returned with an ETag; ``If-None-Match`` with it gets 304 until a mood
+    entry changes or the window ends.
+    """
+    now = window_end()
+    cached = await not_modified(request, response, current_user["user_id"], "moods/stats", ["moods"], days, now)
+    if cached:
+        return cached
+    stats = await mood_service.get_mood_statistics(current_user["user_id"], days, now=now)
     return stats
 
 @router.get("/{entry_id}", response_model=MoodResponse)
@@ -1,11 +1,15 @@
 """
 Reminder API endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from datetime import datetime
 from typing import List, Optional
 from backend.schemas.reminder import ReminderCreate, ReminderUpdate, ReminderResponse, ReminderStatusUpdate
 from backend.services import reminder_service
 from backend.core.dependencies import get_current_user
+from backend.core.etag import not_modified
+from backend.core.pagination import DEFAULT_PAGE_SIZE, decode_cursor, listing_scope, set_next_cursor
+from backend.core.responses import model_response
 from backend.core.exceptions import NotFoundException
 
 router = APIRouter()
@@ -27,19 +31,49 @@ async def create_reminder(
 
 @router.get("", response_model=List[ReminderResponse])
 async def list_reminders(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
-    """List all reminders for the current user."""
-    reminders = await reminder_service.list_reminders(current_user["user_id"])
-    return reminders
+    """List the reminders of the current user, ordered by scheduled time.
+
+    Without ``limit`` or ``cursor`` all reminders are returned. Otherwise one
+    page is, and when more reminders follow, the X-Next-Cursor header holds
+    the ``cursor`` of the next page.
+    """
+    if limit is None and cursor is None:
+        reminders = await reminder_service.list_reminders(current_user["user_id"])
+        return model_response(List[ReminderResponse], reminders)
+
+    scope = listing_scope(current_user["user_id"], "reminders")
+    reminders, position = await reminder_service.list_reminders_page(
+        current_user["user_id"],
+        limit or DEFAULT_PAGE_SIZE,
+        after=decode_cursor(cursor, scope)
+    )
+    set_next_cursor(response, position, scope)
+    return model_response(List[ReminderResponse], reminders, response)
 
 @router.get("/today", response_model=List[ReminderResponse])
 async def get_today_reminders(
+    request: Request,
+    response: Response,
     current_user: dict = Depends(get_current_user)
 ):
-    """Get today's reminders for the current user."""
-    reminders = await reminder_service.get_today_reminders(current_user["user_id"])
-    return reminders
+    """Get today's reminders for the current user.
+
+    Returned with an ETag; ``If-None-Match`` with it gets 304 until a
+    reminder or medication changes or the (UTC) day ends.
+    """
+    today = datetime.utcnow().date()
+    cached = await not_modified(
+        request, response, current_user["user_id"], "reminders/today", ["reminders", "medications"], today
+    )
+    if cached:
+        return cached
+    reminders = await reminder_service.get_today_reminders(current_user["user_id"], today)
+    return model_response(List[ReminderResponse], reminders, response)
 
 @router.get("/upcoming", response_model=List[ReminderResponse])
 async def get_upcoming_reminders(
@@ -48,7 +82,7 @@ async def get_upcoming_reminders(
 ):
     """Get upcoming reminders for the current user."""
     reminders = await reminder_service.get_upcoming_reminders(current_user["user_id"], days)
-    return reminders
+    return model_response(List[ReminderResponse], reminders)
 
 @router.get("/{reminder_id}", response_model=ReminderResponse)
 async def get_reminder(
@@ -17,12 +17,84 @@ class Settings(BaseSettings):
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-for-development-only")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30  # Refresh sessions expire after this long without being used
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000  # Verified access tokens whose claims are cached; 0 disables the cache
+    USER_CACHE_TTL_SECONDS: int = 30  # How long authenticated users are cached; 0 disables the cache
+    USER_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_TRUST_TOKEN_CLAIMS: bool = False  # Take user_id/email from the token without reading the user
+
+    # Login Throttling Settings: token buckets per email and per client IP; a burst of 0 disables one
+    LOGIN_THROTTLE_EMAIL_BURST: int = 5
+    LOGIN_THROTTLE_EMAIL_PER_MINUTE: float = 1
+    LOGIN_THROTTLE_IP_BURST: int = 30
+    LOGIN_THROTTLE_IP_PER_MINUTE: float = 10
+    LOGIN_THROTTLE_PATH: str = ""  # SQLite file shared by the workers of a host; empty keeps buckets per process
+    LOGIN_THROTTLE_MAX_KEYS: int = 100000  # Buckets kept in process memory
+
+    # Password Hashing Settings
+    BCRYPT_ROUNDS: int = 0  # bcrypt cost of new hashes; 0 tunes it to BCRYPT_TARGET_MS at start-up
+    BCRYPT_TARGET_MS: int = 250  # Target time of one hash when tuning the cost
+    PASSWORD_HASH_EXECUTOR: str = "process"  # "process" or "thread" pool for bcrypt
+    PASSWORD_HASH_WORKERS: int = 0  # Pool size; 0 uses one worker per CPU
+    PASSWORD_HASH_MAX_PENDING: int = 64  # Hashes queued or running before requests get 503
 
     # AWS Settings
     AWS_ACCESS_KEY_ID: str = os.getenv("AWS_ACCESS_KEY_ID", "")
     AWS_SECRET_ACCESS_KEY: str = os.getenv("AWS_SECRET_ACCESS_KEY", "")
     AWS_REGION: str = os.getenv("AWS_REGION", "ap-south-1")
     S3_BUCKET_NAME: str = os.getenv("S3_BUCKET_NAME", "mental-health-app-resources")
+    S3_ENDPOINT: str = os.getenv("S3_ENDPOINT", "")  # Override, e.g. a local MinIO
+    S3_MAX_WORKERS: int = 8  # Threads (and pooled connections) for blocking S3 calls
+
+    # AWS Client Settings
+    AWS_RETRY_MODE: str = "adaptive"  # botocore retry mode: "adaptive", "standard" or "legacy"
+    AWS_MAX_ATTEMPTS: int = int(os.getenv("AWS_MAX_ATTEMPTS", "5"))  # Attempts per call, including the first
+    AWS_CONNECT_TIMEOUT: float = 2.0  # Seconds
+    AWS_READ_TIMEOUT: float = 10.0  # Seconds
+    AWS_TCP_KEEPALIVE: bool = True
+
+    # DynamoDB Settings
+    DYNAMODB_ENDPOINT: str = os.getenv("DYNAMODB_ENDPOINT", "")  # Override, e.g. dynamodb-local
+    DYNAMODB_MAX_WORKERS: int = 32  # Threads (and pooled connections) for blocking boto3 calls
+    DYNAMODB_BATCH_WRITE_CONCURRENCY: int = 4  # Concurrent BatchWriteItem chunks per bulk write
+    DYNAMODB_BACKEND: str = os.getenv("DYNAMODB_BACKEND", "aws")  # "aws" or "memory" (in-process stand-in)
+    DYNAMODB_MEMORY_PATH: str = os.getenv("DYNAMODB_MEMORY_PATH", "")  # SQLite file persisting the memory backend
+    DYNAMODB_REQUEST_CACHE: bool = True  # Deduplicate reads within a request (identity map)
+    DYNAMODB_CAPACITY_METRICS: bool = True  # Record consumed capacity and latency of every call
+    DYNAMODB_FAST_READS: bool = False  # Query through the low-level client, reading known numbers as int/float
+
+    # Storage Settings
+    REPOSITORY_BACKEND: str = os.getenv("REPOSITORY_BACKEND", "dynamodb")  # "dynamodb" or "sqlite"
+    SQLITE_PATH: str = os.getenv("SQLITE_PATH", "mindmate.db")  # Database file of the sqlite backend
+
+    # Chat Settings
+    CHAT_WRITE_BEHIND: bool = True  # Persist chat messages in the background, in batches
+    CHAT_WRITE_BEHIND_INTERVAL_MS: int = 100  # Longest a message waits before it is written
+    CHAT_WRITE_BEHIND_MAX_BYTES: int = 4 * 1024 * 1024  # Memory budget of buffered messages; beyond it they are written directly
+
+    # Retention Settings
+    CHAT_HISTORY_RETENTION_DAYS: int = 90  # Chat messages older than this are archived; 0 keeps them
+    FEEDBACK_RETENTION_DAYS: int = 365  # Likewise for feedback
+    RETENTION_TTL_GRACE_DAYS: int = 7  # DynamoDB TTL expires items this long after retention, once archived
+    ARCHIVE_PREFIX: str = "archive"  # S3 key prefix of archived items
+    ARCHIVE_INTERVAL_MINUTES: int = 0  # Run archival inside the app this often; 0 leaves it to scripts/archive_expired.py
+    ARCHIVE_FLUSH_ITEMS: int = 5000  # Items buffered before archive objects are uploaded and the items deleted
+
+    # Compression Settings
+    COMPRESSION_ENABLED: bool = True  # Compress JSON and text responses for clients that accept it
+    COMPRESSION_MIN_SIZE: int = 1024  # Smaller bodies are sent uncompressed
+    COMPRESSION_STREAM_SIZE: int = 64 * 1024  # Larger bodies are compressed in steps of this size off the event loop; 0 never offloads
+    COMPRESSION_ENCODINGS: str = "zstd,br,gzip"  # Preference among codings the client accepts equally; br and zstd need brotli and zstandard
+    COMPRESSION_GZIP_LEVEL: int = 6  # 1 (fastest) to 9
+    COMPRESSION_BROTLI_LEVEL: int = 4  # 0 (fastest) to 11
+    COMPRESSION_ZSTD_LEVEL: int = 3  # 1 (fastest) to 22
+    COMPRESSION_WORKERS: int = 4  # Threads compressing large bodies
+
+    # HTTP Caching Settings
+    ETAG_WINDOW_SECONDS: int = 300  # Time-windowed responses (mood stats) are computed as of the end of a window this long
+
+    # Monitoring Settings
+    METRICS_ENABLED: bool = True  # Serve counters at /api/metrics
 
     # AI Settings
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
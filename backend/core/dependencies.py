@@ -2,30 +2,53 @@
 Dependency injection utilities for the application.
 """
 from fastapi import Depends, Header
-from typing import Optional
+from typing import Optional, Dict, Any
+from backend.config import settings
 from backend.core.security import decode_access_token
 from backend.core.exceptions import AuthException
-from backend.db.dynamodb import get_user_by_id
+from backend.core.user_cache import user_cache
+from backend.repositories import user_repository
 
-async def get_current_user(authorization: Optional[str] = Header(None)):
-    """Get the current authenticated user."""
+def _token_payload(authorization: Optional[str]) -> Dict[str, Any]:
+    """Decode the bearer token of an Authorization header."""
     if not authorization:
         raise AuthException("Authorization header missing")
     
     try:
         scheme, token = authorization.split()
-        if scheme.lower() != "bearer":
-            raise AuthException("Invalid authentication scheme")
-        
-        payload = decode_access_token(token)
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise AuthException("Invalid token payload")
-        
-        user = await get_user_by_id(user_id)
-        if user is None:
-            raise AuthException("User not found")
-        
-        return user
     except ValueError:
         raise AuthException("Invalid authorization header")
+    if scheme.lower() != "bearer":
+        raise AuthException("Invalid authentication scheme")
+    
+    payload = decode_access_token(token)
+    if payload.get("sub") is None:
+        raise AuthException("Invalid token payload")
+    return payload
+
+async def _load_user(user_id: str) -> Dict[str, Any]:
+    """Get a user through the user cache."""
+    user = user_cache.get(user_id)
+    if user is None:
+        user = await user_repository.get(user_id)
+        if user is None:
+            raise AuthException("User not found")
+        user = user_cache.set(user)
+    return user
+
+async def get_current_user(authorization: Optional[str] = Header(None)):
+    """Get the current authenticated user.
+
+    With ``AUTH_TRUST_TOKEN_CLAIMS`` this is just the ``user_id`` and
+    ``email`` signed into the token, without a read; handlers that need the
+    full user depend on ``get_current_user_profile`` instead.
+    """
+    payload = _token_payload(authorization)
+    if settings.AUTH_TRUST_TOKEN_CLAIMS:
+        return {"user_id": payload["sub"], "email": payload.get("email")}
+    return await _load_user(payload["sub"])
+
+async def get_current_user_profile(authorization: Optional[str] = Header(None)):
+    """Get the current authenticated user with all of its attributes."""
+    payload = _token_payload(authorization)
+    return await _load_user(payload["sub"])
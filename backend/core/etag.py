@@ -0,0 +1,71 @@
+"""
+ETags and conditional GETs of derived read endpoints.
+
+Services bump a per-user version counter of a collection after every write
+to it (see ``VersionRepository``). A response derived from some
+collections is identified by their versions and the request inputs, so its
+strong ETag is a digest of those, known before any data is read. A request
+whose ``If-None-Match`` holds that ETag is answered with 304 after one
+read of the version counters, without reading the data or recomputing the
+response.
+
+The versions are read before the data, so a write racing the request can
+only make the ETag older than the body, which the next request's version
+check then misses, never the other way around.
+"""
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, List, Optional
+from fastapi import Request, Response, status
+from backend.config import settings
+from backend.repositories import version_repository
+
+CACHE_CONTROL = "private, no-cache"  # Clients may store responses but must revalidate them
+
+def make_etag(user_id: str, endpoint: str, versions: Any, *inputs: Any) -> str:
+    """Strong ETag of a user's response of ``endpoint`` for the given versions and inputs."""
+    key = json.dumps([user_id, endpoint, versions, *inputs], separators=(",", ":"), sort_keys=True, default=str)
+    return f'"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches ``etag`` (weak comparison, as RFC 9110 asks)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+def window_end(now: Optional[datetime] = None) -> datetime:
+    """End of the current ``ETAG_WINDOW_SECONDS`` window, in naive UTC.
+
+    Responses over a time range ending now are computed as of the window
+    end instead, so they stay the same, and keep their ETag, for a window.
+    """
+    seconds = max(settings.ETAG_WINDOW_SECONDS, 1)
+    epoch = ((now or datetime.utcnow()) - datetime(1970, 1, 1)).total_seconds()
+    return datetime.utcfromtimestamp((epoch // seconds + 1) * seconds)
+
+async def not_modified(
+    request: Request,
+    response: Response,
+    user_id: str,
+    endpoint: str,
+    collections: List[str],
+    *inputs: Any
+) -> Optional[Response]:
+    """Check a conditional GET against the current versions of ``collections``.
+
+    Returns a 304 response when the client's copy is current. Otherwise
+    sets ``ETag`` on ``response`` and returns None, and the endpoint
+    computes the body as usual.
+    """
+    versions = await version_repository.get(user_id, collections)
+    etag = make_etag(user_id, endpoint, versions, *inputs)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
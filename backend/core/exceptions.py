@@ -1,13 +1,15 @@
 """
 Custom exception classes for the application.
 """
+from typing import Dict, Optional
 from fastapi import status
 
 class AppException(Exception):
     """Base exception class for application-specific exceptions."""
-    def __init__(self, detail: str, status_code: int = status.HTTP_400_BAD_REQUEST):
+    def __init__(self, detail: str, status_code: int = status.HTTP_400_BAD_REQUEST, headers: Optional[Dict[str, str]] = None):
         self.detail = detail
         self.status_code = status_code
+        self.headers = headers
         super().__init__(self.detail)
 
 class AuthException(AppException):
@@ -24,3 +26,19 @@ class ForbiddenException(AppException):
     """Exception raised when access to a resource is forbidden."""
     def __init__(self, detail: str = "Access forbidden"):
         super().__init__(detail, status_code=status.HTTP_403_FORBIDDEN)
+
+class ConflictException(AppException):
+    """Exception raised when a resource conflicts with an existing one."""
+    def __init__(self, detail: str = "Resource already exists"):
+        super().__init__(detail, status_code=status.HTTP_409_CONFLICT)
+
+class ServiceUnavailableException(AppException):
+    """Exception raised when the server is too busy to take a request."""
+    def __init__(self, detail: str = "Service temporarily unavailable"):
+        super().__init__(detail, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+class TooManyRequestsException(AppException):
+    """Exception raised when a client has to slow down."""
+    def __init__(self, detail: str = "Too many requests", retry_after: Optional[int] = None):
+        headers = {"Retry-After": str(retry_after)} if retry_after else None
+        super().__init__(detail, status_code=status.HTTP_429_TOO_MANY_REQUESTS, headers=headers)
@@ -0,0 +1,94 @@
+"""
+In-process metrics registry.
+
+Counters and stats are process-wide and thread-safe; ``metrics.snapshot()``
+is served by the ``/api/metrics`` endpoint for monitoring.
+"""
+import threading
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+class Counter:
+    """A monotonically increasing counter."""
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: Union[int, float] = 1) -> None:
+        """Increase the counter by ``amount``."""
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> Union[int, float]:
+        return self._value
+
+class Stats:
+    """Sums of observed values, grouped by a fixed set of labels.
+
+    Every ``observe`` adds one to ``count`` and each keyword value to the
+    field of that name, for the row of the given label values.
+    """
+
+    def __init__(self, name: str, labels: Sequence[str], description: str = ""):
+        self.name = name
+        self.labels = tuple(labels)
+        self.description = description
+        self._rows: Dict[Tuple[str, ...], Dict[str, Union[int, float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_values: Sequence[str], **values: Union[int, float]) -> None:
+        """Add an observation to the row of ``label_values``."""
+        with self._lock:
+            row = self._rows.setdefault(tuple(label_values), {"count": 0})
+            row["count"] += 1
+            for field, value in values.items():
+                row[field] = row.get(field, 0) + value
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Get every row as a dict of its labels and fields."""
+        with self._lock:
+            return [
+                {**dict(zip(self.labels, label_values)), **row}
+                for label_values, row in self._rows.items()
+            ]
+
+    def reset(self) -> None:
+        """Drop all rows."""
+        with self._lock:
+            self._rows.clear()
+
+class MetricsRegistry:
+    """Named counters and stats of the application."""
+
+    def __init__(self):
+        self._counters: Dict[str, Counter] = {}
+        self._stats: Dict[str, Stats] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        """Get the counter called ``name``, creating it on first use."""
+        with self._lock:
+            if name not in self._counters:
+                self._counters[name] = Counter(name, description)
+            return self._counters[name]
+
+    def stats(self, name: str, labels: Sequence[str], description: str = "") -> Stats:
+        """Get the stats called ``name``, creating them on first use."""
+        with self._lock:
+            if name not in self._stats:
+                self._stats[name] = Stats(name, labels, description)
+            return self._stats[name]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the current value of every counter and the rows of every stats."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            stats = sorted(self._stats.items())
+        snapshot: Dict[str, Any] = {name: counter.value for name, counter in counters}
+        snapshot.update((name, entry.rows()) for name, entry in stats)
+        return snapshot
+
+metrics = MetricsRegistry()
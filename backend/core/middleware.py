@@ -0,0 +1,286 @@
+"""
+ASGI middleware.
+"""
+import asyncio
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from backend.config import settings
+from backend.core.metrics import metrics
+from backend.db.request_cache import request_cache_scope
+
+try:
+    import brotli
+except ImportError:  # br is not offered
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstd is not offered
+    zstandard = None
+
+# Scope of the HTTP request being handled. Routing adds the matched route to
+# this same dict, so it is available by the time the endpoint runs.
+_current_scope: ContextVar[Optional[Scope]] = ContextVar("request_scope", default=None)
+
+def current_route() -> str:
+    """Get ``"<METHOD> <route path>"`` of the current request, or ``"-"`` outside one."""
+    scope = _current_scope.get()
+    if scope is None:
+        return "-"
+    path = getattr(scope.get("route"), "path", None) or scope.get("path", "")
+    return f"{scope.get('method', '')} {path}"
+
+class RequestContextMiddleware:
+    """Make the current request visible to code below the API layer."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_scope.reset(token)
+
+class RequestCacheMiddleware:
+    """Give every HTTP request its own data layer identity map.
+
+    Written as plain ASGI middleware so the context variable set here is
+    visible to the endpoint and its dependencies.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with request_cache_scope():
+            await self.app(scope, receive, send)
+
+# Media types worth compressing; images, archives and the like are compressed already
+COMPRESSIBLE_TYPES = ("application/json", "application/javascript", "application/xml", "image/svg+xml", "text/")
+
+compressed_responses = metrics.counter("compressed_responses", "Responses sent with a Content-Encoding")
+compression_bytes_in = metrics.counter("compression_bytes_in", "Body bytes of compressed responses before compression")
+compression_bytes_out = metrics.counter("compression_bytes_out", "Body bytes of compressed responses on the wire")
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+class _BrotliEncoder:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+class _ZstdEncoder:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+def available_encodings() -> Dict[str, Callable[[], object]]:
+    """Content codings this process can produce, with a factory of encoders at the configured level."""
+    encodings = {"gzip": lambda: _GzipEncoder(settings.COMPRESSION_GZIP_LEVEL)}
+    if brotli is not None:
+        encodings["br"] = lambda: _BrotliEncoder(settings.COMPRESSION_BROTLI_LEVEL)
+    if zstandard is not None:
+        encodings["zstd"] = lambda: _ZstdEncoder(settings.COMPRESSION_ZSTD_LEVEL)
+    return encodings
+
+def negotiate(accept_encoding: str, preference: List[str]) -> Optional[str]:
+    """Pick the coding of ``preference`` the client rates highest in ``Accept-Encoding``.
+
+    Ties go to the earlier coding in ``preference``; None means identity.
+    """
+    ratings = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name.strip():
+            ratings[name.strip()] = quality
+    best, best_quality = None, 0.0
+    for name in preference:
+        quality = ratings.get(name, ratings.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+def _is_compressible(headers: MutableHeaders) -> bool:
+    return "content-encoding" not in headers and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+
+class CompressionMiddleware:
+    """Compress compressible responses with the best coding the client accepts.
+
+    Bodies under ``minimum_size`` go out as they are. Bodies of at least
+    ``stream_size`` (unless it is 0) are compressed in steps of that size
+    on a thread pool, each step's output sent as it is ready, so the event
+    loop never compresses more than ``stream_size`` bytes at once; zlib,
+    brotli and zstd release the GIL while they work. Streamed responses
+    are compressed chunk by chunk. Strong ETags of compressed responses
+    are weakened, as the bytes differ per coding.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: Optional[int] = None,
+        stream_size: Optional[int] = None,
+        encodings: Optional[List[str]] = None
+    ):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+        self.stream_size = settings.COMPRESSION_STREAM_SIZE if stream_size is None else stream_size
+        self.encoders = available_encodings()
+        preference = encodings or [name.strip() for name in settings.COMPRESSION_ENCODINGS.split(",")]
+        self.preference = [name for name in preference if name in self.encoders]
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def is_large(self, body: bytes) -> bool:
+        """Whether ``body`` is compressed in steps on the pool."""
+        return 0 < self.stream_size <= len(body)
+
+    async def run(self, func: Callable[[], bytes]) -> bytes:
+        """Run an encoder step on the compression pool."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.COMPRESSION_WORKERS, thread_name_prefix="compression"
+            )
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.preference)
+        await self.app(scope, receive, _CompressingSend(self, encoding, send))
+
+class _CompressingSend:
+    """The ``send`` of one response passing through CompressionMiddleware."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: Optional[str], send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start: Optional[Message] = None
+        self.encoder = None
+        self.passthrough = False
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+        elif message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+        elif self.encoder is not None:
+            await self._stream(message.get("body", b""), message.get("more_body", False))
+        else:
+            await self._first_body(message)
+
+    async def _first_body(self, message: Message) -> None:
+        headers = MutableHeaders(raw=self.start["headers"])
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        compressible = _is_compressible(headers) and self.start["status"] not in (204, 304)
+        if compressible:
+            headers.add_vary_header("Accept-Encoding")
+        if (
+            not compressible or self.encoding is None
+            or (not more_body and len(body) < max(self.middleware.minimum_size, 1))
+        ):
+            self.passthrough = True
+            await self.send(self.start)
+            await self.send(message)
+            return
+
+        headers["Content-Encoding"] = self.encoding
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        self.encoder = self.middleware.encoders[self.encoding]()
+
+        if not more_body and not self.middleware.is_large(body):
+            compressed = self.encoder.compress(body) + self.encoder.finish()
+            headers["Content-Length"] = str(len(compressed))
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": compressed})
+            self._record(len(body), len(compressed))
+            return
+
+        # The compressed length is not known up front; send it chunked
+        del headers["Content-Length"]
+        await self.send(self.start)
+        if more_body:
+            await self._stream(body, True)
+            return
+        step = self.middleware.stream_size
+        for offset in range(0, len(body), step):
+            end = offset + step
+            await self._stream(body[offset:end], end < len(body), flush=False, offload=True)
+
+    async def _stream(self, body: bytes, more_body: bool, flush: bool = True, offload: Optional[bool] = None) -> None:
+        def encode() -> bytes:
+            compressed = self.encoder.compress(body) if body else b""
+            if not more_body:
+                return compressed + self.encoder.finish()
+            # Deliver what the application streamed so far
+            return compressed + self.encoder.flush() if flush else compressed
+
+        if offload is None:
+            offload = self.middleware.is_large(body)
+        compressed = await self.middleware.run(encode) if offload else encode()
+        self.bytes_in += len(body)
+        self.bytes_out += len(compressed)
+        if compressed or not more_body:
+            await self.send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+        if not more_body:
+            self._record(self.bytes_in, self.bytes_out)
+
+    def _record(self, bytes_in: int, bytes_out: int) -> None:
+        compressed_responses.inc()
+        compression_bytes_in.inc(bytes_in)
+        compression_bytes_out.inc(bytes_out)
@@ -0,0 +1,66 @@
+"""
+Cursors for paginated list endpoints.
+
+A list endpoint returns one page and, when more items follow, a cursor in
+the ``X-Next-Cursor`` response header; passing it back as ``?cursor=``
+returns the next page. The cursor carries the repository position to
+continue from (the DynamoDB ``LastEvaluatedKey``, or its SQLite
+equivalent) and the listing it belongs to: the user, the endpoint and its
+filters. It is signed with ``SECRET_KEY``, so clients cannot forge
+positions or reuse a cursor for another listing.
+"""
+import base64
+import hashlib
+import hmac
+import json
+from typing import Any, Dict, Optional
+from fastapi import Response
+from backend.config import settings
+from backend.core.exceptions import AppException
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_PAGE_SIZE = 100  # Page size of endpoints that take an optional limit
+SIGNATURE_BYTES = 16
+
+def listing_scope(user_id: str, listing: str, *filters: Optional[str]) -> str:
+    """Identify a listing; a cursor is only valid for the scope it was issued for."""
+    return json.dumps([user_id, listing, *filters], separators=(",", ":"))
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+def _signature(scope: str, payload: bytes) -> bytes:
+    message = scope.encode() + b"\0" + payload
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).digest()[:SIGNATURE_BYTES]
+
+def encode_cursor(position: Dict[str, Any], scope: str) -> str:
+    """Sign a repository position as an opaque cursor for ``scope``."""
+    payload = json.dumps(position, separators=(",", ":"), sort_keys=True).encode()
+    return f"{_b64encode(payload)}.{_b64encode(_signature(scope, payload))}"
+
+def decode_cursor(cursor: Optional[str], scope: str) -> Optional[Dict[str, Any]]:
+    """Get the position of a cursor issued for ``scope``; None starts at the first page.
+
+    Raises AppException (400) for a cursor that was tampered with or
+    issued for another listing.
+    """
+    if not cursor:
+        return None
+    try:
+        payload_text, signature_text = cursor.split(".")
+        payload = _b64decode(payload_text)
+        valid = hmac.compare_digest(_b64decode(signature_text), _signature(scope, payload))
+        position = json.loads(payload) if valid else None
+    except (ValueError, TypeError):
+        position = None
+    if not isinstance(position, dict):
+        raise AppException("Invalid cursor")
+    return position
+
+def set_next_cursor(response: Response, position: Optional[Dict[str, Any]], scope: str) -> None:
+    """Return the cursor of the next page, if there is one, in ``X-Next-Cursor``."""
+    if position:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(position, scope)
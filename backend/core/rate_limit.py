@@ -0,0 +1,197 @@
+"""
+Login throttling.
+
+Every login attempt costs a bcrypt verification, so ``authenticate_user``
+first takes a token from two token buckets, one for the email and one for
+the client IP. A bucket holds up to ``burst`` tokens and refills
+continuously at its rate. When either bucket is empty the attempt is
+rejected with 429 before any hashing, and rejected attempts take no tokens.
+
+A bucket is keyed by a 64-bit digest and holds only ``(tokens, updated)``.
+By default buckets live in process memory. With ``LOGIN_THROTTLE_PATH`` set
+they live in a SQLite file shared by all uvicorn workers on the host, so
+the limits hold per host rather than per worker.
+"""
+import asyncio
+import hashlib
+import logging
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, NamedTuple, Tuple
+from backend.config import settings
+from backend.core.exceptions import TooManyRequestsException
+from backend.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+SQLITE_BUSY_TIMEOUT = 1  # Seconds an attempt waits for another worker's bucket update
+PURGE_EVERY = 1000  # File-backed stores drop refilled buckets once per this many acquisitions
+
+throttled_logins = metrics.counter("login_throttled", "Login attempts rejected with 429 before password verification")
+
+class Limit(NamedTuple):
+    """A token bucket: up to ``burst`` tokens, refilled at ``per_second``."""
+    burst: float
+    per_second: float
+
+    @property
+    def refill_seconds(self) -> float:
+        """Time an empty bucket takes to fill up again."""
+        return self.burst / self.per_second
+
+# (tokens, epoch seconds they were counted at)
+BucketState = Tuple[float, float]
+
+def bucket_key(kind: str, value: str) -> int:
+    """64-bit key of a bucket; it fits an SQLite INTEGER primary key."""
+    digest = hashlib.blake2b(f"{kind}:{value}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+def take(states: List[Optional[BucketState]], limits: List[Limit], now: float) -> Tuple[float, List[BucketState]]:
+    """Take one token from every bucket, or from none.
+
+    Returns the seconds until all buckets hold a token (0 if they did) and
+    the bucket states to store when the tokens were taken.
+    """
+    wait = 0.0
+    taken = []
+    for state, limit in zip(states, limits):
+        tokens = limit.burst if state is None else min(limit.burst, state[0] + (now - state[1]) * limit.per_second)
+        if tokens < 1:
+            wait = max(wait, (1 - tokens) / limit.per_second)
+        taken.append((tokens - 1, now))
+    return wait, taken
+
+class MemoryBucketStore:
+    """Buckets of this process, evicting the least recently used beyond ``max_keys``."""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[int, BucketState]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def acquire(self, requests: List[Tuple[int, Limit]], now: float) -> float:
+        with self._lock:
+            wait, taken = take([self._buckets.get(key) for key, _ in requests], [limit for _, limit in requests], now)
+            if not wait:
+                for (key, _), state in zip(requests, taken):
+                    self._buckets[key] = state
+                    self._buckets.move_to_end(key)
+                while len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+class SQLiteBucketStore:
+    """Buckets in a SQLite file shared by the processes of a host."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        # One thread owns the connection and serializes this process's updates
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="login-throttle")
+        self._acquisitions = 0
+        self._horizon = 0.0  # Longest refill time of the buckets seen
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, timeout=SQLITE_BUSY_TIMEOUT, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "id INTEGER PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS buckets_updated ON buckets (updated)")
+            self._connection = connection
+        return self._connection
+
+    def _acquire(self, requests: List[Tuple[int, Limit]], now: float) -> float:
+        connection = self._connect()
+        keys = [key for key, _ in requests]
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            rows: Dict[int, BucketState] = {
+                key: (tokens, updated) for key, tokens, updated in connection.execute(
+                    f"SELECT id, tokens, updated FROM buckets WHERE id IN ({', '.join('?' * len(keys))})", keys
+                )
+            }
+            wait, taken = take([rows.get(key) for key in keys], [limit for _, limit in requests], now)
+            if not wait:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO buckets (id, tokens, updated) VALUES (?, ?, ?)",
+                    [(key, *state) for key, state in zip(keys, taken)]
+                )
+            self._acquisitions += 1
+            self._horizon = max(self._horizon, *(limit.refill_seconds for _, limit in requests))
+            if self._acquisitions % PURGE_EVERY == 0:
+                # A bucket untouched for its refill time is full, the same as a missing one
+                connection.execute("DELETE FROM buckets WHERE updated < ?", (now - self._horizon,))
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+        return wait
+
+    async def acquire(self, requests: List[Tuple[int, Limit]], now: float) -> float:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._acquire, requests, now)
+
+    def clear(self) -> None:
+        self._executor.submit(lambda: self._connect().execute("DELETE FROM buckets")).result()
+
+class LoginThrottle:
+    """Token buckets per email and per client IP in front of password checks."""
+
+    def __init__(self, store, email_limit: Optional[Limit], ip_limit: Optional[Limit]):
+        self.store = store
+        self.email_limit = email_limit
+        self.ip_limit = ip_limit
+
+    async def check(self, email: str, client_ip: Optional[str] = None) -> None:
+        """Count a login attempt; raises TooManyRequestsException if a bucket is empty."""
+        requests = []
+        if self.email_limit:
+            requests.append((bucket_key("email", email.strip().lower()), self.email_limit))
+        if self.ip_limit and client_ip:
+            requests.append((bucket_key("ip", client_ip), self.ip_limit))
+        if not requests:
+            return
+
+        try:
+            wait = await self.store.acquire(requests, time.time())
+        except sqlite3.Error:
+            # Availability of logins beats throttling them
+            logger.warning("Login throttle store failed; allowing the attempt", exc_info=True)
+            return
+        if wait:
+            throttled_logins.inc()
+            raise TooManyRequestsException("Too many login attempts, try again later", retry_after=math.ceil(wait))
+
+    def reset(self) -> None:
+        """Forget all buckets."""
+        self.store.clear()
+
+def _limit(burst: int, per_minute: float) -> Optional[Limit]:
+    return Limit(burst, per_minute / 60) if burst > 0 and per_minute > 0 else None
+
+def create_login_throttle() -> LoginThrottle:
+    """Create the login throttle configured in the settings."""
+    if settings.LOGIN_THROTTLE_PATH:
+        store = SQLiteBucketStore(settings.LOGIN_THROTTLE_PATH)
+    else:
+        store = MemoryBucketStore(settings.LOGIN_THROTTLE_MAX_KEYS)
+    return LoginThrottle(
+        store,
+        email_limit=_limit(settings.LOGIN_THROTTLE_EMAIL_BURST, settings.LOGIN_THROTTLE_EMAIL_PER_MINUTE),
+        ip_limit=_limit(settings.LOGIN_THROTTLE_IP_BURST, settings.LOGIN_THROTTLE_IP_PER_MINUTE)
+    )
+
+login_throttle = create_login_throttle()
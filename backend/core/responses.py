@@ -0,0 +1,70 @@
+"""
+Fast JSON responses.
+
+``FastJSONResponse`` is the app's default response class. It encodes with
+orjson when it is installed and with a compact stdlib ``json`` otherwise,
+and encodes DynamoDB's ``Decimal`` numbers the way ``jsonable_encoder``
+does, so endpoints can return raw items without that encoder's recursive
+pass.
+
+List endpoints return ``model_response`` instead of their items. It
+validates the items against the endpoint's response model and serializes
+them straight to JSON bytes through a cached pydantic ``TypeAdapter``,
+both in pydantic-core, instead of FastAPI's validate, dump to dicts and
+encode again.
+"""
+import json
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Optional
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder
+    orjson = None
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        exponent = value.as_tuple().exponent
+        return int(value) if isinstance(exponent, int) and exponent >= 0 else float(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    """Encode ``content`` as compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson, if installed."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+@lru_cache(maxsize=None)
+def type_adapter(response_type: Any) -> TypeAdapter:
+    """The TypeAdapter of a response type, built once per type."""
+    return TypeAdapter(response_type)
+
+def serialize(response_type: Any, content: Any) -> bytes:
+    """Validate ``content`` as ``response_type`` and serialize it to JSON bytes."""
+    adapter = type_adapter(response_type)
+    return adapter.dump_json(adapter.validate_python(content), by_alias=True)
+
+def model_response(response_type: Any, content: Any, response: Optional[Response] = None) -> Response:
+    """A JSON response of ``content`` validated as ``response_type``.
+
+    ``response`` is the endpoint's injected Response; headers set on it,
+    like the next cursor or an ETag, are carried over.
+    """
+    result = Response(serialize(response_type, content), media_type="application/json")
+    if response is not None:
+        result.headers.raw.extend(response.headers.raw)
+    return result
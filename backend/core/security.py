@@ -1,23 +1,163 @@
 """
 Security utilities for the application.
+
+bcrypt hashing is deliberately slow CPU work, so request handlers use the
+async ``hash_password`` and ``verify_and_update_password``, which run it on a
+dedicated pool (processes by default, see ``PASSWORD_HASH_EXECUTOR``) instead
+of the event loop. At most ``PASSWORD_HASH_MAX_PENDING`` hashes are queued or
+running; beyond that callers get ``ServiceUnavailableException`` (503) rather
+than waiting behind a login burst.
+
+The cost of new hashes is ``BCRYPT_ROUNDS``, or tuned at start-up to the
+highest cost that hashes within ``BCRYPT_TARGET_MS`` on this machine.
+Verifying a password hashed at a lower cost returns a new hash to store, so
+hashes are upgraded as users log in. Hashes at a higher cost are kept, so
+instances tuned differently do not rehash each other's hashes.
+
+Access tokens are presented on every request for their whole lifetime, so
+the claims of verified tokens are cached until they expire.
 """
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from functools import partial
+from typing import Optional, Dict, Any, Callable, Tuple
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from backend.config import settings
-from backend.core.exceptions import AuthException
+from backend.core.exceptions import AuthException, ServiceUnavailableException
+from backend.core.metrics import metrics
+
+# bcrypt cost bounds when tuning; 10 is the lowest cost still considered safe
+BCRYPT_MIN_ROUNDS = 10
+BCRYPT_MAX_ROUNDS = 16
+
+hash_rejections = metrics.counter(
+    "password_hash_rejected",
+    "Password hashes refused with 503 because PASSWORD_HASH_MAX_PENDING were pending"
+)
+token_cache_hits = metrics.counter("token_cache_hits", "Access tokens whose verified claims were cached")
+token_cache_misses = metrics.counter("token_cache_misses", "Access tokens verified with a full signature check")
+
+_contexts: Dict[int, CryptContext] = {}
+_tuned_rounds: Optional[int] = None
+_pool: Optional[Executor] = None
+_pool_lock = threading.Lock()
+_pending = 0
+
+def _context(rounds: int) -> CryptContext:
+    """Password context hashing at ``rounds``; hashes at a lower cost need an update."""
+    context = _contexts.get(rounds)
+    if context is None:
+        context = _contexts[rounds] = CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__default_rounds=rounds,
+            bcrypt__min_rounds=rounds,
+            bcrypt__max_rounds=31
+        )
+    return context
+
+def tune_bcrypt_rounds(target_ms: int) -> int:
+    """Highest bcrypt cost whose hash takes at most ``target_ms`` here (each round doubles the time)."""
+    start = time.perf_counter()
+    _context(BCRYPT_MIN_ROUNDS).hash("cost tuning")
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    rounds = BCRYPT_MIN_ROUNDS
+    while rounds < BCRYPT_MAX_ROUNDS and elapsed_ms * 2 ** (rounds + 1 - BCRYPT_MIN_ROUNDS) <= target_ms:
+        rounds += 1
+    return rounds
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+def bcrypt_rounds() -> int:
+    """bcrypt cost of new hashes, tuning it on first use if ``BCRYPT_ROUNDS`` is 0."""
+    global _tuned_rounds
+    if settings.BCRYPT_ROUNDS:
+        return settings.BCRYPT_ROUNDS
+    if _tuned_rounds is None:
+        _tuned_rounds = tune_bcrypt_rounds(settings.BCRYPT_TARGET_MS)
+    return _tuned_rounds
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verify a password against a hash, blocking the caller."""
+    return _context(bcrypt_rounds()).verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    """Generate a password hash."""
-    return pwd_context.hash(password)
+    """Generate a password hash, blocking the caller."""
+    return _context(bcrypt_rounds()).hash(password)
+
+# Pool workers; module-level so a process pool can pickle them
+
+def _hash(password: str, rounds: int) -> str:
+    return _context(rounds).hash(password)
+
+def _verify_and_update(password: str, hashed_password: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    return _context(rounds).verify_and_update(password, hashed_password)
+
+def _password_pool() -> Executor:
+    """Get the hashing pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1
+            if settings.PASSWORD_HASH_EXECUTOR == "thread":
+                _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+            elif settings.PASSWORD_HASH_EXECUTOR == "process":
+                _pool = ProcessPoolExecutor(max_workers=workers)
+            else:
+                raise ValueError(f"Unknown PASSWORD_HASH_EXECUTOR: {settings.PASSWORD_HASH_EXECUTOR}")
+        return _pool
+
+async def _offload(func: Callable[..., Any], *args: Any) -> Any:
+    """Run ``func`` on the hashing pool, refusing when too many calls are pending."""
+    global _pending
+    if _pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        hash_rejections.inc()
+        raise ServiceUnavailableException("Too many sign-in requests, please try again shortly")
+
+    _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_password_pool(), partial(func, *args))
+    finally:
+        _pending -= 1
+
+async def _rounds() -> int:
+    global _tuned_rounds
+    if settings.BCRYPT_ROUNDS:
+        return settings.BCRYPT_ROUNDS
+    if _tuned_rounds is None:
+        _tuned_rounds = await _offload(tune_bcrypt_rounds, settings.BCRYPT_TARGET_MS)
+    return _tuned_rounds
+
+async def hash_password(password: str) -> str:
+    """Generate a password hash on the hashing pool."""
+    return await _offload(_hash, password, await _rounds())
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password on the hashing pool.
+
+    Returns whether it matches and, if the hash has a lower cost than new
+    hashes get, a new hash to store in its place.
+    """
+    return await _offload(_verify_and_update, plain_password, hashed_password, await _rounds())
+
+async def start_password_pool() -> None:
+    """Create the hashing pool and tune the bcrypt cost ahead of the first request."""
+    await _rounds()
+
+def shutdown_password_pool() -> None:
+    """Shut the hashing pool down; it is recreated on next use."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
@@ -30,10 +170,69 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+class VerifiedTokenCache:
+    """LRU cache of the claims of verified tokens, keyed by token digest.
+
+    Claims are kept until the token's ``exp``, and only returned while the
+    secret and algorithm they were verified with are still current. Tokens
+    without ``exp`` and invalid tokens are never cached.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, Tuple[float, Tuple[str, str], Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Get a copy of the cached claims of ``token``, or None."""
+        if self.max_entries <= 0:
+            return None
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time() or entry[1] != (settings.SECRET_KEY, settings.ALGORITHM):
+                if entry is not None:
+                    del self._entries[key]
+                token_cache_misses.inc()
+                return None
+            self._entries.move_to_end(key)
+        token_cache_hits.inc()
+        return dict(entry[2])
+
+    def set(self, token: str, claims: Dict[str, Any]) -> None:
+        """Cache the claims of a verified token until it expires."""
+        expires = claims.get("exp")
+        if self.max_entries <= 0 or not isinstance(expires, (int, float)):
+            return
+        with self._lock:
+            key = self._key(token)
+            self._entries[key] = (expires, (settings.SECRET_KEY, settings.ALGORITHM), dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+verified_tokens = VerifiedTokenCache(settings.TOKEN_CACHE_MAX_ENTRIES)
+
 def decode_access_token(token: str) -> Dict[str, Any]:
-    """Decode a JWT access token."""
+    """Decode a JWT access token.
+
+    A token is verified once; its claims are then served from
+    ``verified_tokens`` until it expires.
+    """
+    payload = verified_tokens.get(token)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
         raise AuthException("Invalid token")
+    verified_tokens.set(token, payload)
+    return payload
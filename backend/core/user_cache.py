@@ -0,0 +1,69 @@
+"""
+Process-wide cache of authenticated users.
+
+``get_current_user`` resolves the user of every authenticated request, so
+users are kept here for ``USER_CACHE_TTL_SECONDS``, evicting the least
+recently used beyond ``USER_CACHE_MAX_ENTRIES``. Profile and password changes
+invalidate their user; changes made by other processes show up once the entry
+expires. Password hashes are never cached.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from backend.config import settings
+from backend.core.metrics import metrics
+
+user_cache_hits = metrics.counter("user_cache_hits", "Authenticated users resolved from the user cache")
+user_cache_misses = metrics.counter("user_cache_misses", "Authenticated users read from the repository")
+
+class UserCache:
+    """TTL and LRU bounded cache of user dicts by user ID."""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get a copy of a cached user, or None if it is not cached or expired."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[user_id]
+                user_cache_misses.inc()
+                return None
+            self._entries.move_to_end(user_id)
+        user_cache_hits.inc()
+        return dict(entry[1])
+
+    def set(self, user: Dict[str, Any]) -> Dict[str, Any]:
+        """Cache a user without its password hash and return the cached copy."""
+        user = {name: value for name, value in user.items() if name != "password_hash"}
+        if not self.enabled:
+            return user
+        with self._lock:
+            self._entries[user["user_id"]] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(user["user_id"])
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return dict(user)
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop a user, e.g. after it was updated."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+user_cache = UserCache(settings.USER_CACHE_TTL_SECONDS, settings.USER_CACHE_MAX_ENTRIES)
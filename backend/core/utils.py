@@ -2,7 +2,7 @@
 Utility functions for the application.
 """
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional
 
 def generate_uuid() -> str:
@@ -21,6 +21,13 @@ def parse_datetime(dt_str: str) -> datetime:
     """Parse an ISO datetime string into a datetime object."""
     return datetime.fromisoformat(dt_str.replace("Z", "+00:00"))
 
+def normalize_timestamp(dt_str: str) -> str:
+    """Normalize an ISO datetime string to naive UTC so that stored values sort lexicographically."""
+    dt = parse_datetime(dt_str)
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt.isoformat()
+
 def clean_none_values(data: Dict[str, Any]) -> Dict[str, Any]:
     """Remove None values from a dictionary."""
     return {k: v for k, v in data.items() if v is not None}
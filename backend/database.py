@@ -1,8 +1,8 @@
-import boto3
+from backend.db.aws import get_client
 
 def get_dynamodb_client():
     """
     This function returns a DynamoDB client.
     """
-    dynamodb = boto3.client('dynamodb')
+    dynamodb = get_client('dynamodb')
     return dynamodb
@@ -0,0 +1,119 @@
+"""
+AWS client factory.
+
+Every boto3 client and resource of the application is built here from
+``Settings``:
+
+- ``DYNAMODB_ENDPOINT`` / ``S3_ENDPOINT`` override the service endpoint
+  (dynamodb-local, MinIO, ...)
+- the connection pool is sized by the caller to the number of threads that
+  use the client, so no call waits for or discards a pooled connection
+- retries use botocore's adaptive mode, which adds client-side rate limiting
+  when DynamoDB throttles
+- connect/read timeouts and TCP keep-alive are set explicitly
+
+Clients are created on first use and then shared, so importing the app
+builds no AWS sessions. ``LazyProxy`` and ``LazyTable`` let modules keep
+module-level handles that resolve on first attribute access.
+"""
+import threading
+import boto3
+from botocore.config import Config
+from typing import Any, Callable, Dict, Optional, Tuple
+from backend.config import settings
+
+_ENDPOINTS = {
+    "dynamodb": lambda: settings.DYNAMODB_ENDPOINT,
+    "s3": lambda: settings.S3_ENDPOINT,
+}
+
+_cache: Dict[Tuple[str, str, int], Any] = {}
+_lock = threading.Lock()
+
+def client_config(max_pool_connections: int) -> Config:
+    """botocore configuration for a client used by ``max_pool_connections`` threads."""
+    return Config(
+        max_pool_connections=max_pool_connections,
+        retries={"mode": settings.AWS_RETRY_MODE, "max_attempts": settings.AWS_MAX_ATTEMPTS},
+        connect_timeout=settings.AWS_CONNECT_TIMEOUT,
+        read_timeout=settings.AWS_READ_TIMEOUT,
+        tcp_keepalive=settings.AWS_TCP_KEEPALIVE,
+    )
+
+def client_kwargs(service: str, max_pool_connections: int) -> Dict[str, Any]:
+    """Keyword arguments for ``boto3.client``/``boto3.resource``."""
+    kwargs = {
+        "region_name": settings.AWS_REGION,
+        "aws_access_key_id": settings.AWS_ACCESS_KEY_ID or None,
+        "aws_secret_access_key": settings.AWS_SECRET_ACCESS_KEY or None,
+        "config": client_config(max_pool_connections),
+    }
+    endpoint = _ENDPOINTS.get(service, lambda: "")()
+    if endpoint:
+        kwargs["endpoint_url"] = endpoint
+    return kwargs
+
+def _get(kind: str, service: str, max_pool_connections: int, create: Callable[..., Any]) -> Any:
+    key = (kind, service, max_pool_connections)
+    instance = _cache.get(key)
+    if instance is None:
+        with _lock:
+            instance = _cache.get(key)
+            if instance is None:
+                instance = create(service, **client_kwargs(service, max_pool_connections))
+                _cache[key] = instance
+    return instance
+
+def get_client(service: str, max_pool_connections: int = 10) -> Any:
+    """Get the shared client of ``service``, creating it on first use."""
+    return _get("client", service, max_pool_connections, boto3.client)
+
+def get_resource(service: str, max_pool_connections: int = 10) -> Any:
+    """Get the shared resource of ``service``, creating it on first use."""
+    return _get("resource", service, max_pool_connections, boto3.resource)
+
+def reset() -> None:
+    """Drop the shared clients, e.g. after changing settings in tests."""
+    with _lock:
+        _cache.clear()
+
+class LazyProxy:
+    """Stands in for the object returned by ``factory``, created on first attribute access."""
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._target: Optional[Any] = None
+        self._target_lock = threading.Lock()
+
+    def _resolve(self) -> Any:
+        if self._target is None:
+            with self._target_lock:
+                if self._target is None:
+                    self._target = self._factory()
+        return self._target
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+class LazyTable:
+    """A DynamoDB table handle resolved from ``resource()`` on first use.
+
+    ``name`` is available without resolving. The handle is rebuilt if
+    ``resource()`` starts returning a different resource.
+    """
+
+    def __init__(self, name: str, resource: Callable[[], Any]):
+        self.name = name
+        self._resource = resource
+        self._bound: Tuple[Any, Any] = (None, None)
+
+    def __getattr__(self, attribute: str) -> Any:
+        resource = self._resource()
+        bound_resource, table = self._bound
+        if bound_resource is not resource:
+            table = resource.Table(self.name)
+            self._bound = (resource, table)
+        return getattr(table, attribute)
+
+    def __repr__(self) -> str:
+        return f"LazyTable({self.name!r})"
@@ -0,0 +1,99 @@
+"""
+Consumed-capacity and latency accounting for DynamoDB calls.
+
+The data layer sends every request with ``ReturnConsumedCapacity`` and
+reports it here with the wall time of the call (including the wait for an
+executor thread). Calls are aggregated per API route, operation, table and
+index into the ``dynamodb_calls`` stats of the metrics registry:
+
+- ``count``: requests sent
+- ``capacity_units``: read or write capacity units consumed, GSI writes
+  included
+- ``items``: items returned or written
+- ``pages``: Query/Scan result pages
+- ``errors``: requests that raised
+- ``seconds``: total wall time
+
+``report()`` rolls the rows up per route for the debug endpoint.
+"""
+from typing import Any, Dict, List, Optional
+from backend.core.metrics import metrics
+from backend.core.middleware import current_route
+
+calls = metrics.stats(
+    "dynamodb_calls",
+    ("route", "operation", "table", "index"),
+    "DynamoDB requests with their consumed capacity, items, pages and wall time"
+)
+
+_PAGED_OPERATIONS = {"Query", "Scan"}
+
+def consumed_units(response: Optional[Dict[str, Any]], table_name: str) -> float:
+    """Capacity units a response reports for ``table_name``.
+
+    Single-table operations return one ``ConsumedCapacity`` dict, batch and
+    transaction operations a list with an entry per table.
+    """
+    consumed = (response or {}).get("ConsumedCapacity")
+    if not consumed:
+        return 0.0
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    return float(sum(
+        entry.get("CapacityUnits", 0) for entry in consumed
+        if entry.get("TableName") == table_name
+    ))
+
+def item_count(operation: str, request: Dict[str, Any], response: Optional[Dict[str, Any]], table_name: str) -> int:
+    """Items a call read or wrote."""
+    if response is None:
+        return 0
+    if operation in _PAGED_OPERATIONS:
+        return len(response.get("Items", []))
+    if operation == "GetItem":
+        return 1 if response.get("Item") else 0
+    if operation == "BatchGetItem":
+        return len(response.get("Responses", {}).get(table_name, []))
+    if operation == "BatchWriteItem":
+        sent = len(request.get("RequestItems", {}).get(table_name, []))
+        return sent - len(response.get("UnprocessedItems", {}).get(table_name, []))
+    if operation == "TransactWriteItems":
+        return len(request.get("TransactItems", []))
+    return 1
+
+def record(
+    operation: str,
+    table_name: str,
+    index_name: Optional[str],
+    request: Dict[str, Any],
+    response: Optional[Dict[str, Any]],
+    seconds: float
+) -> None:
+    """Add one DynamoDB request to the stats; ``response`` is None if it raised."""
+    calls.observe(
+        (current_route(), operation, table_name, index_name or "-"),
+        capacity_units=consumed_units(response, table_name),
+        items=item_count(operation, request, response, table_name),
+        pages=1 if operation in _PAGED_OPERATIONS and response is not None else 0,
+        errors=1 if response is None else 0,
+        seconds=seconds
+    )
+
+def report() -> Dict[str, List[Dict[str, Any]]]:
+    """Aggregates per route and per call, most capacity first."""
+    rows = calls.rows()
+    routes: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        route = routes.setdefault(row["route"], {
+            "route": row["route"], "count": 0, "capacity_units": 0.0,
+            "items": 0, "pages": 0, "errors": 0, "seconds": 0.0
+        })
+        for field in ("count", "capacity_units", "items", "pages", "errors", "seconds"):
+            route[field] += row.get(field, 0)
+
+    def ranked(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        for entry in entries:
+            entry["avg_ms"] = round(entry["seconds"] / entry["count"] * 1000, 3) if entry["count"] else 0.0
+        return sorted(entries, key=lambda entry: (-entry["capacity_units"], -entry["seconds"]))
+
+    return {"routes": ranked(list(routes.values())), "calls": ranked(rows)}
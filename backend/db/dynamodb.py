@@ -1,40 +1,196 @@
 """
 DynamoDB database utilities.
+
+boto3 is synchronous, so every table call is offloaded to a shared, bounded
+thread pool via ``_run``. This keeps the event loop free while a request waits
+on DynamoDB. The resource comes from ``backend.db.aws`` with its connection
+pool sized to the same number of workers, so threads never queue for a
+connection. It and the table handles are created on first use.
+
+With ``DYNAMODB_BACKEND=memory`` the tables are served by the in-process
+stand-in in ``backend.db.memory`` instead, optionally persisted to SQLite at
+``DYNAMODB_MEMORY_PATH``.
+
+Within a request, reads go through the identity map in
+``backend.db.request_cache`` and writes invalidate it. Every request to
+DynamoDB asks for its consumed capacity, which ``backend.db.capacity``
+aggregates per route, operation, table and index.
+
+With ``DYNAMODB_FAST_READS`` queries skip the resource layer: they go through
+a low-level client and ``backend.db.wire`` converts the items, reading the
+known numeric attributes of each table as ``int``/``float`` instead of
+``Decimal``. Pass ``attributes`` to fetch and convert only what the caller
+uses.
 """
-import boto3
-from typing import Dict, List, Optional, Any
+import asyncio
+import math
+import random
+import time
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Any, AsyncIterator, Callable, Tuple
 from backend.config import settings
-from backend.core.utils import generate_uuid, get_current_timestamp
+from backend.core.exceptions import AppException, ConflictException, NotFoundException
+from backend.core.utils import generate_uuid, get_current_timestamp, normalize_timestamp
+from backend.db import capacity, wire
+from backend.db.aws import LazyProxy, LazyTable, get_client, get_resource
+from backend.db.request_cache import MISSING, RequestCache, cache_hits, current_cache, round_trips_avoided
+from backend.db.tables import TABLE_DEFINITIONS
+
+# DynamoDB resource, created on first use
+def _create_resource():
+    if settings.DYNAMODB_BACKEND == "memory":
+        from backend.db.memory import MemoryDynamoDB
+
+        return MemoryDynamoDB(TABLE_DEFINITIONS, settings.DYNAMODB_MEMORY_PATH or None)
+    return get_resource("dynamodb", max_pool_connections=settings.DYNAMODB_MAX_WORKERS)
+
+dynamodb = LazyProxy(_create_resource)
+dynamodb_client = LazyProxy(lambda: dynamodb.meta.client)
+
+def _wire_client():
+    """Low-level client that returns items in wire format, for the fast read path."""
+    resource = dynamodb
+    # The in-process stand-in serves wire-format calls itself
+    if hasattr(resource, "wire_client"):
+        return resource.wire_client
+    return get_client("dynamodb", max_pool_connections=settings.DYNAMODB_MAX_WORKERS)
+
+def _table(name: str) -> LazyTable:
+    # Look the resource up on every use so patching ``dynamodb`` reaches the tables
+    return LazyTable(name, lambda: dynamodb)
+
+# Table references
+users_table = _table("Users")
+medications_table = _table("Medications")
+reminders_table = _table("Reminders")
+mood_entries_table = _table("MoodEntries")
+journal_entries_table = _table("JournalEntries")
+assessments_table = _table("Assessments")
+resources_table = _table("Resources")
+feedback_table = _table("Feedback")
+chat_history_table = _table("ChatHistory")
+
+# Shared executor for blocking boto3 calls
+_executor = ThreadPoolExecutor(
+    max_workers=settings.DYNAMODB_MAX_WORKERS,
+    thread_name_prefix="dynamodb"
+)
+
+# Batch operation limits
+BATCH_GET_MAX_KEYS = 100
+BATCH_WRITE_MAX_ITEMS = 25
+BATCH_MAX_ATTEMPTS = 6
+BATCH_BASE_DELAY = 0.05  # Seconds; doubled on every retry
+BATCH_MAX_DELAY = 2.0
+
+# Primary key attributes of each table, used to register query results in the request cache
+TABLE_KEY_NAMES = {
+    table["TableName"]: [key["AttributeName"] for key in table["KeySchema"]]
+    for table in TABLE_DEFINITIONS
+}
 
-# Initialize DynamoDB client
-dynamodb_kwargs = {
-    "region_name": settings.AWS_REGION,
-    "aws_access_key_id": settings.AWS_ACCESS_KEY_ID,
-    "aws_secret_access_key": settings.AWS_SECRET_ACCESS_KEY,
+# DynamoDB reserved keywords
+RESERVED_KEYWORDS = {
+    "name", "timestamp", "user", "status", "date", "year", "month", "day",
+    "time", "index", "count", "size", "type", "key", "value", "order"
 }
 
-dynamodb = boto3.resource("dynamodb", **dynamodb_kwargs)
-dynamodb_client = boto3.client("dynamodb", **dynamodb_kwargs)
+async def _run(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking boto3 call on the shared executor without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(func, *args, **kwargs))
+
+async def _call(operation: str, table, func: Callable[..., Any], index_name: Optional[str] = None, **kwargs: Any) -> Dict[str, Any]:
+    """Send a DynamoDB request for ``table`` via ``_run``, recording its consumed capacity and wall time."""
+    if not settings.DYNAMODB_CAPACITY_METRICS:
+        return await _run(func, **kwargs)
+
+    kwargs["ReturnConsumedCapacity"] = "TOTAL"
+    response = None
+    start = time.perf_counter()
+    try:
+        response = await _run(func, **kwargs)
+        return response
+    finally:
+        capacity.record(operation, table.name, index_name, kwargs, response, time.perf_counter() - start)
+
+async def _backoff(attempt: int) -> None:
+    """Sleep before retrying unprocessed batch items (exponential backoff with full jitter)."""
+    delay = min(BATCH_MAX_DELAY, BATCH_BASE_DELAY * (2 ** attempt))
+    await asyncio.sleep(random.uniform(0, delay))
+
+def _alias_attribute(name: str, expression_attribute_names: Dict[str, str]) -> str:
+    """Get the ``#name`` placeholder for an attribute and register it in ``expression_attribute_names``."""
+    placeholder = f"#{name}"
+    expression_attribute_names[placeholder] = name
+    return placeholder
+
+def _projection_expression(attributes: List[str], expression_attribute_names: Dict[str, str]) -> str:
+    """Build a ProjectionExpression for ``attributes``.
+
+    Every attribute is aliased, not just the reserved words listed above,
+    since DynamoDB reserves several hundred words and a projection is
+    rejected if any of them slips through.
+    """
+    return ", ".join(_alias_attribute(name, expression_attribute_names) for name in attributes)
+
+def _key_identity(key: Dict[str, Any]) -> tuple:
+    """Get a hashable identity for a primary key."""
+    return tuple(sorted(key.items()))
+
+def _project_item(item: Dict[str, Any], attributes: List[str]) -> Dict[str, Any]:
+    """Keep only ``attributes`` of an item."""
+    return {name: item[name] for name in attributes if name in item}
+
+def _cached_item(cache: RequestCache, table, identity: tuple, attributes: Optional[List[str]] = None) -> Any:
+    """Look an item up in the request cache.
+
+    A projection is answered from the full item when that is cached. Returns
+    ``MISSING`` when the cache cannot answer, and None for an item known not
+    to exist.
+    """
+    item = cache.get(table.name, ("item", identity))
+    if item is MISSING:
+        if attributes:
+            return cache.get(table.name, ("item", identity, tuple(attributes)))
+        return MISSING
+    if item is not None and attributes:
+        return _project_item(item, attributes)
+    return item
 
-# Table references
-users_table = dynamodb.Table("Users")
-medications_table = dynamodb.Table("Medications")
-reminders_table = dynamodb.Table("Reminders")
-mood_entries_table = dynamodb.Table("MoodEntries")
-journal_entries_table = dynamodb.Table("JournalEntries")
-assessments_table = dynamodb.Table("Assessments")
-resources_table = dynamodb.Table("Resources")
-feedback_table = dynamodb.Table("Feedback")
-chat_history_table = dynamodb.Table("ChatHistory")
+def _remember_item(cache: RequestCache, table, identity: tuple, item: Optional[Dict[str, Any]], attributes: Optional[List[str]] = None) -> None:
+    """Store a get result (None when the item does not exist) in the request cache."""
+    cache_key = ("item", identity, tuple(attributes)) if attributes else ("item", identity)
+    cache.set(table.name, cache_key, item)
+
+def _remember_query_items(cache: RequestCache, table, items: List[Dict[str, Any]]) -> None:
+    """Register full items returned by a query in the request cache by primary key."""
+    key_names = TABLE_KEY_NAMES.get(table.name)
+    if not key_names:
+        return
+    for item in items:
+        if all(name in item for name in key_names):
+            _remember_item(cache, table, _key_identity({name: item[name] for name in key_names}), item)
+
+def _invalidate(table) -> None:
+    """Forget what the current request has read from ``table`` after writing to it."""
+    cache = current_cache()
+    if cache is not None:
+        cache.invalidate(table.name)
 
 # User operations
-async def create_user(user_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Create a new user."""
-    user_id = generate_uuid()
+def email_claim_key(email: str) -> str:
+    """Get the Users table key of the item that reserves an email address."""
+    return f"email#{email}"
+
+def build_user_item(user_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a new user item with a generated ID and creation timestamps."""
     timestamp = get_current_timestamp()
 
-    user_item = {
-        "user_id": user_id,
+    return {
+        "user_id": generate_uuid(),
         "email": user_data["email"],
         "password_hash": user_data["password_hash"],
         "name": user_data.get("name", ""),
@@ -44,21 +200,63 @@ async def create_user(user_data: Dict[str, Any]) -> Dict[str, Any]:
         "notification_settings": user_data.get("notification_settings", {})
     }
 
-    users_table.put_item(Item=user_item)
+async def create_user(user_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Create a new user.
+
+    The user item is written in one transaction with an email-claim item
+    whose key is derived from the email. The claim is conditional on not
+    existing yet, so two concurrent registrations for the same email cannot
+    both succeed.
+    """
+    user_item = build_user_item(user_data)
+
+    # The claim has no email attribute, so it never appears in EmailIndex
+    claim_item = {
+        "user_id": email_claim_key(user_data["email"]),
+        "owner_user_id": user_item["user_id"],
+        "created_at": user_item["created_at"]
+    }
+
+    try:
+        await _call(
+            "TransactWriteItems",
+            users_table,
+            dynamodb.meta.client.transact_write_items,
+            TransactItems=[
+                {
+                    "Put": {
+                        "TableName": users_table.name,
+                        "Item": claim_item,
+                        "ConditionExpression": "attribute_not_exists(user_id)"
+                    }
+                },
+                {"Put": {"TableName": users_table.name, "Item": user_item}}
+            ]
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "TransactionCanceledException":
+            reasons = e.response.get("CancellationReasons", [])
+            if reasons and reasons[0].get("Code") == "ConditionalCheckFailed":
+                raise ConflictException("User with this email already exists")
+        raise
+    finally:
+        _invalidate(users_table)
+
     return user_item
 
 async def get_user_by_id(user_id: str) -> Optional[Dict[str, Any]]:
     """Get a user by ID."""
-    response = users_table.get_item(Key={"user_id": user_id})
-    return response.get("Item")
+    return await get_item(users_table, user_id, "user_id")
 
 async def get_user_by_email(email: str) -> Optional[Dict[str, Any]]:
     """Get a user by email."""
-    response = users_table.scan(
-        FilterExpression="email = :email",
-        ExpressionAttributeValues={":email": email}
+    items = await query_items(
+        users_table,
+        "email = :email",
+        {":email": email},
+        "EmailIndex",
+        limit=1
     )
-    items = response.get("Items", [])
     return items[0] if items else None
 
 async def update_user(user_id: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -72,18 +270,111 @@ async def update_user(user_id: str, update_data: Dict[str, Any]) -> Dict[str, An
             update_expression += f", {key} = :{key}"
             expression_attribute_values[f":{key}"] = value
 
-    response = users_table.update_item(
-        Key={"user_id": user_id},
-        UpdateExpression=update_expression,
-        ExpressionAttributeValues=expression_attribute_values,
-        ReturnValues="ALL_NEW"
-    )
+    try:
+        response = await _call(
+            "UpdateItem",
+            users_table,
+            users_table.update_item,
+            Key={"user_id": user_id},
+            UpdateExpression=update_expression,
+            ExpressionAttributeValues=expression_attribute_values,
+            ReturnValues="ALL_NEW"
+        )
+    finally:
+        _invalidate(users_table)
 
     return response.get("Attributes", {})
 
+# Refresh-token sessions
+def session_key(session_id: str) -> str:
+    """Get the Users table key of a refresh-token session."""
+    return f"session#{session_id}"
+
+async def create_session(session_item: Dict[str, Any]) -> None:
+    """Store a refresh-token session item."""
+    try:
+        await _call("PutItem", users_table, users_table.put_item, Item=session_item)
+    finally:
+        _invalidate(users_table)
+
+async def rotate_session(session_id: str, secret_hash: str, new_secret_hash: str, expires_at: int, now: int) -> Optional[Dict[str, Any]]:
+    """Replace the secret of an unexpired session holding ``secret_hash``.
+
+    The check and the write are one conditional UpdateItem, so a secret can
+    be rotated only once. Returns the updated item, or None if the session
+    does not exist, has expired or holds another secret.
+    """
+    try:
+        response = await _call(
+            "UpdateItem",
+            users_table,
+            users_table.update_item,
+            Key={"user_id": session_key(session_id)},
+            UpdateExpression="SET secret_hash = :new_secret_hash, expires_at = :expires_at",
+            ConditionExpression="secret_hash = :secret_hash AND expires_at > :now",
+            ExpressionAttributeValues={
+                ":new_secret_hash": new_secret_hash,
+                ":expires_at": expires_at,
+                ":secret_hash": secret_hash,
+                ":now": now
+            },
+            ReturnValues="ALL_NEW"
+        )
+    except ClientError as e:
+        if _is_conditional_check_failure(e):
+            return None
+        raise
+    finally:
+        _invalidate(users_table)
+
+    return response.get("Attributes")
+
+async def delete_session(session_id: str) -> None:
+    """Delete a refresh-token session, if it exists."""
+    await delete_item(users_table, session_key(session_id), "user_id")
+
+# Per-user data versions
+def versions_key(user_id: str) -> str:
+    """Get the Users table key of the item holding a user's data versions."""
+    return f"versions#{user_id}"
+
+async def get_versions(user_id: str, names: List[str]) -> Dict[str, int]:
+    """Read a user's version counters; counters never bumped are 0.
+
+    The read is strongly consistent, so a version bumped by a write that
+    has returned is always seen.
+    """
+    expression_attribute_names = {}
+    response = await _call(
+        "GetItem",
+        users_table,
+        users_table.get_item,
+        Key={"user_id": versions_key(user_id)},
+        ProjectionExpression=_projection_expression(names, expression_attribute_names),
+        ExpressionAttributeNames=expression_attribute_names,
+        ConsistentRead=True
+    )
+    item = response.get("Item", {})
+    return {name: int(item.get(name, 0)) for name in names}
+
+async def bump_version(user_id: str, name: str) -> None:
+    """Increment a user's version counter, creating it if needed."""
+    try:
+        await _call(
+            "UpdateItem",
+            users_table,
+            users_table.update_item,
+            Key={"user_id": versions_key(user_id)},
+            UpdateExpression="ADD #name :one",
+            ExpressionAttributeNames={"#name": name},
+            ExpressionAttributeValues={":one": 1}
+        )
+    finally:
+        _invalidate(users_table)
+
 # Generic CRUD operations
-async def create_item(table, item_data: Dict[str, Any], pk_name: str, sk_name: Optional[str] = None) -> Dict[str, Any]:
-    """Create a new item in a table."""
+def build_item(item_data: Dict[str, Any], pk_name: str, sk_name: Optional[str] = None) -> Dict[str, Any]:
+    """Build a new item with a generated ID and creation timestamps."""
     item_id = generate_uuid()
     timestamp = get_current_timestamp()
 
@@ -97,39 +388,84 @@ async def create_item(table, item_data: Dict[str, Any], pk_name: str, sk_name: O
     if sk_name and sk_name in item_data:
         item[sk_name] = item_data[sk_name]
 
-    table.put_item(Item=item)
     return item
 
-async def get_item(table, pk_value: str, pk_name: str, sk_value: Optional[str] = None, sk_name: Optional[str] = None) -> Optional[Dict[str, Any]]:
-    """Get an item from a table."""
+async def create_item(table, item_data: Dict[str, Any], pk_name: str, sk_name: Optional[str] = None) -> Dict[str, Any]:
+    """Create a new item in a table."""
+    item = build_item(item_data, pk_name, sk_name)
+    try:
+        await _call("PutItem", table, table.put_item, Item=item)
+    finally:
+        _invalidate(table)
+    return item
+
+async def create_items(table, items_data: List[Dict[str, Any]], pk_name: str, sk_name: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Create many new items in a table with BatchWriteItem.
+
+    Returns the items that were written under ``created`` and the ones that
+    were not, with the reason, under ``failed``.
+    """
+    items = [build_item(item_data, pk_name, sk_name) for item_data in items_data]
+    results = await batch_put_items(table, items, pk_name, sk_name)
+
+    return {
+        "created": [item for item, result in zip(items, results) if result["success"]],
+        "failed": [
+            {"item": item, "error": result["error"]}
+            for item, result in zip(items, results)
+            if not result["success"]
+        ]
+    }
+
+async def get_item(table, pk_value: str, pk_name: str, sk_value: Optional[str] = None, sk_name: Optional[str] = None, attributes: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+    """Get an item from a table, optionally reading only ``attributes``."""
     key = {pk_name: pk_value}
     if sk_name and sk_value:
         key[sk_name] = sk_value
 
-    response = table.get_item(Key=key)
-    return response.get("Item")
+    cache = current_cache()
+    if cache is not None:
+        item = _cached_item(cache, table, _key_identity(key), attributes)
+        if item is not MISSING:
+            cache_hits.inc()
+            round_trips_avoided.inc()
+            return item
+
+    get_kwargs = {"Key": key}
+    if attributes:
+        expression_attribute_names = {}
+        get_kwargs["ProjectionExpression"] = _projection_expression(attributes, expression_attribute_names)
+        get_kwargs["ExpressionAttributeNames"] = expression_attribute_names
+
+    response = await _call("GetItem", table, table.get_item, **get_kwargs)
+    item = response.get("Item")
+
+    if cache is not None:
+        _remember_item(cache, table, _key_identity(key), item, attributes)
+    return item
+
+def _is_conditional_check_failure(error: ClientError) -> bool:
+    return error.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException"
+
+async def update_item(table, pk_value: str, pk_name: str, update_data: Dict[str, Any], sk_value: Optional[str] = None, sk_name: Optional[str] = None, must_exist: bool = False, not_found_detail: Optional[str] = None) -> Dict[str, Any]:
+    """Update an item in a table.
 
-async def update_item(table, pk_value: str, pk_name: str, update_data: Dict[str, Any], sk_value: Optional[str] = None, sk_name: Optional[str] = None) -> Dict[str, Any]:
-    """Update an item in a table."""
+    With ``must_exist`` the update is conditional on the item existing and
+    raises NotFoundException (with ``not_found_detail``) instead of creating
+    it, so callers need no separate existence check.
+    """
     timestamp = get_current_timestamp()
     update_expression = "SET updated_at = :updated_at"
     expression_attribute_values = {":updated_at": timestamp}
 
     expression_attribute_names = {}
 
-    # DynamoDB reserved keywords
-    reserved_keywords = [
-        "name", "timestamp", "user", "status", "date", "year", "month", "day",
-        "time", "index", "count", "size", "type", "key", "value", "order"
-    ]
-
     for key, value in update_data.items():
         if key not in [pk_name, sk_name, "created_at"]:
             # Check if the attribute name is a reserved keyword
-            if key.lower() in reserved_keywords:
+            if key.lower() in RESERVED_KEYWORDS:
                 # Use expression attribute names for reserved keywords
-                attribute_name = f"#{key}"
-                expression_attribute_names[attribute_name] = key
+                attribute_name = _alias_attribute(key, expression_attribute_names)
                 update_expression += f", {attribute_name} = :{key}"
             else:
                 update_expression += f", {key} = :{key}"
@@ -147,31 +483,483 @@ async def update_item(table, pk_value: str, pk_name: str, update_data: Dict[str,
         "ReturnValues": "ALL_NEW"
     }
 
+    if must_exist:
+        update_kwargs["ConditionExpression"] = f"attribute_exists({_alias_attribute(pk_name, expression_attribute_names)})"
+
     # Only include ExpressionAttributeNames if we have any
     if expression_attribute_names:
         update_kwargs["ExpressionAttributeNames"] = expression_attribute_names
 
-    response = table.update_item(**update_kwargs)
+    try:
+        response = await _call("UpdateItem", table, table.update_item, **update_kwargs)
+    except ClientError as e:
+        if must_exist and _is_conditional_check_failure(e):
+            raise NotFoundException(not_found_detail or "Item not found")
+        raise
+    finally:
+        _invalidate(table)
 
     return response.get("Attributes", {})
 
-async def delete_item(table, pk_value: str, pk_name: str, sk_value: Optional[str] = None, sk_name: Optional[str] = None) -> None:
-    """Delete an item from a table."""
+async def delete_item(table, pk_value: str, pk_name: str, sk_value: Optional[str] = None, sk_name: Optional[str] = None, must_exist: bool = False, not_found_detail: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Delete an item from a table and return it, or None if it did not exist.
+
+    With ``must_exist`` deleting a missing item raises NotFoundException
+    (with ``not_found_detail``) instead.
+    """
     key = {pk_name: pk_value}
     if sk_name and sk_value:
         key[sk_name] = sk_value
 
-    table.delete_item(Key=key)
+    delete_kwargs = {"Key": key, "ReturnValues": "ALL_OLD"}
+    if must_exist:
+        expression_attribute_names = {}
+        delete_kwargs["ConditionExpression"] = f"attribute_exists({_alias_attribute(pk_name, expression_attribute_names)})"
+        delete_kwargs["ExpressionAttributeNames"] = expression_attribute_names
+
+    try:
+        response = await _call("DeleteItem", table, table.delete_item, **delete_kwargs)
+    except ClientError as e:
+        if must_exist and _is_conditional_check_failure(e):
+            raise NotFoundException(not_found_detail or "Item not found")
+        raise
+    finally:
+        _invalidate(table)
+
+    return response.get("Attributes")
+
+# Batch operations
+async def _batch_get_chunk(table, keys: List[Dict[str, Any]], attributes: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Get up to 100 items, retrying unprocessed keys with backoff."""
+    items = []
+    request_items = {table.name: {"Keys": keys}}
+    if attributes:
+        expression_attribute_names = {}
+        request_items[table.name]["ProjectionExpression"] = _projection_expression(attributes, expression_attribute_names)
+        request_items[table.name]["ExpressionAttributeNames"] = expression_attribute_names
+
+    for attempt in range(BATCH_MAX_ATTEMPTS):
+        response = await _call("BatchGetItem", table, dynamodb.batch_get_item, RequestItems=request_items)
+        items.extend(response.get("Responses", {}).get(table.name, []))
+
+        request_items = response.get("UnprocessedKeys") or {}
+        if not request_items:
+            return items
+        await _backoff(attempt)
+
+    raise AppException(
+        f"DynamoDB did not process all keys for {table.name} after {BATCH_MAX_ATTEMPTS} attempts",
+        status_code=503
+    )
 
-async def query_items(table, key_condition_expression: str, expression_attribute_values: Dict[str, Any], index_name: Optional[str] = None) -> List[Dict[str, Any]]:
-    """Query items from a table."""
+async def batch_get_items(table, keys: List[Dict[str, Any]], attributes: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Get many items by primary key with BatchGetItem.
+
+    Duplicate keys are requested once, keys are sent in chunks of 100 that
+    run concurrently, and unprocessed keys are retried with backoff. Items
+    that do not exist are omitted; the result order is not defined. When
+    ``attributes`` is given only those are read, so include the key
+    attributes if the caller needs to match results to keys.
+    """
+    unique_keys = list({_key_identity(key): key for key in keys}.values())
+    if not unique_keys:
+        return []
+
+    # Answer what we can from the request cache and only fetch the rest
+    cache = current_cache()
+    cached_items = []
+    if cache is not None:
+        missing_keys = []
+        for key in unique_keys:
+            item = _cached_item(cache, table, _key_identity(key), attributes)
+            if item is MISSING:
+                missing_keys.append(key)
+            elif item is not None:
+                cached_items.append(item)
+
+        cache_hits.inc(len(unique_keys) - len(missing_keys))
+        round_trips_avoided.inc(
+            math.ceil(len(unique_keys) / BATCH_GET_MAX_KEYS) - math.ceil(len(missing_keys) / BATCH_GET_MAX_KEYS)
+        )
+        unique_keys = missing_keys
+
+    chunks = [
+        unique_keys[i:i + BATCH_GET_MAX_KEYS]
+        for i in range(0, len(unique_keys), BATCH_GET_MAX_KEYS)
+    ]
+    results = await asyncio.gather(*(_batch_get_chunk(table, chunk, attributes) for chunk in chunks))
+    fetched_items = [item for chunk_items in results for item in chunk_items]
+
+    # Full items can be matched back to their keys, so misses are remembered too
+    if cache is not None and not attributes and unique_keys:
+        key_names = list(unique_keys[0])
+        found = {_key_identity({name: item[name] for name in key_names}): item for item in fetched_items}
+        for key in unique_keys:
+            identity = _key_identity(key)
+            _remember_item(cache, table, identity, found.get(identity))
+
+    return cached_items + fetched_items
+
+def _write_request_identity(request: Dict[str, Any], key_names: List[str]) -> tuple:
+    """Get the identity of the item targeted by a BatchWriteItem request."""
+    if "PutRequest" in request:
+        item = request["PutRequest"]["Item"]
+        return _key_identity({name: item[name] for name in key_names})
+    return _key_identity(request["DeleteRequest"]["Key"])
+
+async def _batch_write(table, requests: List[Dict[str, Any]], key_names: List[str]) -> List[Dict[str, Any]]:
+    """Run put/delete requests with BatchWriteItem and report the outcome per request.
+
+    Requests for the same key are collapsed (the last one wins), since
+    DynamoDB rejects duplicate keys within a batch. Chunks of 25 run
+    concurrently up to ``DYNAMODB_BATCH_WRITE_CONCURRENCY``, and unprocessed
+    items are retried with jittered backoff.
+    """
+    unique_requests = {
+        _write_request_identity(request, key_names): request for request in requests
+    }
+    pending_chunks = list(unique_requests.values())
+    chunks = [
+        pending_chunks[i:i + BATCH_WRITE_MAX_ITEMS]
+        for i in range(0, len(pending_chunks), BATCH_WRITE_MAX_ITEMS)
+    ]
+    semaphore = asyncio.Semaphore(settings.DYNAMODB_BATCH_WRITE_CONCURRENCY)
+    errors = {}
+
+    async def write_chunk(chunk: List[Dict[str, Any]]) -> None:
+        async with semaphore:
+            pending = chunk
+            for attempt in range(BATCH_MAX_ATTEMPTS):
+                try:
+                    response = await _call("BatchWriteItem", table, dynamodb.batch_write_item, RequestItems={table.name: pending})
+                except ClientError as e:
+                    for request in pending:
+                        errors[_write_request_identity(request, key_names)] = e.response["Error"].get("Message", str(e))
+                    return
+
+                pending = response.get("UnprocessedItems", {}).get(table.name, [])
+                if not pending:
+                    return
+                await _backoff(attempt)
+
+            for request in pending:
+                errors[_write_request_identity(request, key_names)] = (
+                    f"Unprocessed after {BATCH_MAX_ATTEMPTS} attempts"
+                )
+
+    try:
+        await asyncio.gather(*(write_chunk(chunk) for chunk in chunks))
+    finally:
+        _invalidate(table)
+
+    results = []
+    for request in requests:
+        identity = _write_request_identity(request, key_names)
+        results.append({
+            "key": dict(identity),
+            "success": identity not in errors,
+            "error": errors.get(identity)
+        })
+    return results
+
+async def batch_put_items(table, items: List[Dict[str, Any]], pk_name: str, sk_name: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Put many items with BatchWriteItem.
+
+    Returns one result per item, in input order, with the item's ``key``,
+    ``success`` and ``error``.
+    """
+    key_names = [pk_name] + ([sk_name] if sk_name else [])
+    requests = [{"PutRequest": {"Item": item}} for item in items]
+    return await _batch_write(table, requests, key_names)
+
+async def batch_delete_items(table, keys: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Delete many items by primary key with BatchWriteItem.
+
+    Returns one result per key, in input order, with the ``key``, ``success``
+    and ``error``.
+    """
+    requests = [{"DeleteRequest": {"Key": key}} for key in keys]
+    return await _batch_write(table, requests, [])
+
+def user_range_condition(
+    user_id: str,
+    sort_key: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None
+) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+    """Build a key condition for a user's items within an ISO datetime range.
+
+    Returns the key condition expression, attribute values and attribute names
+    for a ``(user_id, sort_key)`` index. Bounds are normalized the same way
+    stored timestamps are, so the comparison is a plain string range.
+    """
+    key_condition_expression = "user_id = :user_id"
+    expression_attribute_values = {":user_id": user_id}
+    expression_attribute_names = {}
+
+    if start or end:
+        expression_attribute_names["#sort_key"] = sort_key
+        if start:
+            expression_attribute_values[":start"] = normalize_timestamp(start)
+        if end:
+            expression_attribute_values[":end"] = normalize_timestamp(end)
+
+        if start and end:
+            key_condition_expression += " AND #sort_key BETWEEN :start AND :end"
+        elif start:
+            key_condition_expression += " AND #sort_key >= :start"
+        else:
+            key_condition_expression += " AND #sort_key <= :end"
+
+    return key_condition_expression, expression_attribute_values, expression_attribute_names
+
+async def _paged_query(
+    table,
+    key_condition_expression: str,
+    expression_attribute_values: Dict[str, Any],
+    index_name: Optional[str] = None,
+    limit: Optional[int] = None,
+    scan_index_forward: bool = True,
+    expression_attribute_names: Optional[Dict[str, str]] = None,
+    attributes: Optional[List[str]] = None,
+    exclusive_start_key: Optional[Dict[str, Any]] = None
+) -> AsyncIterator[Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+    """Yield the items of every query response with its LastEvaluatedKey, up to ``limit`` items."""
     query_kwargs = {
         "KeyConditionExpression": key_condition_expression,
-        "ExpressionAttributeValues": expression_attribute_values
+        "ExpressionAttributeValues": expression_attribute_values,
+        "ScanIndexForward": scan_index_forward
     }
 
     if index_name:
         query_kwargs["IndexName"] = index_name
 
-    response = table.query(**query_kwargs)
-    return response.get("Items", [])
+    expression_attribute_names = dict(expression_attribute_names or {})
+    if attributes:
+        query_kwargs["ProjectionExpression"] = _projection_expression(attributes, expression_attribute_names)
+
+    if expression_attribute_names:
+        query_kwargs["ExpressionAttributeNames"] = expression_attribute_names
+
+    query = table.query
+    fast_reads = settings.DYNAMODB_FAST_READS
+    if fast_reads:
+        query_kwargs["TableName"] = table.name
+        query_kwargs["ExpressionAttributeValues"] = wire.serialize_values(expression_attribute_values)
+        query = partial(wire.query, _wire_client(), wire.NUMERIC_FIELDS.get(table.name, {}))
+
+    if exclusive_start_key:
+        query_kwargs["ExclusiveStartKey"] = wire.serialize_values(exclusive_start_key) if fast_reads else exclusive_start_key
+
+    remaining = limit
+    while remaining is None or remaining > 0:
+        if remaining is not None:
+            query_kwargs["Limit"] = remaining
+
+        response = await _call("Query", table, query, index_name=index_name, **query_kwargs)
+        items = response.get("Items", [])
+        if remaining is not None:
+            items = items[:remaining]
+            remaining -= len(items)
+
+        last_evaluated_key = response.get("LastEvaluatedKey")
+        # Keys leave in the resource's format whichever path read them
+        yield items, wire.deserialize_item(last_evaluated_key, {}) if fast_reads and last_evaluated_key else last_evaluated_key
+
+        if not last_evaluated_key:
+            break
+        query_kwargs["ExclusiveStartKey"] = last_evaluated_key
+
+async def query_pages(
+    table,
+    key_condition_expression: str,
+    expression_attribute_values: Dict[str, Any],
+    index_name: Optional[str] = None,
+    limit: Optional[int] = None,
+    scan_index_forward: bool = True,
+    expression_attribute_names: Optional[Dict[str, str]] = None,
+    attributes: Optional[List[str]] = None
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Yield pages of query results, following LastEvaluatedKey.
+
+    ``limit`` caps the total number of items read: it is pushed down to
+    DynamoDB as ``Limit`` on every request, and no further pages are fetched
+    once it is reached or the consumer stops iterating. ``attributes``
+    restricts each item to the listed attributes.
+    """
+    async for items, _ in _paged_query(
+        table,
+        key_condition_expression,
+        expression_attribute_values,
+        index_name,
+        limit,
+        scan_index_forward,
+        expression_attribute_names,
+        attributes
+    ):
+        if items:
+            yield items
+
+async def query_page(
+    table,
+    key_condition_expression: str,
+    expression_attribute_values: Dict[str, Any],
+    limit: int,
+    index_name: Optional[str] = None,
+    scan_index_forward: bool = True,
+    expression_attribute_names: Optional[Dict[str, str]] = None,
+    attributes: Optional[List[str]] = None,
+    exclusive_start_key: Optional[Dict[str, Any]] = None
+) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """Read one page of up to ``limit`` items, starting after ``exclusive_start_key``.
+
+    Returns the items and the LastEvaluatedKey to read the next page from,
+    or None when there are no more items. A page that ends exactly at the
+    last item may still return a key; the page after it is then empty.
+    """
+    items: List[Dict[str, Any]] = []
+    last_evaluated_key = None
+    async for page, last_evaluated_key in _paged_query(
+        table,
+        key_condition_expression,
+        expression_attribute_values,
+        index_name,
+        limit,
+        scan_index_forward,
+        expression_attribute_names,
+        attributes,
+        exclusive_start_key
+    ):
+        items.extend(page)
+    return items, last_evaluated_key
+
+async def scan_pages(table, attributes: Optional[List[str]] = None, page_size: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Yield pages of a full table scan, following LastEvaluatedKey.
+
+    Meant for background jobs; request handlers should query an index.
+    """
+    scan_kwargs: Dict[str, Any] = {}
+    if attributes:
+        expression_attribute_names = {}
+        scan_kwargs["ProjectionExpression"] = _projection_expression(attributes, expression_attribute_names)
+        scan_kwargs["ExpressionAttributeNames"] = expression_attribute_names
+    if page_size:
+        scan_kwargs["Limit"] = page_size
+
+    while True:
+        response = await _call("Scan", table, table.scan, **scan_kwargs)
+        items = response.get("Items", [])
+        if items:
+            yield items
+
+        last_evaluated_key = response.get("LastEvaluatedKey")
+        if not last_evaluated_key:
+            break
+        scan_kwargs["ExclusiveStartKey"] = last_evaluated_key
+
+async def iter_query_items(
+    table,
+    key_condition_expression: str,
+    expression_attribute_values: Dict[str, Any],
+    index_name: Optional[str] = None,
+    limit: Optional[int] = None,
+    scan_index_forward: bool = True,
+    expression_attribute_names: Optional[Dict[str, str]] = None,
+    attributes: Optional[List[str]] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield query results item by item, fetching pages lazily."""
+    async for page in query_pages(
+        table,
+        key_condition_expression,
+        expression_attribute_values,
+        index_name,
+        limit,
+        scan_index_forward,
+        expression_attribute_names,
+        attributes
+    ):
+        for item in page:
+            yield item
+
+async def query_items(
+    table,
+    key_condition_expression: str,
+    expression_attribute_values: Dict[str, Any],
+    index_name: Optional[str] = None,
+    limit: Optional[int] = None,
+    scan_index_forward: bool = True,
+    expression_attribute_names: Optional[Dict[str, str]] = None,
+    attributes: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """Query items from a table, reading every page up to ``limit`` items.
+
+    Within a request the result is remembered, so running the same query
+    again costs no round trip until the table is written to.
+    """
+    cache = current_cache()
+    if cache is not None:
+        cache_key = (
+            "query",
+            index_name,
+            key_condition_expression,
+            repr(sorted(expression_attribute_values.items())),
+            limit,
+            scan_index_forward,
+            repr(sorted((expression_attribute_names or {}).items())),
+            tuple(attributes or ())
+        )
+        items = cache.get(table.name, cache_key)
+        if items is not MISSING:
+            cache_hits.inc()
+            round_trips_avoided.inc()
+            return items
+
+    items = []
+    async for page in query_pages(
+        table,
+        key_condition_expression,
+        expression_attribute_values,
+        index_name,
+        limit,
+        scan_index_forward,
+        expression_attribute_names,
+        attributes
+    ):
+        items.extend(page)
+
+    if cache is not None:
+        cache.set(table.name, cache_key, items)
+        if not attributes:
+            _remember_query_items(cache, table, items)
+    return items
+
+async def query_user_range(
+    table,
+    index_name: str,
+    sort_key: str,
+    user_id: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    limit: Optional[int] = None,
+    newest_first: bool = True,
+    attributes: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """Query a user's items from a ``(user_id, sort_key)`` index, ordered by the sort key."""
+    key_condition_expression, expression_attribute_values, expression_attribute_names = user_range_condition(
+        user_id, sort_key, start, end
+    )
+
+    # DynamoDB rejects BETWEEN with an inverted range
+    if start and end and expression_attribute_values[":start"] > expression_attribute_values[":end"]:
+        return []
+
+    return await query_items(
+        table,
+        key_condition_expression,
+        expression_attribute_values,
+        index_name,
+        limit=limit,
+        scan_index_forward=not newest_first,
+        expression_attribute_names=expression_attribute_names or None,
+        attributes=attributes
+    )
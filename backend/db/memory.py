@@ -0,0 +1,996 @@
+"""
+In-process DynamoDB stand-in.
+
+Implements the subset of the boto3 DynamoDB service resource the data layer
+uses, so the whole API can run (and be benchmarked) without AWS or
+dynamodb-local:
+
+- ``Table(name)`` with ``put_item``, ``get_item``, ``update_item``,
+  ``delete_item``, ``query`` and ``scan``
+- ``batch_get_item``, ``batch_write_item`` and
+  ``meta.client.transact_write_items``
+- key schemas and GSIs from ``TABLE_DEFINITIONS``, including sparse indexes
+- condition, key condition, filter, update and projection expressions
+- ``Limit``, ``ExclusiveStartKey``/``LastEvaluatedKey`` and the 1 MB page cap
+- ``wire_client.query``, the low-level client call of the fast read path
+- ``ReturnConsumedCapacity``, with units computed from item sizes the way
+  DynamoDB does (4 KB read units, halved for eventually consistent reads;
+  1 KB write units, doubled in transactions)
+
+Values go through boto3's own type serializer on the way in, so items come
+back exactly as the real resource returns them (``Decimal`` numbers, sets) and
+floats are rejected the same way. Errors are raised as botocore
+``ClientError`` with the DynamoDB error codes.
+
+Pass ``path`` to persist the data in a SQLite file; it is loaded on start-up
+and every write goes through to it.
+"""
+import copy
+import json
+import math
+import re
+import sqlite3
+import threading
+from decimal import Decimal
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.exceptions import ClientError
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+
+# Maximum page size of a Query or Scan response
+MAX_PAGE_BYTES = 1024 * 1024
+
+# Capacity unit sizes
+READ_UNIT_BYTES = 4096
+WRITE_UNIT_BYTES = 1024
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+def _client_error(code: str, message: str, operation: str, **extra: Any) -> ClientError:
+    """Build a ``ClientError`` shaped like the one botocore raises."""
+    response = {"Error": {"Code": code, "Message": message}}
+    response.update(extra)
+    return ClientError(response, operation)
+
+def _serialize_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert an item to DynamoDB wire format."""
+    return {name: _serializer.serialize(value) for name, value in item.items()}
+
+def _deserialize_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert an item from DynamoDB wire format."""
+    return {name: _deserializer.deserialize(value) for name, value in item.items()}
+
+def _normalize(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Round-trip an item through the boto3 serializer so it holds the types DynamoDB would return."""
+    return _deserialize_item(_serialize_item(item))
+
+def _item_size(item: Dict[str, Any]) -> int:
+    """Approximate the stored size of an item in bytes."""
+    return len(json.dumps(_serialize_item(item), default=str))
+
+def _read_units(size: int, consistent: bool = False) -> float:
+    """Read capacity for ``size`` bytes; a read always costs at least one unit."""
+    units = max(1, math.ceil(size / READ_UNIT_BYTES))
+    return float(units) if consistent else units / 2
+
+def _write_units(*items: Optional[Dict[str, Any]]) -> float:
+    """Write capacity for replacing one item; sized by the larger of its old and new versions."""
+    size = max([_item_size(item) for item in items if item is not None] or [0])
+    return float(max(1, math.ceil(size / WRITE_UNIT_BYTES)))
+
+def _consumed_capacity(mode: Optional[str], table_name: str, units: float, kind: str) -> Dict[str, Any]:
+    """The ``ConsumedCapacity`` entry of a response, if ``mode`` asks for one."""
+    if mode not in ("TOTAL", "INDEXES"):
+        return {}
+    capacity = {"TableName": table_name, "CapacityUnits": units, f"{kind}CapacityUnits": units}
+    if mode == "INDEXES":
+        capacity["Table"] = {"CapacityUnits": units}
+    return capacity
+
+
+# Expressions
+
+_TOKEN_PATTERN = re.compile(
+    r"\s*(?:(?P<op><>|<=|>=|=|<|>|\(|\)|,|\+|-)|(?P<word>[#:]?[A-Za-z0-9_.\[\]]+))"
+)
+_UPDATE_CLAUSES = {"SET", "REMOVE", "ADD", "DELETE"}
+
+def _tokenize(expression: str) -> List[str]:
+    """Split an expression into operator and word tokens."""
+    tokens = []
+    position = 0
+    expression = expression.strip()
+    while position < len(expression):
+        match = _TOKEN_PATTERN.match(expression, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Invalid expression near: {expression[position:]!r}")
+        tokens.append(match.group("op") or match.group("word"))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser for DynamoDB condition and update expressions.
+
+    Conditions parse into nested tuples evaluated by ``_evaluate``. Attribute
+    name and value placeholders are resolved while parsing.
+    """
+
+    def __init__(self, expression: str, names: Optional[Dict[str, str]], values: Optional[Dict[str, Any]]):
+        self.tokens = _tokenize(expression)
+        self.position = 0
+        self.names = names or {}
+        self.values = values or {}
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def next(self) -> str:
+        token = self.peek()
+        if token is None:
+            raise ValueError("Unexpected end of expression")
+        self.position += 1
+        return token
+
+    def expect(self, expected: str) -> None:
+        token = self.next()
+        if token.upper() != expected:
+            raise ValueError(f"Expected {expected!r}, got {token!r}")
+
+    def at_end(self) -> bool:
+        return self.position >= len(self.tokens)
+
+    # Operands
+
+    def path(self) -> Tuple[str, str]:
+        token = self.next()
+        if token.startswith("#"):
+            if token not in self.names:
+                raise ValueError(f"Undefined attribute name placeholder: {token}")
+            return ("path", self.names[token])
+        if token.startswith(":") or token in "(),":
+            raise ValueError(f"Expected an attribute name, got {token!r}")
+        return ("path", token)
+
+    def operand(self) -> Tuple[str, Any]:
+        token = self.peek()
+        if token is not None and token.startswith(":"):
+            self.next()
+            if token not in self.values:
+                raise ValueError(f"Undefined attribute value placeholder: {token}")
+            return ("value", self.values[token])
+        if token is not None and token.lower() == "size" and self._is_call():
+            self.next()
+            self.expect("(")
+            path = self.path()
+            self.expect(")")
+            return ("size", path)
+        return self.path()
+
+    def _is_call(self) -> bool:
+        return self.position + 1 < len(self.tokens) and self.tokens[self.position + 1] == "("
+
+    # Conditions
+
+    def condition(self) -> Tuple:
+        return self._or()
+
+    def _or(self) -> Tuple:
+        node = self._and()
+        while (self.peek() or "").upper() == "OR":
+            self.next()
+            node = ("or", node, self._and())
+        return node
+
+    def _and(self) -> Tuple:
+        node = self._not()
+        while (self.peek() or "").upper() == "AND":
+            self.next()
+            node = ("and", node, self._not())
+        return node
+
+    def _not(self) -> Tuple:
+        if (self.peek() or "").upper() == "NOT":
+            self.next()
+            return ("not", self._not())
+        return self._primary()
+
+    def _primary(self) -> Tuple:
+        token = self.peek()
+        if token == "(":
+            self.next()
+            node = self.condition()
+            self.expect(")")
+            return node
+
+        function = (token or "").lower()
+        if function in ("attribute_exists", "attribute_not_exists") and self._is_call():
+            self.next()
+            self.expect("(")
+            path = self.path()
+            self.expect(")")
+            return (function, path)
+        if function in ("begins_with", "contains") and self._is_call():
+            self.next()
+            self.expect("(")
+            path = self.operand()
+            self.expect(",")
+            operand = self.operand()
+            self.expect(")")
+            return (function, path, operand)
+
+        left = self.operand()
+        operator = self.next()
+        if operator.upper() == "BETWEEN":
+            low = self.operand()
+            self.expect("AND")
+            return ("between", left, low, self.operand())
+        if operator.upper() == "IN":
+            self.expect("(")
+            options = [self.operand()]
+            while self.peek() == ",":
+                self.next()
+                options.append(self.operand())
+            self.expect(")")
+            return ("in", left, options)
+        if operator not in ("=", "<>", "<", "<=", ">", ">="):
+            raise ValueError(f"Unsupported operator: {operator!r}")
+        return ("compare", operator, left, self.operand())
+
+    # Update expressions
+
+    def update_actions(self) -> List[Tuple]:
+        actions = []
+        while not self.at_end():
+            clause = self.next().upper()
+            if clause not in _UPDATE_CLAUSES:
+                raise ValueError(f"Unsupported update clause: {clause!r}")
+            while True:
+                path = self.path()
+                if clause == "SET":
+                    self.expect("=")
+                    actions.append(("set", path[1], self._set_value()))
+                elif clause == "REMOVE":
+                    actions.append(("remove", path[1]))
+                else:
+                    actions.append((clause.lower(), path[1], self.operand()))
+                if self.peek() != ",":
+                    break
+                self.next()
+        return actions
+
+    def _set_value(self) -> Tuple:
+        node = self._set_operand()
+        if self.peek() in ("+", "-"):
+            operator = self.next()
+            node = ("arithmetic", operator, node, self._set_operand())
+        return node
+
+    def _set_operand(self) -> Tuple:
+        function = (self.peek() or "").lower()
+        if function in ("if_not_exists", "list_append") and self._is_call():
+            self.next()
+            self.expect("(")
+            first = self._set_operand()
+            self.expect(",")
+            second = self._set_operand()
+            self.expect(")")
+            return (function, first, second)
+        return self.operand()
+
+
+def _parse_condition(expression: str, names: Optional[Dict[str, str]], values: Optional[Dict[str, Any]]) -> Tuple:
+    parser = _Parser(expression, names, values)
+    node = parser.condition()
+    if not parser.at_end():
+        raise ValueError(f"Unexpected token: {parser.peek()!r}")
+    return node
+
+def _resolve(operand: Tuple, item: Dict[str, Any]) -> Any:
+    """Get the value of an operand for ``item`` (``None`` when the attribute is missing)."""
+    kind = operand[0]
+    if kind == "value":
+        return operand[1]
+    if kind == "size":
+        value = item.get(operand[1][1])
+        return None if value is None else len(value)
+    return item.get(operand[1])
+
+def _comparable(left: Any, right: Any) -> bool:
+    if left is None or right is None:
+        return False
+    numeric = (int, float, Decimal)
+    if isinstance(left, numeric) and isinstance(right, numeric):
+        return not isinstance(left, bool) and not isinstance(right, bool)
+    return type(left) is type(right)
+
+def _compare(operator: str, left: Any, right: Any) -> bool:
+    if operator == "=":
+        return _comparable(left, right) and left == right
+    if operator == "<>":
+        return not (_comparable(left, right) and left == right)
+    if not _comparable(left, right):
+        return False
+    if operator == "<":
+        return left < right
+    if operator == "<=":
+        return left <= right
+    if operator == ">":
+        return left > right
+    return left >= right
+
+def _evaluate(node: Tuple, item: Dict[str, Any]) -> bool:
+    """Evaluate a parsed condition against ``item``."""
+    kind = node[0]
+    if kind == "and":
+        return _evaluate(node[1], item) and _evaluate(node[2], item)
+    if kind == "or":
+        return _evaluate(node[1], item) or _evaluate(node[2], item)
+    if kind == "not":
+        return not _evaluate(node[1], item)
+    if kind == "attribute_exists":
+        return node[1][1] in item
+    if kind == "attribute_not_exists":
+        return node[1][1] not in item
+    if kind == "begins_with":
+        value, prefix = _resolve(node[1], item), _resolve(node[2], item)
+        return isinstance(value, str) and isinstance(prefix, str) and value.startswith(prefix)
+    if kind == "contains":
+        value, member = _resolve(node[1], item), _resolve(node[2], item)
+        if isinstance(value, str):
+            return isinstance(member, str) and member in value
+        return isinstance(value, (list, set)) and member in value
+    if kind == "between":
+        value = _resolve(node[1], item)
+        return _compare(">=", value, _resolve(node[2], item)) and _compare("<=", value, _resolve(node[3], item))
+    if kind == "in":
+        value = _resolve(node[1], item)
+        return any(_compare("=", value, _resolve(option, item)) for option in node[2])
+    return _compare(node[1], _resolve(node[2], item), _resolve(node[3], item))
+
+def _apply_update(item: Dict[str, Any], actions: List[Tuple]) -> None:
+    """Apply parsed update actions to ``item`` in place."""
+    def value_of(node: Tuple) -> Any:
+        kind = node[0]
+        if kind == "if_not_exists":
+            current = _resolve(node[1], item)
+            return current if current is not None else value_of(node[2])
+        if kind == "list_append":
+            return list(value_of(node[1])) + list(value_of(node[2]))
+        if kind == "arithmetic":
+            left, right = value_of(node[2]), value_of(node[3])
+            if left is None or right is None:
+                raise ValueError("An operand in the update expression does not exist")
+            return left + right if node[1] == "+" else left - right
+        return _resolve(node, item)
+
+    # All values are computed from the item as it was before the update
+    computed = [(action, value_of(action[2]) if action[0] == "set" else None) for action in actions]
+    for action, value in computed:
+        kind, name = action[0], action[1]
+        if kind == "set":
+            item[name] = value
+        elif kind == "remove":
+            item.pop(name, None)
+        elif kind == "add":
+            operand = _resolve(action[2], item)
+            current = item.get(name)
+            if current is None:
+                item[name] = operand
+            elif isinstance(current, set):
+                item[name] = current | operand
+            else:
+                item[name] = current + operand
+        elif kind == "delete":
+            remaining = item.get(name, set()) - _resolve(action[2], item)
+            if remaining:
+                item[name] = remaining
+            else:
+                item.pop(name, None)
+
+def _project(item: Dict[str, Any], projection: Optional[str], names: Optional[Dict[str, str]]) -> Dict[str, Any]:
+    """Copy ``item``, keeping only the attributes in ``projection`` when given."""
+    if not projection:
+        return copy.deepcopy(item)
+    names = names or {}
+    attributes = [names.get(part.strip(), part.strip()) for part in projection.split(",")]
+    return {name: copy.deepcopy(item[name]) for name in attributes if name in item}
+
+
+# Tables
+
+class _Index:
+    """Key schema of a table or one of its GSIs, with items grouped by partition."""
+
+    def __init__(self, name: Optional[str], key_schema: List[Dict[str, str]]):
+        self.name = name
+        self.hash_key = next(k["AttributeName"] for k in key_schema if k["KeyType"] == "HASH")
+        self.range_key = next((k["AttributeName"] for k in key_schema if k["KeyType"] == "RANGE"), None)
+        self.partitions: Dict[Any, Dict[Tuple, Dict[str, Any]]] = {}
+        self._sorted: Dict[Any, List[Tuple[Tuple, Dict[str, Any]]]] = {}
+
+    def covers(self, item: Dict[str, Any]) -> bool:
+        """Whether ``item`` has the key attributes of this index (GSIs are sparse)."""
+        return self.hash_key in item and (self.range_key is None or self.range_key in item)
+
+    def add(self, identity: Tuple, item: Dict[str, Any]) -> None:
+        if self.covers(item):
+            hash_value = item[self.hash_key]
+            self.partitions.setdefault(hash_value, {})[identity] = item
+            self._sorted.pop(hash_value, None)
+
+    def remove(self, identity: Tuple, item: Dict[str, Any]) -> None:
+        if self.covers(item):
+            hash_value = item[self.hash_key]
+            partition = self.partitions.get(hash_value)
+            if partition is not None:
+                partition.pop(identity, None)
+                if not partition:
+                    del self.partitions[hash_value]
+            self._sorted.pop(hash_value, None)
+
+    def partition(self, hash_value: Any) -> List[Tuple[Tuple, Dict[str, Any]]]:
+        """Get the items of a partition ordered by the range key (insertion order without one)."""
+        entries = self._sorted.get(hash_value)
+        if entries is None:
+            entries = list(self.partitions.get(hash_value, {}).items())
+            if self.range_key is not None:
+                entries.sort(key=lambda entry: entry[1][self.range_key])
+            self._sorted[hash_value] = entries
+        return entries
+
+
+class MemoryTable:
+    """In-memory stand-in for a boto3 ``Table`` resource."""
+
+    def __init__(self, resource: "MemoryDynamoDB", definition: Dict[str, Any]):
+        self.resource = resource
+        self.name = definition["TableName"]
+        self.primary = _Index(None, definition["KeySchema"])
+        self.indexes = {
+            index["IndexName"]: _Index(index["IndexName"], index["KeySchema"])
+            for index in definition.get("GlobalSecondaryIndexes", [])
+        }
+        self.items: Dict[Tuple, Dict[str, Any]] = {}
+
+    @property
+    def table_name(self) -> str:
+        return self.name
+
+    @property
+    def key_names(self) -> List[str]:
+        return [name for name in (self.primary.hash_key, self.primary.range_key) if name]
+
+    # Internal helpers (callers hold the resource lock)
+
+    def _identity(self, key: Dict[str, Any], operation: str) -> Tuple:
+        key = _normalize(key)
+        if set(key) != set(self.key_names):
+            raise _client_error(
+                "ValidationException",
+                "The provided key element does not match the schema",
+                operation
+            )
+        return tuple(key[name] for name in self.key_names)
+
+    def _key_of(self, item: Dict[str, Any], index: Optional[_Index] = None) -> Dict[str, Any]:
+        names = list(self.key_names)
+        if index is not None:
+            names += [name for name in (index.hash_key, index.range_key) if name and name not in names]
+        return {name: copy.deepcopy(item[name]) for name in names}
+
+    def _check(self, item: Optional[Dict[str, Any]], condition: Optional[str],
+               names: Optional[Dict[str, str]], values: Optional[Dict[str, Any]], operation: str) -> bool:
+        if not condition:
+            return True
+        try:
+            node = _parse_condition(condition, names, values)
+        except ValueError as e:
+            raise _client_error("ValidationException", str(e), operation)
+        return _evaluate(node, item or {})
+
+    def _store(self, identity: Tuple, item: Optional[Dict[str, Any]]) -> None:
+        """Replace (or remove, when ``item`` is None) the item at ``identity``."""
+        old = self.items.pop(identity, None)
+        for index in (self.primary, *self.indexes.values()):
+            if old is not None:
+                index.remove(identity, old)
+            if item is not None:
+                index.add(identity, item)
+        if item is not None:
+            self.items[identity] = item
+        self.resource._persist(self.name, identity, item)
+
+    def _prepare_put(self, item: Dict[str, Any], operation: str) -> Tuple[Tuple, Dict[str, Any]]:
+        item = _normalize(item)
+        missing = [name for name in self.key_names if name not in item]
+        if missing:
+            raise _client_error(
+                "ValidationException",
+                f"One or more parameter values were invalid: Missing the key {missing[0]} in the item",
+                operation
+            )
+        return tuple(item[name] for name in self.key_names), item
+
+    def _put(self, Item: Dict[str, Any], ConditionExpression: Optional[str] = None,
+             ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+             ExpressionAttributeValues: Optional[Dict[str, Any]] = None,
+             operation: str = "PutItem") -> Optional[Dict[str, Any]]:
+        identity, item = self._prepare_put(Item, operation)
+        values = _normalize(ExpressionAttributeValues or {})
+        old = self.items.get(identity)
+        if not self._check(old, ConditionExpression, ExpressionAttributeNames, values, operation):
+            raise _client_error("ConditionalCheckFailedException", "The conditional request failed", operation)
+        self._store(identity, item)
+        return old
+
+    def _update(self, Key: Dict[str, Any], UpdateExpression: str,
+                ConditionExpression: Optional[str] = None,
+                ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+                ExpressionAttributeValues: Optional[Dict[str, Any]] = None,
+                operation: str = "UpdateItem") -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        identity = self._identity(Key, operation)
+        values = _normalize(ExpressionAttributeValues or {})
+        old = self.items.get(identity)
+        if not self._check(old, ConditionExpression, ExpressionAttributeNames, values, operation):
+            raise _client_error("ConditionalCheckFailedException", "The conditional request failed", operation)
+
+        try:
+            parser = _Parser(UpdateExpression, ExpressionAttributeNames, values)
+            actions = parser.update_actions()
+            new = copy.deepcopy(old) if old is not None else _normalize(Key)
+            _apply_update(new, actions)
+        except (ValueError, TypeError) as e:
+            raise _client_error("ValidationException", str(e), operation)
+        if any(new.get(name) != value for name, value in zip(self.key_names, identity)):
+            raise _client_error(
+                "ValidationException",
+                "Cannot update attribute which is part of the key",
+                operation
+            )
+        self._store(identity, new)
+        return old, new
+
+    def _delete(self, Key: Dict[str, Any], ConditionExpression: Optional[str] = None,
+                ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+                ExpressionAttributeValues: Optional[Dict[str, Any]] = None,
+                operation: str = "DeleteItem") -> Optional[Dict[str, Any]]:
+        identity = self._identity(Key, operation)
+        values = _normalize(ExpressionAttributeValues or {})
+        old = self.items.get(identity)
+        if not self._check(old, ConditionExpression, ExpressionAttributeNames, values, operation):
+            raise _client_error("ConditionalCheckFailedException", "The conditional request failed", operation)
+        if old is not None:
+            self._store(identity, None)
+        return old
+
+    def _page(self, entries: Iterator[Tuple[Tuple, Dict[str, Any]]], index: Optional[_Index],
+              kwargs: Dict[str, Any], operation: str) -> Dict[str, Any]:
+        """Build one Query/Scan page from ordered ``entries``."""
+        names = kwargs.get("ExpressionAttributeNames")
+        values = _normalize(kwargs.get("ExpressionAttributeValues") or {})
+        limit = kwargs.get("Limit")
+        if limit is not None and limit < 1:
+            raise _client_error("ValidationException", "Limit must be greater than or equal to 1", operation)
+        try:
+            filter_node = (
+                _parse_condition(kwargs["FilterExpression"], names, values)
+                if kwargs.get("FilterExpression") else None
+            )
+        except ValueError as e:
+            raise _client_error("ValidationException", str(e), operation)
+
+        items, scanned, size = [], 0, 0
+        last_item = None
+        exhausted = True
+        for _, item in entries:
+            if (limit is not None and scanned >= limit) or size >= MAX_PAGE_BYTES:
+                exhausted = False
+                break
+            scanned += 1
+            size += self.resource._sizes.get((self.name, self._identity_of(item)), 0)
+            last_item = item
+            if filter_node is None or _evaluate(filter_node, item):
+                items.append(_project(item, kwargs.get("ProjectionExpression"), names))
+
+        response = {"Items": items, "Count": len(items), "ScannedCount": scanned}
+        if not exhausted and last_item is not None:
+            response["LastEvaluatedKey"] = self._key_of(last_item, index)
+        self._add_capacity(response, kwargs.get("ReturnConsumedCapacity"),
+                           _read_units(size, kwargs.get("ConsistentRead", False)), "Read")
+        return response
+
+    def _add_capacity(self, response: Dict[str, Any], mode: Optional[str], units: float, kind: str) -> Dict[str, Any]:
+        capacity = _consumed_capacity(mode, self.name, units, kind)
+        if capacity:
+            response["ConsumedCapacity"] = capacity
+        return response
+
+    def _identity_of(self, item: Dict[str, Any]) -> Tuple:
+        return tuple(item[name] for name in self.key_names)
+
+    @staticmethod
+    def _after(entries: List[Tuple[Tuple, Dict[str, Any]]], start_identity: Optional[Tuple]):
+        """Iterate ``entries`` after the one at ``start_identity``."""
+        started = start_identity is None
+        for entry in entries:
+            if started:
+                yield entry
+            elif entry[0] == start_identity:
+                started = True
+
+    # Table resource API
+
+    def put_item(self, Item: Dict[str, Any], ReturnValues: str = "NONE",
+                 ReturnConsumedCapacity: Optional[str] = None, **kwargs: Any) -> Dict[str, Any]:
+        with self.resource._lock:
+            old = self._put(Item, **kwargs)
+            response = {}
+            if ReturnValues == "ALL_OLD" and old is not None:
+                response["Attributes"] = copy.deepcopy(old)
+            return self._add_capacity(response, ReturnConsumedCapacity, _write_units(old, Item), "Write")
+
+    def get_item(self, Key: Dict[str, Any], ProjectionExpression: Optional[str] = None,
+                 ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+                 ConsistentRead: bool = False, ReturnConsumedCapacity: Optional[str] = None) -> Dict[str, Any]:
+        with self.resource._lock:
+            identity = self._identity(Key, "GetItem")
+            item = self.items.get(identity)
+            response = {}
+            if item is not None:
+                response["Item"] = _project(item, ProjectionExpression, ExpressionAttributeNames)
+            size = self.resource._sizes.get((self.name, identity), 0)
+            return self._add_capacity(response, ReturnConsumedCapacity, _read_units(size, ConsistentRead), "Read")
+
+    def update_item(self, Key: Dict[str, Any], UpdateExpression: str, ReturnValues: str = "NONE",
+                    ReturnConsumedCapacity: Optional[str] = None, **kwargs: Any) -> Dict[str, Any]:
+        with self.resource._lock:
+            old, new = self._update(Key, UpdateExpression, **kwargs)
+            response = {}
+            if ReturnValues == "ALL_NEW":
+                response["Attributes"] = copy.deepcopy(new)
+            elif ReturnValues == "ALL_OLD" and old is not None:
+                response["Attributes"] = copy.deepcopy(old)
+            elif ReturnValues in ("UPDATED_NEW", "UPDATED_OLD"):
+                source = new if ReturnValues == "UPDATED_NEW" else (old or {})
+                changed = {
+                    name for name in set(new) | set(old or {})
+                    if (old or {}).get(name) != new.get(name)
+                }
+                response["Attributes"] = {name: copy.deepcopy(source[name]) for name in changed if name in source}
+            return self._add_capacity(response, ReturnConsumedCapacity, _write_units(old, new), "Write")
+
+    def delete_item(self, Key: Dict[str, Any], ReturnValues: str = "NONE",
+                    ReturnConsumedCapacity: Optional[str] = None, **kwargs: Any) -> Dict[str, Any]:
+        with self.resource._lock:
+            old = self._delete(Key, **kwargs)
+            response = {}
+            if ReturnValues == "ALL_OLD" and old is not None:
+                response["Attributes"] = copy.deepcopy(old)
+            return self._add_capacity(response, ReturnConsumedCapacity, _write_units(old), "Write")
+
+    def query(self, KeyConditionExpression: str, IndexName: Optional[str] = None,
+              ScanIndexForward: bool = True, ExclusiveStartKey: Optional[Dict[str, Any]] = None,
+              **kwargs: Any) -> Dict[str, Any]:
+        with self.resource._lock:
+            if IndexName is None:
+                index = self.primary
+            elif IndexName in self.indexes:
+                index = self.indexes[IndexName]
+            else:
+                raise _client_error(
+                    "ValidationException",
+                    f"The table does not have the specified index: {IndexName}",
+                    "Query"
+                )
+
+            names = kwargs.get("ExpressionAttributeNames")
+            values = _normalize(kwargs.get("ExpressionAttributeValues") or {})
+            try:
+                node = _parse_condition(KeyConditionExpression, names, values)
+            except ValueError as e:
+                raise _client_error("ValidationException", str(e), "Query")
+            hash_value = self._hash_value(node, index)
+
+            entries = index.partition(hash_value)
+            if not ScanIndexForward:
+                entries = list(reversed(entries))
+            start = self._identity_of(_normalize(ExclusiveStartKey)) if ExclusiveStartKey else None
+            matching = (
+                entry for entry in self._after(entries, start)
+                if _evaluate(node, entry[1])
+            )
+            return self._page(matching, index if IndexName else None, kwargs, "Query")
+
+    def _hash_value(self, node: Tuple, index: _Index) -> Any:
+        """Find the partition key equality of a key condition."""
+        conditions = []
+        pending = [node]
+        while pending:
+            current = pending.pop()
+            if current[0] == "and":
+                pending.extend(current[1:])
+            else:
+                conditions.append(current)
+        for condition in conditions:
+            if (condition[0] == "compare" and condition[1] == "="
+                    and condition[2] == ("path", index.hash_key) and condition[3][0] == "value"):
+                return condition[3][1]
+        raise _client_error(
+            "ValidationException",
+            f"Query condition missed key schema element: {index.hash_key}",
+            "Query"
+        )
+
+    def scan(self, IndexName: Optional[str] = None, ExclusiveStartKey: Optional[Dict[str, Any]] = None,
+             **kwargs: Any) -> Dict[str, Any]:
+        with self.resource._lock:
+            index = self.indexes.get(IndexName) if IndexName else None
+            entries = [
+                (identity, item) for identity, item in self.items.items()
+                if index is None or index.covers(item)
+            ]
+            start = self._identity_of(_normalize(ExclusiveStartKey)) if ExclusiveStartKey else None
+            return self._page(self._after(entries, start), index, kwargs, "Scan")
+
+
+class _MissingTable:
+    """Table that does not exist; every call fails like DynamoDB does."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __getattr__(self, operation: str):
+        def fail(*args: Any, **kwargs: Any):
+            raise _client_error(
+                "ResourceNotFoundException",
+                f"Requested resource not found: Table: {self.name} not found",
+                operation
+            )
+        return fail
+
+
+class _MemoryClient:
+    """Stand-in for the low-level client reachable as ``resource.meta.client``."""
+
+    def __init__(self, resource: "MemoryDynamoDB"):
+        self.resource = resource
+
+    def transact_write_items(self, TransactItems: List[Dict[str, Any]],
+                             ReturnConsumedCapacity: Optional[str] = None, **kwargs: Any) -> Dict[str, Any]:
+        """Apply the writes all-or-nothing, failing if any condition does not hold."""
+        resource = self.resource
+        with resource._lock:
+            snapshot = {}
+            reasons = []
+            failed = False
+            units: Dict[str, float] = {}
+            for transact_item in TransactItems:
+                (operation, request), = transact_item.items()
+                table = resource._table(request["TableName"], "TransactWriteItems")
+                key = request.get("Key") or {name: request["Item"][name] for name in table.key_names}
+                identity = table._identity(key, "TransactWriteItems")
+                snapshot.setdefault((table.name, identity), (table, copy.deepcopy(table.items.get(identity))))
+                current = table.items.get(identity)
+                values = _normalize(request.get("ExpressionAttributeValues") or {})
+                if table._check(current, request.get("ConditionExpression"),
+                                request.get("ExpressionAttributeNames"), values, "TransactWriteItems"):
+                    reasons.append({"Code": "None"})
+                else:
+                    reasons.append({"Code": "ConditionalCheckFailed", "Message": "The conditional request failed"})
+                    failed = True
+
+            if failed:
+                raise _client_error(
+                    "TransactionCanceledException",
+                    "Transaction cancelled, please refer cancellation reasons for specific reasons",
+                    "TransactWriteItems",
+                    CancellationReasons=reasons
+                )
+
+            try:
+                for transact_item in TransactItems:
+                    (operation, request), = transact_item.items()
+                    table = resource._table(request["TableName"], "TransactWriteItems")
+                    identity = table._identity(
+                        request.get("Key") or {name: request["Item"][name] for name in table.key_names},
+                        "TransactWriteItems"
+                    )
+                    old = table.items.get(identity)
+                    if operation == "Put":
+                        table._put(request["Item"], operation="TransactWriteItems")
+                    elif operation == "Update":
+                        table._update(
+                            request["Key"], request["UpdateExpression"],
+                            ExpressionAttributeNames=request.get("ExpressionAttributeNames"),
+                            ExpressionAttributeValues=request.get("ExpressionAttributeValues"),
+                            operation="TransactWriteItems"
+                        )
+                    elif operation == "Delete":
+                        table._delete(request["Key"], operation="TransactWriteItems")
+                    # Transactional writes cost twice the standard units
+                    units[table.name] = units.get(table.name, 0) + 2 * _write_units(old, table.items.get(identity))
+            except ClientError:
+                for (_, identity), (table, item) in snapshot.items():
+                    table._store(identity, item)
+                raise
+            return resource._batch_capacity({}, ReturnConsumedCapacity, units, "Write")
+
+
+class _WireClient:
+    """Stand-in for a plain ``boto3.client("dynamodb")``.
+
+    Unlike ``resource.meta.client`` it takes and returns items in wire format
+    (``{"S": ...}``, ``{"N": "1"}``), as the fast read path expects.
+    """
+
+    def __init__(self, resource: "MemoryDynamoDB"):
+        self.resource = resource
+
+    def query(self, TableName: str, ExpressionAttributeValues: Optional[Dict[str, Any]] = None,
+              ExclusiveStartKey: Optional[Dict[str, Any]] = None, **kwargs: Any) -> Dict[str, Any]:
+        table = self.resource._table(TableName, "Query")
+        if ExpressionAttributeValues:
+            kwargs["ExpressionAttributeValues"] = _deserialize_item(ExpressionAttributeValues)
+        if ExclusiveStartKey:
+            kwargs["ExclusiveStartKey"] = _deserialize_item(ExclusiveStartKey)
+
+        response = table.query(**kwargs)
+        response["Items"] = [_serialize_item(item) for item in response["Items"]]
+        if "LastEvaluatedKey" in response:
+            response["LastEvaluatedKey"] = _serialize_item(response["LastEvaluatedKey"])
+        return response
+
+
+class MemoryDynamoDB:
+    """In-memory stand-in for ``boto3.resource("dynamodb")``.
+
+    Tables are created from ``table_definitions`` (``TABLE_DEFINITIONS``).
+    When ``path`` is given, data is persisted in a SQLite database at that path.
+    """
+
+    def __init__(self, table_definitions: List[Dict[str, Any]], path: Optional[str] = None):
+        self._lock = threading.RLock()
+        self._sizes: Dict[Tuple[str, Tuple], int] = {}
+        self.tables = {
+            definition["TableName"]: MemoryTable(self, definition)
+            for definition in table_definitions
+        }
+        self.meta = SimpleNamespace(client=_MemoryClient(self))
+        self.wire_client = _WireClient(self)
+
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS items ("
+                "table_name TEXT NOT NULL, item_key TEXT NOT NULL, item TEXT NOT NULL, "
+                "PRIMARY KEY (table_name, item_key))"
+            )
+            self._db.commit()
+            self._load()
+
+    def Table(self, name: str):
+        return self.tables.get(name) or _MissingTable(name)
+
+    def _table(self, name: str, operation: str) -> MemoryTable:
+        table = self.tables.get(name)
+        if table is None:
+            raise _client_error(
+                "ResourceNotFoundException",
+                f"Requested resource not found: Table: {name} not found",
+                operation
+            )
+        return table
+
+    # Persistence
+
+    @staticmethod
+    def _key_text(identity: Tuple) -> str:
+        return json.dumps([_serializer.serialize(value) for value in identity])
+
+    def _persist(self, table_name: str, identity: Tuple, item: Optional[Dict[str, Any]]) -> None:
+        if item is None:
+            self._sizes.pop((table_name, identity), None)
+        else:
+            self._sizes[(table_name, identity)] = _item_size(item)
+        if self._db is None:
+            return
+        if item is None:
+            self._db.execute(
+                "DELETE FROM items WHERE table_name = ? AND item_key = ?",
+                (table_name, self._key_text(identity))
+            )
+        else:
+            self._db.execute(
+                "INSERT OR REPLACE INTO items (table_name, item_key, item) VALUES (?, ?, ?)",
+                (table_name, self._key_text(identity), json.dumps(_serialize_item(item)))
+            )
+        self._db.commit()
+
+    def _load(self) -> None:
+        db, self._db = self._db, None  # Do not write back what is being loaded
+        try:
+            for table_name, item_text in db.execute("SELECT table_name, item FROM items"):
+                table = self.tables.get(table_name)
+                if table is not None:
+                    item = _deserialize_item(json.loads(item_text))
+                    table._store(table._identity_of(item), item)
+        finally:
+            self._db = db
+
+    def close(self) -> None:
+        """Close the SQLite database, if any."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    # Batch operations
+
+    def batch_get_item(self, RequestItems: Dict[str, Dict[str, Any]], **kwargs: Any) -> Dict[str, Any]:
+        if sum(len(request["Keys"]) for request in RequestItems.values()) > 100:
+            raise _client_error(
+                "ValidationException",
+                "Too many items requested for the BatchGetItem call",
+                "BatchGetItem"
+            )
+        responses = {}
+        units: Dict[str, float] = {}
+        with self._lock:
+            for table_name, request in RequestItems.items():
+                table = self._table(table_name, "BatchGetItem")
+                responses[table_name] = []
+                for key in request["Keys"]:
+                    identity = table._identity(key, "BatchGetItem")
+                    item = table.items.get(identity)
+                    units[table_name] = units.get(table_name, 0) + _read_units(
+                        self._sizes.get((table_name, identity), 0), request.get("ConsistentRead", False)
+                    )
+                    if item is not None:
+                        responses[table_name].append(_project(
+                            item,
+                            request.get("ProjectionExpression"),
+                            request.get("ExpressionAttributeNames")
+                        ))
+        return self._batch_capacity(
+            {"Responses": responses, "UnprocessedKeys": {}}, kwargs.get("ReturnConsumedCapacity"), units, "Read"
+        )
+
+    def batch_write_item(self, RequestItems: Dict[str, List[Dict[str, Any]]], **kwargs: Any) -> Dict[str, Any]:
+        if sum(len(requests) for requests in RequestItems.values()) > 25:
+            raise _client_error(
+                "ValidationException",
+                "Too many items requested for the BatchWriteItem call",
+                "BatchWriteItem"
+            )
+        with self._lock:
+            # Validate everything first: a malformed request fails the whole batch
+            prepared = []
+            for table_name, requests in RequestItems.items():
+                table = self._table(table_name, "BatchWriteItem")
+                for request in requests:
+                    if "PutRequest" in request:
+                        identity, item = table._prepare_put(request["PutRequest"]["Item"], "BatchWriteItem")
+                    else:
+                        identity, item = table._identity(request["DeleteRequest"]["Key"], "BatchWriteItem"), None
+                    prepared.append((table, identity, item))
+            units: Dict[str, float] = {}
+            for table, identity, item in prepared:
+                units[table.name] = units.get(table.name, 0) + _write_units(table.items.get(identity), item)
+                if item is not None or identity in table.items:
+                    table._store(identity, item)
+        return self._batch_capacity(
+            {"UnprocessedItems": {}}, kwargs.get("ReturnConsumedCapacity"), units, "Write"
+        )
+
+    @staticmethod
+    def _batch_capacity(response: Dict[str, Any], mode: Optional[str], units: Dict[str, float], kind: str) -> Dict[str, Any]:
+        """Add the per-table ``ConsumedCapacity`` list of a multi-table operation."""
+        if mode in ("TOTAL", "INDEXES"):
+            response["ConsumedCapacity"] = [
+                _consumed_capacity(mode, table_name, table_units, kind)
+                for table_name, table_units in units.items()
+            ]
+        return response
@@ -0,0 +1,69 @@
+"""
+Request-scoped identity map for the data layer.
+
+While a request is being handled, ``backend.db.dynamodb`` remembers what it
+has read: items by primary key, and query results by their full set of query
+parameters. Reading the same item or running the same query again within the
+request is then answered without a DynamoDB round trip. Full items returned
+by queries are also registered by primary key, so a later ``get_item`` or
+``batch_get_items`` for one of them is free too.
+
+Any write to a table drops everything remembered about that table. Values
+are copied in and out, so callers can mutate what they get back.
+
+The cache lives in a context variable set by ``request_cache_scope()``
+(entered per request by ``RequestCacheMiddleware``); outside a scope nothing
+is cached.
+"""
+import copy
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Hashable, Iterator, Optional
+from backend.core.metrics import metrics
+
+# Marker for "not in the cache"; None is a valid cached value (item not found)
+MISSING = object()
+
+cache_hits = metrics.counter(
+    "dynamodb_request_cache_hits",
+    "Reads answered from the request-scoped identity map"
+)
+round_trips_avoided = metrics.counter(
+    "dynamodb_round_trips_avoided",
+    "DynamoDB requests not sent because the identity map answered them"
+)
+
+class RequestCache:
+    """Reads remembered during one request, grouped by table."""
+
+    def __init__(self):
+        self._tables: Dict[str, Dict[Hashable, Any]] = {}
+
+    def get(self, table_name: str, key: Hashable) -> Any:
+        """Get a copy of a remembered value, or ``MISSING``."""
+        value = self._tables.get(table_name, {}).get(key, MISSING)
+        return value if value is MISSING else copy.deepcopy(value)
+
+    def set(self, table_name: str, key: Hashable, value: Any) -> None:
+        """Remember a copy of ``value``."""
+        self._tables.setdefault(table_name, {})[key] = copy.deepcopy(value)
+
+    def invalidate(self, table_name: str) -> None:
+        """Forget everything read from a table."""
+        self._tables.pop(table_name, None)
+
+_current_cache: ContextVar[Optional[RequestCache]] = ContextVar("request_cache", default=None)
+
+def current_cache() -> Optional[RequestCache]:
+    """Get the cache of the current request, if any."""
+    return _current_cache.get()
+
+@contextmanager
+def request_cache_scope() -> Iterator[RequestCache]:
+    """Cache data layer reads until the block exits."""
+    cache = RequestCache()
+    token = _current_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        _current_cache.reset(token)
@@ -1,42 +1,58 @@
 """
 S3 storage utilities.
+
+The client comes from ``backend.db.aws`` on first use. Its calls block, so
+they run on a small thread pool whose size matches the client's
+connection pool.
 """
-import boto3
-from typing import Optional, BinaryIO
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Optional, BinaryIO, Callable, Any
 from backend.config import settings
+from backend.db.aws import LazyProxy, get_client
+
+# S3 client, created on first use
+s3_client = LazyProxy(lambda: get_client("s3", max_pool_connections=settings.S3_MAX_WORKERS))
 
-# Initialize S3 client
-s3_client = boto3.client(
-    "s3",
-    region_name=settings.AWS_REGION,
-    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
+# Shared executor for blocking S3 calls
+_executor = ThreadPoolExecutor(
+    max_workers=settings.S3_MAX_WORKERS,
+    thread_name_prefix="s3"
 )
 
+async def _run(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking S3 call on the shared executor without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(func, *args, **kwargs))
+
 async def upload_file(file_obj: BinaryIO, object_name: str, content_type: Optional[str] = None) -> str:
     """Upload a file to S3 bucket."""
     extra_args = {}
     if content_type:
         extra_args["ContentType"] = content_type
-    
-    s3_client.upload_fileobj(
+
+    await _run(
+        s3_client.upload_fileobj,
         file_obj,
         settings.S3_BUCKET_NAME,
         object_name,
         ExtraArgs=extra_args
     )
-    
+
     return f"https://{settings.S3_BUCKET_NAME}.s3.amazonaws.com/{object_name}"
 
 async def delete_file(object_name: str) -> None:
     """Delete a file from S3 bucket."""
-    s3_client.delete_object(
+    await _run(
+        s3_client.delete_object,
         Bucket=settings.S3_BUCKET_NAME,
         Key=object_name
     )
 
 async def generate_presigned_url(object_name: str, expiration: int = 3600) -> str:
     """Generate a presigned URL for an S3 object."""
+    # Signing is local, no need for the executor
     return s3_client.generate_presigned_url(
         "get_object",
         Params={
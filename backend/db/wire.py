@@ -0,0 +1,81 @@
+"""
+Fast conversion of DynamoDB wire-format items for hot reads.
+
+The boto3 resource walks every attribute of every response item through
+``TypeDeserializer`` and turns every number into ``Decimal``. The fast read
+path in ``backend.db.dynamodb`` queries with a plain low-level client instead
+and converts items here: strings, the bulk of every item, are taken as they
+are, and attributes listed in ``NUMERIC_FIELDS`` become ``int``/``float``
+straight from their wire text. Other numbers stay ``Decimal`` and other
+types come out exactly as ``TypeDeserializer`` returns them.
+"""
+from decimal import Decimal
+from boto3.dynamodb.types import Binary, TypeSerializer
+from typing import Any, Callable, Dict
+
+# Timestamps kept as epoch seconds on every table
+_TIMESTAMP_FIELDS = {"created_at": int, "updated_at": int}
+
+# Numeric attributes of each table and the Python type they are read as
+NUMERIC_FIELDS: Dict[str, Dict[str, Callable[[str], Any]]] = {
+    "Users": _TIMESTAMP_FIELDS,
+    "Medications": _TIMESTAMP_FIELDS,
+    "Reminders": _TIMESTAMP_FIELDS,
+    "MoodEntries": {**_TIMESTAMP_FIELDS, "mood_rating": int},
+    "JournalEntries": _TIMESTAMP_FIELDS,
+    "ChatHistory": {**_TIMESTAMP_FIELDS, "expires_at": int},
+    "Feedback": {**_TIMESTAMP_FIELDS, "expires_at": int},
+}
+
+_serializer = TypeSerializer()
+
+def serialize_values(values: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Convert expression attribute values or a key to wire format."""
+    return {name: _serializer.serialize(value) for name, value in values.items()}
+
+def deserialize_value(value: Dict[str, Any]) -> Any:
+    """Convert one wire-format attribute value, as ``TypeDeserializer`` does."""
+    (tag, data), = value.items()
+    if tag == "S":
+        return data
+    if tag == "N":
+        return Decimal(data)
+    if tag == "BOOL":
+        return data
+    if tag == "M":
+        return {name: deserialize_value(member) for name, member in data.items()}
+    if tag == "L":
+        return [deserialize_value(member) for member in data]
+    if tag == "NULL":
+        return None
+    if tag == "SS":
+        return set(data)
+    if tag == "NS":
+        return {Decimal(number) for number in data}
+    if tag == "B":
+        return Binary(data)
+    if tag == "BS":
+        return {Binary(member) for member in data}
+    raise TypeError(f"Unknown DynamoDB type: {tag}")
+
+def deserialize_item(item: Dict[str, Dict[str, Any]], numeric_fields: Dict[str, Callable[[str], Any]]) -> Dict[str, Any]:
+    """Convert a wire-format item, reading ``numeric_fields`` as their native types."""
+    result = {}
+    for name, value in item.items():
+        text = value.get("S")
+        if text is not None:
+            result[name] = text
+            continue
+        number = value.get("N")
+        if number is not None:
+            convert = numeric_fields.get(name)
+            result[name] = convert(number) if convert else Decimal(number)
+            continue
+        result[name] = deserialize_value(value)
+    return result
+
+def query(client: Any, numeric_fields: Dict[str, Callable[[str], Any]], **kwargs: Any) -> Dict[str, Any]:
+    """Send a low-level Query and convert its items; ``LastEvaluatedKey`` stays in wire format."""
+    response = client.query(**kwargs)
+    response["Items"] = [deserialize_item(item, numeric_fields) for item in response.get("Items", [])]
+    return response
@@ -1,3 +1,5 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -6,7 +8,36 @@ from fastapi.exceptions import RequestValidationError
 from backend.api import auth, medications, reminders, moods, journal, ai
 from backend.config import settings
 from backend.core.exceptions import AppException
+from backend.core.metrics import metrics
+from backend.core.pagination import NEXT_CURSOR_HEADER
+from backend.core.responses import FastJSONResponse
+from backend.core.security import shutdown_password_pool, start_password_pool
+from backend.core.middleware import CompressionMiddleware, RequestCacheMiddleware, RequestContextMiddleware
+from backend.db import capacity
 from backend.llm import get_llm_response, get_personalized_coping_strategies
+from backend.services import archive_service
+from backend.services.chat_buffer import chat_buffer
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Tune the bcrypt cost and start the hashing pool before the first login
+    await start_password_pool()
+
+    # Persist chat messages in the background
+    if settings.CHAT_WRITE_BEHIND:
+        chat_buffer.start()
+
+    # Archive expired chat history and feedback in the background, if enabled
+    archiver = None
+    if settings.ARCHIVE_INTERVAL_MINUTES > 0:
+        archiver = asyncio.create_task(archive_service.run_periodically(settings.ARCHIVE_INTERVAL_MINUTES))
+    yield
+    if archiver:
+        archiver.cancel()
+
+    # Write out buffered chat messages before exiting
+    await chat_buffer.close()
+    shutdown_password_pool()
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -15,6 +46,8 @@ app = FastAPI(
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -24,14 +57,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Deduplicate data layer reads within each request
+if settings.DYNAMODB_REQUEST_CACHE:
+    app.add_middleware(RequestCacheMiddleware)
+
+# Let the data layer attribute DynamoDB calls to the route being served
+app.add_middleware(RequestContextMiddleware)
+
+# Compress large JSON responses; outermost, so it sees the final headers
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
 # Exception handlers
 @app.exception_handler(AppException)
 async def app_exception_handler(request: Request, exc: AppException):
     return JSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
+        headers=exc.headers,
     )
 
 @app.exception_handler(RequestValidationError)
@@ -46,6 +92,17 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 async def health_check():
     return {"status": "healthy"}
 
+# Metrics endpoint
+if settings.METRICS_ENABLED:
+    @app.get("/api/metrics", tags=["Health"])
+    async def get_metrics():
+        return metrics.snapshot()
+
+    @app.get("/api/metrics/dynamodb", tags=["Health"])
+    async def get_dynamodb_metrics():
+        """Consumed capacity, items and latency of DynamoDB calls per route, most expensive first."""
+        return capacity.report()
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(medications.router, prefix="/api/medications", tags=["Medications"])
@@ -0,0 +1,31 @@
+"""
+Repositories for the storage backend selected by ``settings.REPOSITORY_BACKEND``.
+
+``dynamodb`` (the default) stores entities in DynamoDB through
+``backend.db.dynamodb``; ``sqlite`` stores them in the SQLite database at
+``settings.SQLITE_PATH``.
+"""
+from backend.config import settings
+from backend.repositories.base import Repositories, SessionRepository, UserOwnedRepository, UserRepository, VersionRepository
+
+def create_repositories() -> Repositories:
+    """Create the repositories of the configured backend."""
+    if settings.REPOSITORY_BACKEND == "sqlite":
+        from backend.repositories.sqlite import create_repositories as create_sqlite_repositories
+        return create_sqlite_repositories(settings.SQLITE_PATH)
+    if settings.REPOSITORY_BACKEND == "dynamodb":
+        from backend.repositories.dynamodb import create_repositories as create_dynamodb_repositories
+        return create_dynamodb_repositories()
+    raise ValueError(f"Unknown REPOSITORY_BACKEND: {settings.REPOSITORY_BACKEND}")
+
+repositories = create_repositories()
+
+user_repository = repositories.users
+mood_repository = repositories.moods
+journal_repository = repositories.journals
+reminder_repository = repositories.reminders
+medication_repository = repositories.medications
+chat_repository = repositories.chat
+feedback_repository = repositories.feedback
+session_repository = repositories.sessions
+version_repository = repositories.versions
@@ -0,0 +1,187 @@
+"""
+Repository interfaces.
+
+Services talk to storage only through these classes, so the storage backend
+(DynamoDB or SQLite) can be swapped via ``settings.REPOSITORY_BACKEND``.
+Every entity other than users is owned by a user and addressed by
+``(user_id, item_id)``; time-ordered entities are listed through their
+order field (``timestamp`` or ``scheduled_time``).
+"""
+from typing import Dict, List, Optional, Any, AsyncIterator, NamedTuple, Tuple
+
+class Collection(NamedTuple):
+    """Storage layout of a user-owned entity."""
+    table_name: str  # DynamoDB table
+    sql_table: str  # SQLite table
+    id_field: str
+    order_field: Optional[str] = None  # Sort attribute of the time-ordered index, if any
+    order_index: Optional[str] = None  # DynamoDB GSI on (user_id, order_field)
+    label: str = "Item"  # Entity name used in error messages
+
+    def not_found(self, item_id: str) -> str:
+        """Error detail for a missing item."""
+        return f"{self.label} with ID {item_id} not found"
+
+MOODS = Collection("MoodEntries", "mood_entries", "entry_id", "timestamp", "UserTimestampIndex", label="Mood entry")
+JOURNALS = Collection("JournalEntries", "journal_entries", "entry_id", "timestamp", "UserTimestampIndex", label="Journal entry")
+REMINDERS = Collection("Reminders", "reminders", "reminder_id", "scheduled_time", "UserScheduledTimeIndex", label="Reminder")
+MEDICATIONS = Collection("Medications", "medications", "medication_id", label="Medication")
+CHAT = Collection("ChatHistory", "chat_history", "message_id", "timestamp", "UserTimestampIndex", label="Chat message")
+FEEDBACK = Collection("Feedback", "feedback", "feedback_id", label="Feedback")
+
+COLLECTIONS = [MOODS, JOURNALS, REMINDERS, MEDICATIONS, CHAT, FEEDBACK]
+
+class UserOwnedRepository:
+    """Storage for one user-owned entity."""
+
+    def __init__(self, collection: Collection):
+        self.collection = collection
+
+    async def create(self, user_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create an item with a new ID and ``created_at``/``updated_at`` timestamps."""
+        raise NotImplementedError
+
+    async def create_many(self, user_id: str, items: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Create many items.
+
+        Returns ``{"created": [...], "failed": [{"item": ..., "error": ...}]}``.
+        """
+        raise NotImplementedError
+
+    async def get(self, user_id: str, item_id: str, attributes: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Get an item, or None if it does not exist."""
+        raise NotImplementedError
+
+    async def get_many(self, user_id: str, item_ids: List[str], attributes: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Get the existing items among ``item_ids`` (in no particular order)."""
+        raise NotImplementedError
+
+    async def update(self, user_id: str, item_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Set the attributes in ``data`` and bump ``updated_at``; return the updated item.
+
+        Raises NotFoundException if the item does not exist.
+        """
+        raise NotImplementedError
+
+    async def delete(self, user_id: str, item_id: str) -> Dict[str, Any]:
+        """Delete an item and return it; raises NotFoundException if it does not exist."""
+        raise NotImplementedError
+
+    async def delete_many(self, user_id: str, item_ids: List[str]) -> Dict[str, List[Any]]:
+        """Delete many items; missing items count as deleted.
+
+        Returns ``{"deleted": [item_id, ...], "failed": [{"item_id": ..., "error": ...}]}``.
+        """
+        raise NotImplementedError
+
+    async def list(
+        self,
+        user_id: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = True,
+        attributes: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """List a user's items.
+
+        Time-ordered entities are sorted by their order field and can be
+        restricted to ``start <= value <= end``; other entities are returned
+        unordered and ignore the range arguments.
+        """
+        raise NotImplementedError
+
+    async def list_page(
+        self,
+        user_id: str,
+        limit: int,
+        after: Optional[Dict[str, Any]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        newest_first: bool = True,
+        attributes: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """List one page of a user's items, in the order of ``list``.
+
+        ``after`` is the position returned with the previous page. Returns
+        the items and the position of the next page, or None after the last.
+        Positions are backend-specific and only meant to round-trip through
+        a cursor. Entities without an order field come in a fixed order.
+        """
+        raise NotImplementedError
+
+class UserRepository:
+    """Storage for user accounts."""
+
+    async def create(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a user; raises ConflictException if the email is already registered."""
+        raise NotImplementedError
+
+    async def get(self, user_id: str, attributes: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Get a user by ID, or None if it does not exist."""
+        raise NotImplementedError
+
+    async def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """Get a user by email, or None if no user has it."""
+        raise NotImplementedError
+
+    def iter_ids(self) -> AsyncIterator[str]:
+        """Iterate over the IDs of all users, for background jobs."""
+        raise NotImplementedError
+
+    async def update(self, user_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Set the attributes in ``data`` and bump ``updated_at``; return the updated user."""
+        raise NotImplementedError
+
+class SessionRepository:
+    """Storage for refresh-token sessions.
+
+    A session is ``{"session_id", "user_id", "email", "secret_hash",
+    "expires_at"}``, where ``secret_hash`` is the digest of the current
+    refresh secret and ``expires_at`` is in epoch seconds. Sessions are only
+    ever looked up by ID.
+    """
+
+    async def create(self, session: Dict[str, Any]) -> None:
+        """Store a new session."""
+        raise NotImplementedError
+
+    async def rotate(self, session_id: str, secret_hash: str, new_secret_hash: str, expires_at: int) -> Optional[Dict[str, Any]]:
+        """Replace the secret of an unexpired session whose secret is ``secret_hash``.
+
+        Returns the updated session, or None if there is no such session; a
+        secret can be rotated away only once.
+        """
+        raise NotImplementedError
+
+    async def delete(self, session_id: str) -> None:
+        """Delete a session; deleting a missing session does nothing."""
+        raise NotImplementedError
+
+class VersionRepository:
+    """Per-user version counters of collections.
+
+    Services bump a collection's counter after every write to it, so the
+    counters of the collections a response is derived from identify its
+    content (see ``backend.core.etag``).
+    """
+
+    async def get(self, user_id: str, collections: List[str]) -> Dict[str, int]:
+        """Get the current versions; collections never written to are at 0."""
+        raise NotImplementedError
+
+    async def bump(self, user_id: str, collection: str) -> None:
+        """Increment the version of a collection."""
+        raise NotImplementedError
+
+class Repositories(NamedTuple):
+    """The repositories of one storage backend."""
+    users: UserRepository
+    moods: UserOwnedRepository
+    journals: UserOwnedRepository
+    reminders: UserOwnedRepository
+    medications: UserOwnedRepository
+    chat: UserOwnedRepository
+    feedback: UserOwnedRepository
+    sessions: SessionRepository
+    versions: VersionRepository
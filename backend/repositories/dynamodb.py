@@ -0,0 +1,240 @@
+"""
+DynamoDB repositories.
+
+Thin adapters over the data layer in ``backend.db.dynamodb``. User-owned
+items are keyed by ``(<id_field>, user_id)`` and time-ordered entities are
+listed through their ``(user_id, <order_field>)`` GSI.
+"""
+from typing import Dict, List, Optional, Any, AsyncIterator, Tuple
+from backend.core.utils import get_current_timestamp
+from backend.db import dynamodb
+from backend.repositories.base import (
+    Collection, Repositories, SessionRepository, UserOwnedRepository, UserRepository, VersionRepository,
+    COLLECTIONS, MOODS, JOURNALS, REMINDERS, MEDICATIONS, CHAT, FEEDBACK
+)
+
+class DynamoDBUserOwnedRepository(UserOwnedRepository):
+    """User-owned entity stored in a DynamoDB table."""
+
+    def __init__(self, collection: Collection, table):
+        super().__init__(collection)
+        self.table = table
+
+    async def create(self, user_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        return await dynamodb.create_item(
+            self.table, {**data, "user_id": user_id}, self.collection.id_field, "user_id"
+        )
+
+    async def create_many(self, user_id: str, items: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        return await dynamodb.create_items(
+            self.table, [{**data, "user_id": user_id} for data in items], self.collection.id_field, "user_id"
+        )
+
+    async def get(self, user_id: str, item_id: str, attributes: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        return await dynamodb.get_item(
+            self.table, item_id, self.collection.id_field, user_id, "user_id", attributes=attributes
+        )
+
+    async def get_many(self, user_id: str, item_ids: List[str], attributes: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        keys = [{self.collection.id_field: item_id, "user_id": user_id} for item_id in item_ids]
+        return await dynamodb.batch_get_items(self.table, keys, attributes=attributes)
+
+    async def update(self, user_id: str, item_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        return await dynamodb.update_item(
+            self.table, item_id, self.collection.id_field, data, user_id, "user_id",
+            must_exist=True, not_found_detail=self.collection.not_found(item_id)
+        )
+
+    async def delete(self, user_id: str, item_id: str) -> Dict[str, Any]:
+        return await dynamodb.delete_item(
+            self.table, item_id, self.collection.id_field, user_id, "user_id",
+            must_exist=True, not_found_detail=self.collection.not_found(item_id)
+        )
+
+    async def delete_many(self, user_id: str, item_ids: List[str]) -> Dict[str, List[Any]]:
+        id_field = self.collection.id_field
+        results = await dynamodb.batch_delete_items(
+            self.table, [{id_field: item_id, "user_id": user_id} for item_id in item_ids]
+        )
+        return {
+            "deleted": [result["key"][id_field] for result in results if result["success"]],
+            "failed": [
+                {"item_id": result["key"][id_field], "error": result["error"]}
+                for result in results if not result["success"]
+            ]
+        }
+
+    async def list(
+        self,
+        user_id: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = True,
+        attributes: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        if self.collection.order_field is None:
+            return await dynamodb.query_items(
+                self.table,
+                "user_id = :user_id",
+                {":user_id": user_id},
+                "UserIdIndex",
+                limit=limit,
+                attributes=attributes
+            )
+
+        return await dynamodb.query_user_range(
+            self.table,
+            self.collection.order_index,
+            self.collection.order_field,
+            user_id,
+            start=start,
+            end=end,
+            limit=limit,
+            newest_first=newest_first,
+            attributes=attributes
+        )
+
+    async def list_page(
+        self,
+        user_id: str,
+        limit: int,
+        after: Optional[Dict[str, Any]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        newest_first: bool = True,
+        attributes: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        # Positions are LastEvaluatedKeys of the index
+        if self.collection.order_field is None:
+            return await dynamodb.query_page(
+                self.table,
+                "user_id = :user_id",
+                {":user_id": user_id},
+                limit,
+                "UserIdIndex",
+                attributes=attributes,
+                exclusive_start_key=after
+            )
+
+        key_condition_expression, expression_attribute_values, expression_attribute_names = dynamodb.user_range_condition(
+            user_id, self.collection.order_field, start, end
+        )
+        if start and end and expression_attribute_values[":start"] > expression_attribute_values[":end"]:
+            return [], None
+
+        return await dynamodb.query_page(
+            self.table,
+            key_condition_expression,
+            expression_attribute_values,
+            limit,
+            self.collection.order_index,
+            scan_index_forward=not newest_first,
+            expression_attribute_names=expression_attribute_names or None,
+            attributes=attributes,
+            exclusive_start_key=after
+        )
+
+class DynamoDBUserRepository(UserRepository):
+    """Users stored in the DynamoDB Users table."""
+
+    async def create(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
+        return await dynamodb.create_user(user_data)
+
+    async def get(self, user_id: str, attributes: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        if attributes is None:
+            return await dynamodb.get_user_by_id(user_id)
+        return await dynamodb.get_item(dynamodb.users_table, user_id, "user_id", attributes=attributes)
+
+    async def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        return await dynamodb.get_user_by_email(email)
+
+    async def iter_ids(self) -> AsyncIterator[str]:
+        async for page in dynamodb.scan_pages(dynamodb.users_table, attributes=["user_id", "email"]):
+            for user in page:
+                # Email claim items have no email attribute
+                if "email" in user:
+                    yield user["user_id"]
+
+    async def update(self, user_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        return await dynamodb.update_user(user_id, data)
+
+class DynamoDBSessionRepository(SessionRepository):
+    """Sessions stored as ``session#<id>`` items in the Users table.
+
+    Like email claims they have no email attribute, so they stay out of
+    EmailIndex and user listings; ``expires_at`` is the table's TTL attribute.
+    """
+
+    @staticmethod
+    def _session(item: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "session_id": item["user_id"][len(dynamodb.session_key("")):],
+            "user_id": item["owner_user_id"],
+            "email": item.get("owner_email"),
+            "secret_hash": item["secret_hash"],
+            "expires_at": int(item["expires_at"])
+        }
+
+    async def create(self, session: Dict[str, Any]) -> None:
+        item = {
+            "user_id": dynamodb.session_key(session["session_id"]),
+            "owner_user_id": session["user_id"],
+            "secret_hash": session["secret_hash"],
+            "expires_at": session["expires_at"],
+            "created_at": get_current_timestamp()
+        }
+        if session.get("email"):
+            item["owner_email"] = session["email"]
+        await dynamodb.create_session(item)
+
+    async def rotate(self, session_id: str, secret_hash: str, new_secret_hash: str, expires_at: int) -> Optional[Dict[str, Any]]:
+        item = await dynamodb.rotate_session(
+            session_id, secret_hash, new_secret_hash, expires_at, get_current_timestamp()
+        )
+        return self._session(item) if item else None
+
+    async def delete(self, session_id: str) -> None:
+        await dynamodb.delete_session(session_id)
+
+class DynamoDBVersionRepository(VersionRepository):
+    """Versions stored as attributes of a ``versions#<user_id>`` item in the Users table."""
+
+    async def get(self, user_id: str, collections: List[str]) -> Dict[str, int]:
+        return await dynamodb.get_versions(user_id, collections)
+
+    async def bump(self, user_id: str, collection: str) -> None:
+        await dynamodb.bump_version(user_id, collection)
+
+def create_repositories(resource=None) -> Repositories:
+    """Create the DynamoDB repositories.
+
+    User-owned entities use the data layer's tables, or the tables of
+    ``resource`` when one is given.
+    """
+    if resource is None:
+        tables = {
+            MOODS: dynamodb.mood_entries_table,
+            JOURNALS: dynamodb.journal_entries_table,
+            REMINDERS: dynamodb.reminders_table,
+            MEDICATIONS: dynamodb.medications_table,
+            CHAT: dynamodb.chat_history_table,
+            FEEDBACK: dynamodb.feedback_table,
+        }
+    else:
+        tables = {collection: resource.Table(collection.table_name) for collection in COLLECTIONS}
+
+    def repository(collection: Collection) -> DynamoDBUserOwnedRepository:
+        return DynamoDBUserOwnedRepository(collection, tables[collection])
+
+    return Repositories(
+        users=DynamoDBUserRepository(),
+        moods=repository(MOODS),
+        journals=repository(JOURNALS),
+        reminders=repository(REMINDERS),
+        medications=repository(MEDICATIONS),
+        chat=repository(CHAT),
+        feedback=repository(FEEDBACK),
+        sessions=DynamoDBSessionRepository(),
+        versions=DynamoDBVersionRepository(),
+    )
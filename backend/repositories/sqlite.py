@@ -0,0 +1,460 @@
+"""
+SQLite repositories for single-node and on-prem deployments.
+
+Each entity is a table holding the item as a JSON document, with the
+attributes it is looked up by copied into indexed columns:
+
+- user-owned tables have the primary key ``(user_id, <id_field>)``, which
+  also serves listings of entities without an order field
+- time-ordered tables have a composite index on ``(user_id, <order_field>)``
+  so range listings are index range scans
+- ``users.email`` is unique, which also makes email claims atomic
+- refresh-token sessions are plain rows keyed by ``session_id``, and data
+  versions rows keyed by ``(user_id, collection)``
+
+sqlite3 is synchronous, so calls run on a small thread pool with one
+connection per thread. The database uses WAL mode so readers do not block
+the writer.
+"""
+import asyncio
+import json
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Dict, List, Optional, Any, AsyncIterator, Callable, Iterator, Tuple
+from backend.core.exceptions import ConflictException, NotFoundException
+from backend.core.utils import get_current_timestamp
+from backend.db.dynamodb import build_item, build_user_item
+from backend.repositories.base import (
+    Collection, Repositories, SessionRepository, UserOwnedRepository, UserRepository, VersionRepository,
+    COLLECTIONS, MOODS, JOURNALS, REMINDERS, MEDICATIONS, CHAT, FEEDBACK
+)
+
+SQLITE_MAX_WORKERS = 4
+SQLITE_BUSY_TIMEOUT = 30  # Seconds a writer waits for the write lock
+
+def _json_default(value: Any) -> Any:
+    """Encode the values JSON does not support natively."""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _dumps(item: Dict[str, Any]) -> str:
+    return json.dumps(item, default=_json_default)
+
+def _project(item: Dict[str, Any], attributes: Optional[List[str]]) -> Dict[str, Any]:
+    """Keep only ``attributes`` of an item when given."""
+    if attributes is None:
+        return item
+    return {name: item[name] for name in attributes if name in item}
+
+class SQLiteDatabase:
+    """A SQLite database file shared by the repositories."""
+
+    def __init__(self, path: str, max_workers: int = SQLITE_MAX_WORKERS):
+        self.path = path
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sqlite")
+        self._create_schema(self.connection())
+
+    def connection(self) -> sqlite3.Connection:
+        """Get the calling thread's connection."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=SQLITE_BUSY_TIMEOUT, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(connection, *args)`` on the pool without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, lambda: func(self.connection(), *args)
+        )
+
+    @staticmethod
+    @contextmanager
+    def transaction(connection: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+        """Run statements in a write transaction."""
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    @staticmethod
+    def _create_schema(connection: sqlite3.Connection) -> None:
+        statements = [
+            "CREATE TABLE IF NOT EXISTS users ("
+            "user_id TEXT PRIMARY KEY, email TEXT NOT NULL UNIQUE, data TEXT NOT NULL)",
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "session_id TEXT PRIMARY KEY, user_id TEXT NOT NULL, email TEXT, "
+            "secret_hash TEXT NOT NULL, expires_at INTEGER NOT NULL)",
+            "CREATE INDEX IF NOT EXISTS sessions_expires_at ON sessions (expires_at)",
+            "CREATE TABLE IF NOT EXISTS versions ("
+            "user_id TEXT NOT NULL, collection TEXT NOT NULL, version INTEGER NOT NULL, "
+            "PRIMARY KEY (user_id, collection))"
+        ]
+        for collection in COLLECTIONS:
+            order_column = f', "{collection.order_field}" TEXT' if collection.order_field else ""
+            statements.append(
+                f"CREATE TABLE IF NOT EXISTS {collection.sql_table} ("
+                f'user_id TEXT NOT NULL, "{collection.id_field}" TEXT NOT NULL{order_column}, '
+                f'data TEXT NOT NULL, PRIMARY KEY (user_id, "{collection.id_field}"))'
+            )
+            if collection.order_field:
+                statements.append(
+                    f"CREATE INDEX IF NOT EXISTS {collection.sql_table}_user_{collection.order_field} "
+                    f'ON {collection.sql_table} (user_id, "{collection.order_field}")'
+                )
+        for statement in statements:
+            connection.execute(statement)
+
+    def close(self) -> None:
+        """Stop the thread pool."""
+        self._executor.shutdown(wait=True)
+
+class SQLiteUserOwnedRepository(UserOwnedRepository):
+    """User-owned entity stored in a SQLite table."""
+
+    def __init__(self, collection: Collection, database: SQLiteDatabase):
+        super().__init__(collection)
+        self.database = database
+        self.table = collection.sql_table
+        self.id_column = f'"{collection.id_field}"'
+        self.order_column = f'"{collection.order_field}"' if collection.order_field else None
+
+    def _row(self, item: Dict[str, Any]) -> tuple:
+        row = (item["user_id"], item[self.collection.id_field])
+        if self.order_column:
+            row += (item.get(self.collection.order_field),)
+        return row + (_dumps(item),)
+
+    def _upsert(self, connection: sqlite3.Connection, items: List[Dict[str, Any]]) -> None:
+        columns = f"user_id, {self.id_column}" + (f", {self.order_column}" if self.order_column else "") + ", data"
+        placeholders = ", ".join("?" * (4 if self.order_column else 3))
+        connection.executemany(
+            f"INSERT OR REPLACE INTO {self.table} ({columns}) VALUES ({placeholders})",
+            [self._row(item) for item in items]
+        )
+
+    def _insert(self, connection: sqlite3.Connection, items: List[Dict[str, Any]]) -> None:
+        with self.database.transaction(connection):
+            self._upsert(connection, items)
+
+    def _select(self, connection: sqlite3.Connection, user_id: str, item_id: str) -> Optional[Dict[str, Any]]:
+        row = connection.execute(
+            f"SELECT data FROM {self.table} WHERE user_id = ? AND {self.id_column} = ?",
+            (user_id, item_id)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    async def create(self, user_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        item = json.loads(_dumps(build_item({**data, "user_id": user_id}, self.collection.id_field, "user_id")))
+        await self.database.run(self._insert, [item])
+        return item
+
+    async def create_many(self, user_id: str, items: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        created = [
+            json.loads(_dumps(build_item({**data, "user_id": user_id}, self.collection.id_field, "user_id")))
+            for data in items
+        ]
+        if created:
+            await self.database.run(self._insert, created)
+        return {"created": created, "failed": []}
+
+    async def get(self, user_id: str, item_id: str, attributes: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        item = await self.database.run(self._select, user_id, item_id)
+        return _project(item, attributes) if item else None
+
+    async def get_many(self, user_id: str, item_ids: List[str], attributes: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        item_ids = list(dict.fromkeys(item_ids))
+        if not item_ids:
+            return []
+
+        def select(connection: sqlite3.Connection) -> List[Dict[str, Any]]:
+            placeholders = ", ".join("?" * len(item_ids))
+            rows = connection.execute(
+                f"SELECT data FROM {self.table} WHERE user_id = ? AND {self.id_column} IN ({placeholders})",
+                (user_id, *item_ids)
+            ).fetchall()
+            return [json.loads(row[0]) for row in rows]
+
+        return [_project(item, attributes) for item in await self.database.run(select)]
+
+    async def update(self, user_id: str, item_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        def update(connection: sqlite3.Connection) -> Dict[str, Any]:
+            with self.database.transaction(connection):
+                item = self._select(connection, user_id, item_id)
+                if item is None:
+                    raise NotFoundException(self.collection.not_found(item_id))
+                for key, value in data.items():
+                    if key not in [self.collection.id_field, "user_id", "created_at"]:
+                        item[key] = value
+                item["updated_at"] = get_current_timestamp()
+                item = json.loads(_dumps(item))
+                self._upsert(connection, [item])
+            return item
+
+        return await self.database.run(update)
+
+    async def delete(self, user_id: str, item_id: str) -> Dict[str, Any]:
+        def delete(connection: sqlite3.Connection) -> Dict[str, Any]:
+            with self.database.transaction(connection):
+                item = self._select(connection, user_id, item_id)
+                if item is None:
+                    raise NotFoundException(self.collection.not_found(item_id))
+                connection.execute(
+                    f"DELETE FROM {self.table} WHERE user_id = ? AND {self.id_column} = ?",
+                    (user_id, item_id)
+                )
+            return item
+
+        return await self.database.run(delete)
+
+    async def delete_many(self, user_id: str, item_ids: List[str]) -> Dict[str, List[Any]]:
+        item_ids = list(dict.fromkeys(item_ids))
+
+        def delete(connection: sqlite3.Connection) -> None:
+            with self.database.transaction(connection):
+                connection.executemany(
+                    f"DELETE FROM {self.table} WHERE user_id = ? AND {self.id_column} = ?",
+                    [(user_id, item_id) for item_id in item_ids]
+                )
+
+        if item_ids:
+            await self.database.run(delete)
+        return {"deleted": item_ids, "failed": []}
+
+    async def list(
+        self,
+        user_id: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = True,
+        attributes: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        query, params = self._select_range(user_id, start, end)
+        if self.order_column:
+            query += f" ORDER BY {self.order_column} {'DESC' if newest_first else 'ASC'}"
+
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        def select(connection: sqlite3.Connection) -> List[Dict[str, Any]]:
+            return [json.loads(row[0]) for row in connection.execute(query, params)]
+
+        return [_project(item, attributes) for item in await self.database.run(select)]
+
+    async def list_page(
+        self,
+        user_id: str,
+        limit: int,
+        after: Optional[Dict[str, Any]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        newest_first: bool = True,
+        attributes: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        # Positions are the (order field, ID) of the last item; the ID breaks ties
+        query, params = self._select_range(user_id, start, end)
+        if self.order_column:
+            direction, comparison = ("DESC", "<") if newest_first else ("ASC", ">")
+            if after:
+                query += f" AND ({self.order_column}, {self.id_column}) {comparison} (?, ?)"
+                params += [after["order"], after["id"]]
+            query += f" ORDER BY {self.order_column} {direction}, {self.id_column} {direction}"
+        else:
+            if after:
+                query += f" AND {self.id_column} > ?"
+                params.append(after["id"])
+            query += f" ORDER BY {self.id_column}"
+
+        # One more row than asked tells whether a next page exists
+        query += " LIMIT ?"
+        params.append(limit + 1)
+
+        def select(connection: sqlite3.Connection) -> List[Dict[str, Any]]:
+            return [json.loads(row[0]) for row in connection.execute(query, params)]
+
+        items = await self.database.run(select)
+        position = None
+        if len(items) > limit:
+            items = items[:limit]
+            position = {"id": items[-1][self.collection.id_field]}
+            if self.order_column:
+                position["order"] = items[-1][self.collection.order_field]
+        return [_project(item, attributes) for item in items], position
+
+    def _select_range(self, user_id: str, start: Optional[str], end: Optional[str]) -> Tuple[str, List[Any]]:
+        """Query selecting a user's listed items, restricted to ``start``/``end`` for time-ordered entities."""
+        query = f"SELECT data FROM {self.table} WHERE user_id = ?"
+        params: List[Any] = [user_id]
+
+        if self.order_column:
+            # Like the sparse DynamoDB index, items without the order field are not listed
+            query += f" AND {self.order_column} IS NOT NULL"
+            if start:
+                query += f" AND {self.order_column} >= ?"
+                params.append(start)
+            if end:
+                query += f" AND {self.order_column} <= ?"
+                params.append(end)
+        return query, params
+
+class SQLiteUserRepository(UserRepository):
+    """Users stored in the SQLite users table."""
+
+    def __init__(self, database: SQLiteDatabase):
+        self.database = database
+
+    @staticmethod
+    def _select(connection: sqlite3.Connection, column: str, value: str) -> Optional[Dict[str, Any]]:
+        row = connection.execute(f"SELECT data FROM users WHERE {column} = ?", (value,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    async def create(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
+        user_item = json.loads(_dumps(build_user_item(user_data)))
+
+        def insert(connection: sqlite3.Connection) -> None:
+            try:
+                connection.execute(
+                    "INSERT INTO users (user_id, email, data) VALUES (?, ?, ?)",
+                    (user_item["user_id"], user_item["email"], _dumps(user_item))
+                )
+            except sqlite3.IntegrityError:
+                raise ConflictException("User with this email already exists")
+
+        await self.database.run(insert)
+        return user_item
+
+    async def get(self, user_id: str, attributes: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        user = await self.database.run(self._select, "user_id", user_id)
+        return _project(user, attributes) if user else None
+
+    async def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        return await self.database.run(self._select, "email", email)
+
+    async def iter_ids(self) -> AsyncIterator[str]:
+        def select(connection: sqlite3.Connection) -> List[str]:
+            return [row[0] for row in connection.execute("SELECT user_id FROM users ORDER BY user_id")]
+
+        for user_id in await self.database.run(select):
+            yield user_id
+
+    async def update(self, user_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        def update(connection: sqlite3.Connection) -> Dict[str, Any]:
+            with self.database.transaction(connection):
+                user = self._select(connection, "user_id", user_id) or {"user_id": user_id}
+                for key, value in data.items():
+                    if key not in ["user_id", "email", "created_at"]:
+                        user[key] = value
+                user["updated_at"] = get_current_timestamp()
+                user = json.loads(_dumps(user))
+                connection.execute(
+                    "UPDATE users SET data = ? WHERE user_id = ?", (_dumps(user), user_id)
+                )
+            return user
+
+        return await self.database.run(update)
+
+class SQLiteSessionRepository(SessionRepository):
+    """Sessions stored in the SQLite sessions table.
+
+    SQLite has no TTL, so expired sessions are purged whenever one is created.
+    """
+
+    COLUMNS = ("session_id", "user_id", "email", "secret_hash", "expires_at")
+
+    def __init__(self, database: SQLiteDatabase):
+        self.database = database
+
+    async def create(self, session: Dict[str, Any]) -> None:
+        def insert(connection: sqlite3.Connection) -> None:
+            with self.database.transaction(connection):
+                connection.execute("DELETE FROM sessions WHERE expires_at <= ?", (get_current_timestamp(),))
+                connection.execute(
+                    f"INSERT INTO sessions ({', '.join(self.COLUMNS)}) VALUES (?, ?, ?, ?, ?)",
+                    tuple(session.get(column) for column in self.COLUMNS)
+                )
+
+        await self.database.run(insert)
+
+    async def rotate(self, session_id: str, secret_hash: str, new_secret_hash: str, expires_at: int) -> Optional[Dict[str, Any]]:
+        def update(connection: sqlite3.Connection) -> Optional[Dict[str, Any]]:
+            with self.database.transaction(connection):
+                updated = connection.execute(
+                    "UPDATE sessions SET secret_hash = ?, expires_at = ? "
+                    "WHERE session_id = ? AND secret_hash = ? AND expires_at > ?",
+                    (new_secret_hash, expires_at, session_id, secret_hash, get_current_timestamp())
+                ).rowcount
+                if not updated:
+                    return None
+                row = connection.execute(
+                    f"SELECT {', '.join(self.COLUMNS)} FROM sessions WHERE session_id = ?", (session_id,)
+                ).fetchone()
+            return dict(zip(self.COLUMNS, row))
+
+        return await self.database.run(update)
+
+    async def delete(self, session_id: str) -> None:
+        def delete(connection: sqlite3.Connection) -> None:
+            connection.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+        await self.database.run(delete)
+
+class SQLiteVersionRepository(VersionRepository):
+    """Versions stored in the SQLite versions table."""
+
+    def __init__(self, database: SQLiteDatabase):
+        self.database = database
+
+    async def get(self, user_id: str, collections: List[str]) -> Dict[str, int]:
+        def select(connection: sqlite3.Connection) -> Dict[str, int]:
+            placeholders = ", ".join("?" * len(collections))
+            return dict(connection.execute(
+                f"SELECT collection, version FROM versions WHERE user_id = ? AND collection IN ({placeholders})",
+                (user_id, *collections)
+            ).fetchall())
+
+        versions = await self.database.run(select)
+        return {collection: versions.get(collection, 0) for collection in collections}
+
+    async def bump(self, user_id: str, collection: str) -> None:
+        def bump(connection: sqlite3.Connection) -> None:
+            connection.execute(
+                "INSERT INTO versions (user_id, collection, version) VALUES (?, ?, 1) "
+                "ON CONFLICT (user_id, collection) DO UPDATE SET version = version + 1",
+                (user_id, collection)
+            )
+
+        await self.database.run(bump)
+
+def create_repositories(path: str) -> Repositories:
+    """Create the SQLite repositories over the database at ``path``."""
+    database = SQLiteDatabase(path)
+
+    def repository(collection: Collection) -> SQLiteUserOwnedRepository:
+        return SQLiteUserOwnedRepository(collection, database)
+
+    return Repositories(
+        users=SQLiteUserRepository(database),
+        moods=repository(MOODS),
+        journals=repository(JOURNALS),
+        reminders=repository(REMINDERS),
+        medications=repository(MEDICATIONS),
+        chat=repository(CHAT),
+        feedback=repository(FEEDBACK),
+        sessions=SQLiteSessionRepository(database),
+        versions=SQLiteVersionRepository(database),
+    )
@@ -32,8 +32,13 @@ class PasswordChange(BaseModel):
 class Token(BaseModel):
     """Token schema."""
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: str = "bearer"
 
+class RefreshRequest(BaseModel):
+    """Refresh token schema."""
+    refresh_token: str
+
 class TokenData(BaseModel):
     """Token data schema."""
     sub: str
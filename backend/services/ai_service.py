@@ -1,12 +1,13 @@
 """
 AI service for mental health support.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
-from backend.db.dynamodb import feedback_table, chat_history_table, create_item, get_item, update_item, delete_item, query_items
-from backend.db.dynamodb import chat_history_table, create_item, get_item, update_item, delete_item, query_items
+from backend.repositories import chat_repository, feedback_repository, user_repository
 from backend.core.exceptions import NotFoundException
 from backend.core.utils import generate_uuid, get_current_timestamp
+from backend.services.archive_service import expires_at
+from backend.services.chat_buffer import chat_buffer
 from backend.config import settings
 from backend.rag import get_rag_response
 from backend.services import nlp_service
@@ -28,25 +29,39 @@ async def create_chat_message(user_id: str, message: str, is_user: bool = True)
         "is_user": is_user,
         "timestamp": datetime.utcnow().isoformat()
     }
+    ttl = expires_at(chat_repository)
+    if ttl:
+        message_data["expires_at"] = ttl
 
-    chat_message = await create_item(chat_history_table, message_data, "message_id", "user_id")
+    # Persisted in the background; get_chat_history sees it right away
+    chat_message = await chat_buffer.add(user_id, message_data)
     return chat_message
 
 async def get_chat_history(user_id: str, limit: int = 20) -> List[Dict[str, Any]]:
     """Get chat history for a user."""
-    # Get all chat messages for the user
-    chat_messages = await query_items(
-        chat_history_table,
-        "user_id = :user_id",
-        {":user_id": user_id},
-        "UserIdIndex"
-    )
-
-    # Sort by timestamp (oldest first)
-    chat_messages.sort(key=lambda x: x["timestamp"])
-
-    # Apply limit (get the most recent messages)
-    return chat_messages[-limit:]
+    # Read only the most recent messages, newest first
+    chat_messages = await chat_repository.list(user_id, limit=limit)
+    chat_messages = chat_buffer.merge(user_id, chat_messages, limit)
+
+    # Return them oldest first
+    chat_messages.reverse()
+    return chat_messages
+
+async def get_chat_history_page(user_id: str, limit: int = 20, after: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """Get one page of chat history, oldest first, and the position of the page before it.
+
+    Pages go back in time. The first page also holds the messages still in
+    the write-behind buffer, which are the newest; they are read in place of
+    stored messages, so the page exceeds ``limit`` only when more than
+    ``limit`` messages are buffered.
+    """
+    buffered = chat_buffer.buffered(user_id) if after is None else []
+    chat_messages, position = await chat_repository.list_page(user_id, max(limit - len(buffered), 1), after)
+    if buffered:
+        chat_messages = chat_buffer.merge(user_id, chat_messages)
+
+    chat_messages.reverse()
+    return chat_messages, position
 
 async def get_user_context(user_id: str) -> Dict[str, Any]:
     """Get context about the user for personalized responses."""
@@ -54,8 +69,7 @@ async def get_user_context(user_id: str) -> Dict[str, Any]:
 
     # Get user data
     try:
-        from backend.db.dynamodb import get_user_by_id
-        user = await get_user_by_id(user_id)
+        user = await user_repository.get(user_id)
         if user:
             context["user_preferences"] = user.get("preferences", {})
     except Exception as e:
@@ -311,15 +325,17 @@ async def generate_weekly_report(user_id: str) -> str:
         user_id,
         limit=100,
         start_date=start_date.isoformat(),
-        end_date=end_date.isoformat()
+        end_date=end_date.isoformat(),
+        attributes=["mood_rating"]
     )
 
-    # Get journal entries for the past week
+    # Get journal entries for the past week (only counted)
     journal_entries = await journal_service.list_journal_entries(
         user_id,
         limit=100,
         start_date=start_date.isoformat(),
-        end_date=end_date.isoformat()
+        end_date=end_date.isoformat(),
+        attributes=["entry_id"]
     )
 
     # Get medication adherence for the past week
@@ -360,8 +376,19 @@ Format the report with clear sections and bullet points where appropriate."""
 
 async def generate_ai_suggestions(user_id: str) -> Dict[str, Any]:
     """Generate AI suggestions based on user context."""
-    # Get user context
-    user_context = await get_user_context(user_id)
+    # Read only the context the suggestions use: the latest mood rating and medication names
+    user_context = {}
+    try:
+        user_context["recent_moods"] = await mood_service.list_mood_entries(user_id, limit=1, attributes=["mood_rating"])
+    except Exception:
+        # Continue even if mood data is not available
+        pass
+
+    try:
+        user_context["medications"] = await medication_service.list_medications(user_id, attributes=["name"])
+    except Exception:
+        # Continue even if medication data is not available
+        pass
 
     # Create suggestions based on context
     suggestions = {}
@@ -410,10 +437,13 @@ async def get_visualization_data(user_id: str, data_type: str) -> List[Dict[str,
 
 async def submit_feedback(user_id: str, feedback: str) -> None:
     """Submit feedback on AI suggestions."""
-    # Store feedback in DynamoDB
+    # Store feedback
     feedback_data = {
         "user_id": user_id,
         "feedback": feedback,
         "timestamp": datetime.utcnow().isoformat()
     }
-    await create_item(feedback_table, feedback_data, "feedback_id", "user_id")
+    ttl = expires_at(feedback_repository)
+    if ttl:
+        feedback_data["expires_at"] = ttl
+    await feedback_repository.create(user_id, feedback_data)
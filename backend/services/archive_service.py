@@ -0,0 +1,181 @@
+"""
+Retention and archival of chat history and feedback.
+
+New chat messages and feedback get an ``expires_at`` attribute (epoch
+seconds), which is the TTL attribute of their DynamoDB tables. It lies
+``RETENTION_TTL_GRACE_DAYS`` after the retention period, so DynamoDB only
+expires what the archival job has missed.
+
+The archival job walks every user, reads their items older than the
+retention period and streams them as gzipped JSON lines into
+date-partitioned S3 objects::
+
+    <ARCHIVE_PREFIX>/<table>/date=<YYYY-MM-DD>/<run id>-<part>.jsonl.gz
+
+Items are deleted from the hot table only after the objects holding them
+have been uploaded, so a failed run loses nothing; it may archive some
+items twice.
+"""
+import asyncio
+import gzip
+import json
+import logging
+import tempfile
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Any
+from backend.config import settings
+from backend.core.utils import generate_uuid, get_current_timestamp
+from backend.db.s3 import upload_file
+from backend.repositories import repositories
+from backend.repositories.base import CHAT, FEEDBACK, Repositories, UserOwnedRepository, UserRepository
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 24 * 60 * 60
+SPOOL_MAX_BYTES = 8 * 1024 * 1024  # Archive parts larger than this are buffered on disk
+
+_RETENTION_SETTINGS = {
+    CHAT.table_name: "CHAT_HISTORY_RETENTION_DAYS",
+    FEEDBACK.table_name: "FEEDBACK_RETENTION_DAYS",
+}
+
+def retention_days(repository: UserOwnedRepository) -> int:
+    """Retention period of a repository's items; 0 keeps them forever."""
+    setting = _RETENTION_SETTINGS.get(repository.collection.table_name)
+    return getattr(settings, setting) if setting else 0
+
+def expires_at(repository: UserOwnedRepository) -> Optional[int]:
+    """TTL value for a new item of ``repository``, or None if it is kept forever."""
+    days = retention_days(repository)
+    if days <= 0:
+        return None
+    return get_current_timestamp() + (days + settings.RETENTION_TTL_GRACE_DAYS) * SECONDS_PER_DAY
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _item_date(item: Dict[str, Any]) -> str:
+    """Partition date of an item: the day of its timestamp, or of its creation."""
+    if item.get("timestamp"):
+        return str(item["timestamp"])[:10]
+    return datetime.utcfromtimestamp(int(item.get("created_at", 0))).date().isoformat()
+
+class _Partition:
+    """A gzipped JSON lines archive object being written."""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.count = 0
+        self._file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+        self._gzip = gzip.GzipFile(fileobj=self._file, mode="wb")
+
+    def write(self, item: Dict[str, Any]) -> None:
+        self._gzip.write(json.dumps(item, default=_json_default).encode() + b"\n")
+        self.count += 1
+
+    async def upload(self) -> None:
+        self._gzip.close()
+        self._file.seek(0)
+        try:
+            await upload_file(self._file, self.key, "application/gzip")
+        finally:
+            self._file.close()
+
+class Archiver:
+    """Moves expired items of one repository to S3."""
+
+    def __init__(self, repository: UserOwnedRepository, days: int, now: Optional[datetime] = None):
+        self.repository = repository
+        self.cutoff = (now or datetime.utcnow()) - timedelta(days=days)
+        self.run_id = f"{self.cutoff:%Y%m%dT%H%M%S}-{generate_uuid()[:8]}"
+        self.stats = {"archived": 0, "objects": 0, "failed": 0}
+        self._parts = 0
+        self._partitions: Dict[str, _Partition] = {}
+        self._pending: Dict[str, List[str]] = {}
+        self._pending_count = 0
+
+    def _is_expired(self, item: Dict[str, Any]) -> bool:
+        if item.get("timestamp"):
+            return str(item["timestamp"]) < self.cutoff.isoformat()
+        return int(item.get("created_at", 0)) < self.cutoff.timestamp()
+
+    async def _expired_items(self, user_id: str) -> List[Dict[str, Any]]:
+        if self.repository.collection.order_field:
+            # Time-ordered entities are read as an index range
+            return await self.repository.list(user_id, end=self.cutoff.isoformat(), newest_first=False)
+        return [item for item in await self.repository.list(user_id) if self._is_expired(item)]
+
+    async def archive_user(self, user_id: str) -> None:
+        """Buffer a user's expired items, flushing when enough are pending."""
+        id_field = self.repository.collection.id_field
+        for item in await self._expired_items(user_id):
+            date = _item_date(item)
+            partition = self._partitions.get(date)
+            if partition is None:
+                self._parts += 1
+                key = (
+                    f"{settings.ARCHIVE_PREFIX}/{self.repository.collection.sql_table}/"
+                    f"date={date}/{self.run_id}-{self._parts:05d}.jsonl.gz"
+                )
+                partition = self._partitions[date] = _Partition(key)
+            partition.write(item)
+            self._pending.setdefault(user_id, []).append(item[id_field])
+            self._pending_count += 1
+
+        if self._pending_count >= settings.ARCHIVE_FLUSH_ITEMS:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Upload the buffered objects, then delete the items they hold."""
+        partitions, self._partitions = self._partitions, {}
+        pending, self._pending = self._pending, {}
+        self._pending_count = 0
+
+        await asyncio.gather(*(partition.upload() for partition in partitions.values()))
+        self.stats["objects"] += len(partitions)
+
+        for user_id, item_ids in pending.items():
+            result = await self.repository.delete_many(user_id, item_ids)
+            self.stats["archived"] += len(result["deleted"])
+            self.stats["failed"] += len(result["failed"])
+
+async def archive_expired(
+    repository: UserOwnedRepository,
+    users: UserRepository,
+    now: Optional[datetime] = None
+) -> Dict[str, int]:
+    """Archive and delete the expired items of one repository."""
+    days = retention_days(repository)
+    if days <= 0:
+        return {"archived": 0, "objects": 0, "failed": 0}
+
+    archiver = Archiver(repository, days, now)
+    async for user_id in users.iter_ids():
+        await archiver.archive_user(user_id)
+    await archiver.flush()
+    return archiver.stats
+
+async def archive_all(
+    store: Optional[Repositories] = None,
+    now: Optional[datetime] = None
+) -> Dict[str, Dict[str, int]]:
+    """Archive expired chat history and feedback of ``store`` (the configured repositories by default)."""
+    store = store or repositories
+    return {
+        "chat_history": await archive_expired(store.chat, store.users, now),
+        "feedback": await archive_expired(store.feedback, store.users, now),
+    }
+
+async def run_periodically(interval_minutes: int) -> None:
+    """Run ``archive_all`` every ``interval_minutes`` until cancelled."""
+    while True:
+        try:
+            logger.info("Archived expired items: %s", await archive_all())
+        except Exception:
+            logger.exception("Archival run failed")
+        await asyncio.sleep(interval_minutes * 60)
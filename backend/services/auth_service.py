@@ -1,56 +1,141 @@
 """
 Authentication service.
 """
+import hashlib
+import logging
+import secrets
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
-from backend.core.security import verify_password, get_password_hash, create_access_token
-from backend.core.exceptions import AuthException, NotFoundException
-from backend.db.dynamodb import create_user, get_user_by_email, get_user_by_id, update_user
+from backend.core.security import hash_password, verify_and_update_password, create_access_token
+from backend.core.exceptions import AuthException, ConflictException, NotFoundException
+from backend.core.rate_limit import login_throttle
+from backend.core.user_cache import user_cache
+from backend.core.utils import generate_uuid, get_current_timestamp
+from backend.repositories import session_repository, user_repository
 from backend.config import settings
 
+logger = logging.getLogger(__name__)
+
 async def register_user(user_data: Dict[str, Any]) -> Dict[str, Any]:
     """Register a new user."""
     # Check if user with email already exists
-    existing_user = await get_user_by_email(user_data["email"])
+    existing_user = await user_repository.get_by_email(user_data["email"])
     if existing_user:
         raise AuthException("User with this email already exists")
     
     # Hash the password
-    user_data["password_hash"] = get_password_hash(user_data.pop("password"))
+    user_data["password_hash"] = await hash_password(user_data.pop("password"))
     
-    # Create the user
-    user = await create_user(user_data)
+    # Create the user, claiming the email atomically
+    try:
+        user = await user_repository.create(user_data)
+    except ConflictException:
+        raise AuthException("User with this email already exists")
     
     # Remove password_hash from response
     user.pop("password_hash", None)
     
     return user
 
-async def authenticate_user(email: str, password: str) -> Dict[str, Any]:
-    """Authenticate a user."""
-    user = await get_user_by_email(email)
+async def authenticate_user(email: str, password: str, client_ip: Optional[str] = None) -> Dict[str, Any]:
+    """Authenticate a user.
+
+    Raises TooManyRequestsException, before any lookup or hashing, when the
+    email or ``client_ip`` has made too many attempts.
+    """
+    await login_throttle.check(email, client_ip)
+
+    user = await user_repository.get_by_email(email)
     if not user:
         raise AuthException("Invalid email or password")
     
-    if not verify_password(password, user["password_hash"]):
+    valid, new_hash = await verify_and_update_password(password, user["password_hash"])
+    if not valid:
         raise AuthException("Invalid email or password")
+
+    # Upgrade hashes made at a lower cost; a failure must not fail the login
+    if new_hash:
+        try:
+            await user_repository.update(user["user_id"], {"password_hash": new_hash})
+        except Exception:
+            logger.warning("Could not rehash the password of user %s", user["user_id"], exc_info=True)
     
     # Remove password_hash from response
     user.pop("password_hash", None)
     
     return user
 
-async def create_user_token(user_id: str) -> str:
+async def create_user_token(user_id: str, email: Optional[str] = None) -> str:
     """Create a JWT token for a user."""
     expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    data = {"sub": user_id}
+    if email:
+        # Lets get_current_user trust the token without reading the user
+        data["email"] = email
     return create_access_token(
-        data={"sub": user_id},
+        data=data,
         expires_delta=expires_delta
     )
 
+def _secret_hash(secret: str) -> str:
+    # Refresh secrets are random, so a fast digest is as good as a password hash
+    return hashlib.sha256(secret.encode()).hexdigest()
+
+def _refresh_expiry() -> int:
+    return get_current_timestamp() + settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
+
+def _parse_refresh_token(refresh_token: str) -> tuple:
+    session_id, _, secret = refresh_token.partition(".")
+    if not session_id or not secret:
+        raise AuthException("Invalid refresh token")
+    return session_id, secret
+
+async def create_refresh_token(user_id: str, email: Optional[str] = None) -> str:
+    """Start a refresh-token session for a user and return its token.
+
+    The token is ``<session ID>.<secret>``; only a digest of the secret is
+    stored.
+    """
+    session_id, secret = generate_uuid(), secrets.token_urlsafe(32)
+    await session_repository.create({
+        "session_id": session_id,
+        "user_id": user_id,
+        "email": email,
+        "secret_hash": _secret_hash(secret),
+        "expires_at": _refresh_expiry()
+    })
+    return f"{session_id}.{secret}"
+
+async def refresh_session(refresh_token: str) -> Dict[str, str]:
+    """Exchange a refresh token for a new access token and a new refresh token.
+
+    The session's secret is rotated with a single conditional write, without
+    reading the user or hashing a password. Presenting a token that was
+    already rotated away ends its session, since it may have been stolen.
+    """
+    session_id, secret = _parse_refresh_token(refresh_token)
+    new_secret = secrets.token_urlsafe(32)
+    session = await session_repository.rotate(
+        session_id, _secret_hash(secret), _secret_hash(new_secret), _refresh_expiry()
+    )
+    if session is None:
+        await session_repository.delete(session_id)
+        raise AuthException("Invalid refresh token")
+
+    return {
+        "access_token": await create_user_token(session["user_id"], session.get("email")),
+        "refresh_token": f"{session_id}.{new_secret}",
+        "token_type": "bearer"
+    }
+
+async def revoke_refresh_token(refresh_token: str) -> None:
+    """End the session of a refresh token."""
+    session_id, _ = _parse_refresh_token(refresh_token)
+    await session_repository.delete(session_id)
+
 async def get_user_profile(user_id: str) -> Dict[str, Any]:
     """Get a user's profile."""
-    user = await get_user_by_id(user_id)
+    user = await user_repository.get(user_id)
     if not user:
         raise NotFoundException("User not found")
     
@@ -61,11 +146,12 @@ async def get_user_profile(user_id: str) -> Dict[str, Any]:
 
 async def update_user_profile(user_id: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
     """Update a user's profile."""
-    user = await get_user_by_id(user_id)
+    user = await user_repository.get(user_id)
     if not user:
         raise NotFoundException("User not found")
     
-    updated_user = await update_user(user_id, update_data)
+    updated_user = await user_repository.update(user_id, update_data)
+    user_cache.invalidate(user_id)
     
     # Remove password_hash from response
     updated_user.pop("password_hash", None)
@@ -74,12 +160,14 @@ async def update_user_profile(user_id: str, update_data: Dict[str, Any]) -> Dict
 
 async def change_user_password(user_id: str, current_password: str, new_password: str) -> None:
     """Change a user's password."""
-    user = await get_user_by_id(user_id)
+    user = await user_repository.get(user_id)
     if not user:
         raise NotFoundException("User not found")
     
-    if not verify_password(current_password, user["password_hash"]):
+    valid, _ = await verify_and_update_password(current_password, user["password_hash"])
+    if not valid:
         raise AuthException("Current password is incorrect")
     
-    password_hash = get_password_hash(new_password)
-    await update_user(user_id, {"password_hash": password_hash})
+    password_hash = await hash_password(new_password)
+    await user_repository.update(user_id, {"password_hash": password_hash})
+    user_cache.invalidate(user_id)
@@ -0,0 +1,159 @@
+"""
+Write-behind buffer for chat messages.
+
+``create_chat_message`` hands new messages to ``chat_buffer``, which assigns
+their ID and timestamps at once and returns; a background task persists them
+with ``create_many`` (one BatchWriteItem per 25 messages) every
+``CHAT_WRITE_BEHIND_INTERVAL_MS``, or as soon as a full batch is waiting.
+Until a message is written, ``merge`` adds it to the history read from the
+repository, so this process always reads its own writes.
+
+Buffering is active only while the flusher runs, which the FastAPI lifespan
+starts and, on shutdown, stops after a final flush. Otherwise, and whenever
+the buffered messages would exceed ``CHAT_WRITE_BEHIND_MAX_BYTES``, messages
+are written through directly. Messages still buffered when the process dies
+are lost, so the buffer trades at most ``CHAT_WRITE_BEHIND_INTERVAL_MS`` of
+chat history for taking persistence off the request path.
+"""
+import asyncio
+import logging
+from typing import Dict, List, Optional, Any
+from backend.config import settings
+from backend.core.metrics import metrics
+from backend.db.dynamodb import BATCH_WRITE_MAX_ITEMS, build_item
+from backend.repositories import chat_repository
+from backend.repositories.base import UserOwnedRepository
+
+logger = logging.getLogger(__name__)
+
+# Estimated memory of a buffered item besides its message text
+ITEM_OVERHEAD_BYTES = 512
+
+buffered_writes = metrics.counter("chat_buffer_writes", "Chat messages persisted by the write-behind buffer")
+written_through = metrics.counter("chat_buffer_written_through", "Chat messages written directly, bypassing the buffer")
+failed_writes = metrics.counter("chat_buffer_failed_writes", "Buffered chat message writes that failed and were retried")
+
+def _item_bytes(item: Dict[str, Any]) -> int:
+    return len(str(item.get("message", "")).encode()) + ITEM_OVERHEAD_BYTES
+
+class WriteBehindBuffer:
+    """Buffers new items of a repository and writes them in batches."""
+
+    def __init__(self, repository: UserOwnedRepository, max_bytes: int, interval: float):
+        self.repository = repository
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self._pending: Dict[str, List[Dict[str, Any]]] = {}
+        self._writing: Dict[str, List[Dict[str, Any]]] = {}
+        self._pending_count = 0
+        self._bytes = 0
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start buffering, with a flusher task on the running event loop."""
+        if self.running:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop the flusher and write out everything still buffered."""
+        if self._task is None:
+            return
+        # Let a flush in progress finish rather than cancelling it halfway
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+        await self.flush()
+        if self._pending_count:
+            logger.error("%d chat messages could not be written on shutdown", self._pending_count)
+
+    async def add(self, user_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create an item; it is returned at once and written in the background."""
+        item = build_item({**data, "user_id": user_id}, self.repository.collection.id_field, "user_id")
+        size = _item_bytes(item)
+        if not self.running or self._bytes + size > self.max_bytes:
+            written_through.inc()
+            return await self.repository.create(user_id, item)
+
+        self._pending.setdefault(user_id, []).append(item)
+        self._pending_count += 1
+        self._bytes += size
+        if self._pending_count >= BATCH_WRITE_MAX_ITEMS:
+            self._wakeup.set()
+        return item
+
+    def buffered(self, user_id: str) -> List[Dict[str, Any]]:
+        """Items of a user that are not written yet, oldest first."""
+        return self._writing.get(user_id, []) + self._pending.get(user_id, [])
+
+    def merge(self, user_id: str, items: List[Dict[str, Any]], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Add a user's unwritten items to ``items`` read newest first, keeping at most ``limit``."""
+        buffered = self.buffered(user_id)
+        if not buffered:
+            return items
+
+        id_field = self.repository.collection.id_field
+        order_field = self.repository.collection.order_field
+        merged = {item[id_field]: item for item in items}
+        merged.update((item[id_field], item) for item in buffered)
+        newest_first = sorted(merged.values(), key=lambda item: item[order_field], reverse=True)
+        return newest_first[:limit] if limit is not None else newest_first
+
+    async def flush(self) -> None:
+        """Write all buffered items; failed ones stay buffered for the next flush."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            self._writing, self._pending = self._pending, {}
+            self._pending_count = 0
+
+            results = await asyncio.gather(
+                *(self.repository.create_many(user_id, items) for user_id, items in self._writing.items()),
+                return_exceptions=True
+            )
+
+            for (user_id, items), result in zip(self._writing.items(), results):
+                if isinstance(result, Exception):
+                    logger.warning("Writing %d buffered chat messages failed: %s", len(items), result)
+                    failed = items
+                else:
+                    failed = [failure["item"] for failure in result["failed"]]
+                written = len(items) - len(failed)
+                buffered_writes.inc(written)
+                self._bytes -= sum(_item_bytes(item) for item in items)
+                if failed:
+                    failed_writes.inc(len(failed))
+                    # Retry before anything buffered since
+                    self._pending[user_id] = failed + self._pending.get(user_id, [])
+                    self._pending_count += len(failed)
+                    self._bytes += sum(_item_bytes(item) for item in failed)
+            self._writing = {}
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Flushing buffered chat messages failed")
+
+chat_buffer = WriteBehindBuffer(
+    chat_repository,
+    max_bytes=settings.CHAT_WRITE_BEHIND_MAX_BYTES,
+    interval=settings.CHAT_WRITE_BEHIND_INTERVAL_MS / 1000
+)
@@ -1,89 +1,80 @@
 """
 Journal service.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
-from backend.db.dynamodb import journal_entries_table, create_item, get_item, update_item, delete_item, query_items
+from backend.repositories import journal_repository, version_repository
 from backend.core.exceptions import NotFoundException
-from backend.core.utils import generate_uuid, get_current_timestamp
+from backend.core.utils import generate_uuid, get_current_timestamp, normalize_timestamp
+from backend.schemas.journal import JournalResponse
 
-async def create_journal_entry(user_id: str, journal_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Create a new journal entry."""
+# Attributes returned by search results
+JOURNAL_RESPONSE_ATTRIBUTES = list(JournalResponse.model_fields)
+
+def _prepare_journal_data(user_id: str, journal_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Set the owner and a normalized timestamp on new journal entry data."""
     # Set timestamp to current time if not provided
     if not journal_data.get("timestamp"):
         journal_data["timestamp"] = datetime.utcnow().isoformat()
+    else:
+        journal_data["timestamp"] = normalize_timestamp(journal_data["timestamp"])
     
     journal_data["user_id"] = user_id
-    journal_entry = await create_item(journal_entries_table, journal_data, "entry_id", "user_id")
+    return journal_data
+
+async def create_journal_entry(user_id: str, journal_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Create a new journal entry."""
+    journal_entry = await journal_repository.create(user_id, _prepare_journal_data(user_id, journal_data))
+    await version_repository.bump(user_id, "journals")
     return journal_entry
 
+async def create_journal_entries(user_id: str, entries: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Create many journal entries with batched writes."""
+    result = await journal_repository.create_many(
+        user_id,
+        [_prepare_journal_data(user_id, journal_data) for journal_data in entries]
+    )
+    if result["created"]:
+        await version_repository.bump(user_id, "journals")
+    return result
+
 async def get_journal_entry(entry_id: str, user_id: str) -> Dict[str, Any]:
     """Get a journal entry by ID."""
-    journal_entry = await get_item(journal_entries_table, entry_id, "entry_id", user_id, "user_id")
+    journal_entry = await journal_repository.get(user_id, entry_id)
     if not journal_entry:
         raise NotFoundException(f"Journal entry with ID {entry_id} not found")
     return journal_entry
 
 async def update_journal_entry(entry_id: str, user_id: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
     """Update a journal entry."""
-    # Check if journal entry exists
-    journal_entry = await get_item(journal_entries_table, entry_id, "entry_id", user_id, "user_id")
-    if not journal_entry:
-        raise NotFoundException(f"Journal entry with ID {entry_id} not found")
-    
-    updated_journal_entry = await update_item(
-        journal_entries_table,
-        entry_id,
-        "entry_id",
-        update_data,
-        user_id,
-        "user_id"
-    )
+    updated_journal_entry = await journal_repository.update(user_id, entry_id, update_data)
+    await version_repository.bump(user_id, "journals")
     
     return updated_journal_entry
 
 async def delete_journal_entry(entry_id: str, user_id: str) -> None:
     """Delete a journal entry."""
-    # Check if journal entry exists
-    journal_entry = await get_item(journal_entries_table, entry_id, "entry_id", user_id, "user_id")
-    if not journal_entry:
-        raise NotFoundException(f"Journal entry with ID {entry_id} not found")
-    
-    await delete_item(journal_entries_table, entry_id, "entry_id", user_id, "user_id")
+    await journal_repository.delete(user_id, entry_id)
+    await version_repository.bump(user_id, "journals")
 
-async def list_journal_entries(user_id: str, limit: int = 100, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict[str, Any]]:
-    """List journal entries for a user."""
-    # Get all journal entries for the user
-    journal_entries = await query_items(
-        journal_entries_table,
-        "user_id = :user_id",
-        {":user_id": user_id},
-        "UserIdIndex"
+async def list_journal_entries(user_id: str, limit: int = 100, start_date: Optional[str] = None, end_date: Optional[str] = None, attributes: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """List journal entries for a user, newest first, optionally reading only ``attributes``."""
+    return await journal_repository.list(
+        user_id,
+        start=start_date,
+        end=end_date,
+        limit=limit,
+        attributes=attributes
     )
-    
-    # Filter by date range if provided
-    if start_date or end_date:
-        filtered_entries = []
-        start_dt = datetime.fromisoformat(start_date.replace("Z", "+00:00")) if start_date else None
-        end_dt = datetime.fromisoformat(end_date.replace("Z", "+00:00")) if end_date else None
-        
-        for entry in journal_entries:
-            entry_dt = datetime.fromisoformat(entry["timestamp"].replace("Z", "+00:00"))
-            if (not start_dt or entry_dt >= start_dt) and (not end_dt or entry_dt <= end_dt):
-                filtered_entries.append(entry)
-        
-        journal_entries = filtered_entries
-    
-    # Sort by timestamp (newest first)
-    journal_entries.sort(key=lambda x: x["timestamp"], reverse=True)
-    
-    # Apply limit
-    return journal_entries[:limit]
+
+async def list_journal_entries_page(user_id: str, limit: int = 100, start_date: Optional[str] = None, end_date: Optional[str] = None, after: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """List one page of a user's journal entries, newest first, and the position of the next page."""
+    return await journal_repository.list_page(user_id, limit, after, start=start_date, end=end_date)
 
 async def search_journal_entries(user_id: str, query: str, tags: Optional[List[str]] = None, limit: int = 100) -> List[Dict[str, Any]]:
     """Search journal entries by content or tags."""
-    # Get all journal entries for the user
-    journal_entries = await list_journal_entries(user_id, limit=1000)
+    # Get the user's journal entries, reading only the fields a search result returns
+    journal_entries = await list_journal_entries(user_id, limit=1000, attributes=JOURNAL_RESPONSE_ATTRIBUTES)
     
     # Filter by search query and tags
     filtered_entries = []
@@ -1,8 +1,8 @@
 """
 Medication service.
 """
-from typing import List, Dict, Any, Optional
-from backend.db.dynamodb import medications_table, create_item, get_item, update_item, delete_item, query_items
+from typing import List, Dict, Any, Optional, Tuple
+from backend.repositories import medication_repository, version_repository
 from backend.core.exceptions import NotFoundException
 from backend.db.s3 import upload_file, delete_file, generate_presigned_url
 from backend.core.utils import generate_uuid
@@ -10,41 +10,28 @@ import uuid
 
 async def create_medication(user_id: str, medication_data: Dict[str, Any]) -> Dict[str, Any]:
     """Create a new medication."""
-    medication_data["user_id"] = user_id
-    medication = await create_item(medications_table, medication_data, "medication_id", "user_id")
+    medication = await medication_repository.create(user_id, medication_data)
+    await version_repository.bump(user_id, "medications")
     return medication
 
 async def get_medication(medication_id: str, user_id: str) -> Dict[str, Any]:
     """Get a medication by ID."""
-    medication = await get_item(medications_table, medication_id, "medication_id", user_id, "user_id")
+    medication = await medication_repository.get(user_id, medication_id)
     if not medication:
         raise NotFoundException(f"Medication with ID {medication_id} not found")
     return medication
 
 async def update_medication(medication_id: str, user_id: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
     """Update a medication."""
-    # Check if medication exists
-    medication = await get_item(medications_table, medication_id, "medication_id", user_id, "user_id")
-    if not medication:
-        raise NotFoundException(f"Medication with ID {medication_id} not found")
-    
-    updated_medication = await update_item(
-        medications_table,
-        medication_id,
-        "medication_id",
-        update_data,
-        user_id,
-        "user_id"
-    )
+    updated_medication = await medication_repository.update(user_id, medication_id, update_data)
+    await version_repository.bump(user_id, "medications")
     
     return updated_medication
 
 async def delete_medication(medication_id: str, user_id: str) -> None:
     """Delete a medication."""
-    # Check if medication exists
-    medication = await get_item(medications_table, medication_id, "medication_id", user_id, "user_id")
-    if not medication:
-        raise NotFoundException(f"Medication with ID {medication_id} not found")
+    medication = await medication_repository.delete(user_id, medication_id)
+    await version_repository.bump(user_id, "medications")
     
     # Delete medication image if exists
     if medication.get("image_url"):
@@ -55,19 +42,16 @@ async def delete_medication(medication_id: str, user_id: str) -> None:
         except Exception:
             # Continue even if image deletion fails
             pass
-    
-    await delete_item(medications_table, medication_id, "medication_id", user_id, "user_id")
 
-async def list_medications(user_id: str) -> List[Dict[str, Any]]:
-    """List all medications for a user."""
-    medications = await query_items(
-        medications_table,
-        "user_id = :user_id",
-        {":user_id": user_id},
-        "UserIdIndex"
-    )
+async def list_medications(user_id: str, attributes: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """List all medications for a user, optionally reading only ``attributes``."""
+    medications = await medication_repository.list(user_id, attributes=attributes)
     return medications
 
+async def list_medications_page(user_id: str, limit: int, after: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """List one page of a user's medications and the position of the next page."""
+    return await medication_repository.list_page(user_id, limit, after)
+
 async def search_medications(user_id: str, query: str) -> List[Dict[str, Any]]:
     """Search medications for a user."""
     # Get all medications for the user
@@ -89,7 +73,7 @@ async def search_medications(user_id: str, query: str) -> List[Dict[str, Any]]:
 async def upload_medication_image(user_id: str, medication_id: str, file_obj, filename: str) -> str:
     """Upload an image for a medication."""
     # Check if medication exists
-    medication = await get_item(medications_table, medication_id, "medication_id", user_id, "user_id")
+    medication = await medication_repository.get(user_id, medication_id)
     if not medication:
         raise NotFoundException(f"Medication with ID {medication_id} not found")
     
@@ -1,97 +1,85 @@
 """
 Mood tracking service.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
-from backend.db.dynamodb import mood_entries_table, create_item, get_item, update_item, delete_item, query_items
+from backend.repositories import mood_repository, version_repository
 from backend.core.exceptions import NotFoundException
-from backend.core.utils import generate_uuid, get_current_timestamp
+from backend.core.utils import generate_uuid, get_current_timestamp, normalize_timestamp
 from collections import Counter
 
-async def create_mood_entry(user_id: str, mood_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Create a new mood entry."""
+def _prepare_mood_data(user_id: str, mood_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Set the owner and a normalized timestamp on new mood entry data."""
     # Set timestamp to current time if not provided
     if not mood_data.get("timestamp"):
         mood_data["timestamp"] = datetime.utcnow().isoformat()
+    else:
+        mood_data["timestamp"] = normalize_timestamp(mood_data["timestamp"])
     
     mood_data["user_id"] = user_id
-    mood_entry = await create_item(mood_entries_table, mood_data, "entry_id", "user_id")
+    return mood_data
+
+async def create_mood_entry(user_id: str, mood_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Create a new mood entry."""
+    mood_entry = await mood_repository.create(user_id, _prepare_mood_data(user_id, mood_data))
+    await version_repository.bump(user_id, "moods")
     return mood_entry
 
+async def create_mood_entries(user_id: str, entries: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Create many mood entries with batched writes."""
+    result = await mood_repository.create_many(
+        user_id,
+        [_prepare_mood_data(user_id, mood_data) for mood_data in entries]
+    )
+    if result["created"]:
+        await version_repository.bump(user_id, "moods")
+    return result
+
 async def get_mood_entry(entry_id: str, user_id: str) -> Dict[str, Any]:
     """Get a mood entry by ID."""
-    mood_entry = await get_item(mood_entries_table, entry_id, "entry_id", user_id, "user_id")
+    mood_entry = await mood_repository.get(user_id, entry_id)
     if not mood_entry:
         raise NotFoundException(f"Mood entry with ID {entry_id} not found")
     return mood_entry
 
 async def update_mood_entry(entry_id: str, user_id: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
     """Update a mood entry."""
-    # Check if mood entry exists
-    mood_entry = await get_item(mood_entries_table, entry_id, "entry_id", user_id, "user_id")
-    if not mood_entry:
-        raise NotFoundException(f"Mood entry with ID {entry_id} not found")
-    
-    updated_mood_entry = await update_item(
-        mood_entries_table,
-        entry_id,
-        "entry_id",
-        update_data,
-        user_id,
-        "user_id"
-    )
+    updated_mood_entry = await mood_repository.update(user_id, entry_id, update_data)
+    await version_repository.bump(user_id, "moods")
     
     return updated_mood_entry
 
 async def delete_mood_entry(entry_id: str, user_id: str) -> None:
     """Delete a mood entry."""
-    # Check if mood entry exists
-    mood_entry = await get_item(mood_entries_table, entry_id, "entry_id", user_id, "user_id")
-    if not mood_entry:
-        raise NotFoundException(f"Mood entry with ID {entry_id} not found")
-    
-    await delete_item(mood_entries_table, entry_id, "entry_id", user_id, "user_id")
+    await mood_repository.delete(user_id, entry_id)
+    await version_repository.bump(user_id, "moods")
 
-async def list_mood_entries(user_id: str, limit: int = 100, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict[str, Any]]:
-    """List mood entries for a user."""
-    # Get all mood entries for the user
-    mood_entries = await query_items(
-        mood_entries_table,
-        "user_id = :user_id",
-        {":user_id": user_id},
-        "UserIdIndex"
+async def list_mood_entries(user_id: str, limit: int = 100, start_date: Optional[str] = None, end_date: Optional[str] = None, attributes: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """List mood entries for a user, newest first, optionally reading only ``attributes``."""
+    return await mood_repository.list(
+        user_id,
+        start=start_date,
+        end=end_date,
+        limit=limit,
+        attributes=attributes
     )
-    
-    # Filter by date range if provided
-    if start_date or end_date:
-        filtered_entries = []
-        start_dt = datetime.fromisoformat(start_date.replace("Z", "+00:00")) if start_date else None
-        end_dt = datetime.fromisoformat(end_date.replace("Z", "+00:00")) if end_date else None
-        
-        for entry in mood_entries:
-            entry_dt = datetime.fromisoformat(entry["timestamp"].replace("Z", "+00:00"))
-            if (not start_dt or entry_dt >= start_dt) and (not end_dt or entry_dt <= end_dt):
-                filtered_entries.append(entry)
-        
-        mood_entries = filtered_entries
-    
-    # Sort by timestamp (newest first)
-    mood_entries.sort(key=lambda x: x["timestamp"], reverse=True)
-    
-    # Apply limit
-    return mood_entries[:limit]
 
-async def get_mood_statistics(user_id: str, days: int = 30) -> Dict[str, Any]:
-    """Get mood statistics for a user."""
+async def list_mood_entries_page(user_id: str, limit: int = 100, start_date: Optional[str] = None, end_date: Optional[str] = None, after: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """List one page of a user's mood entries, newest first, and the position of the next page."""
+    return await mood_repository.list_page(user_id, limit, after, start=start_date, end=end_date)
+
+async def get_mood_statistics(user_id: str, days: int = 30, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Get mood statistics for a user over the ``days`` before ``now`` (default: the current time)."""
     # Get mood entries for the specified period
-    end_date = datetime.utcnow()
+    end_date = now or datetime.utcnow()
     start_date = end_date - timedelta(days=days)
     
     mood_entries = await list_mood_entries(
         user_id,
         limit=1000,
         start_date=start_date.isoformat(),
-        end_date=end_date.isoformat()
+        end_date=end_date.isoformat(),
+        attributes=["mood_rating", "tags", "timestamp"]
     )
     
     if not mood_entries:
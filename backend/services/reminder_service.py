@@ -1,38 +1,74 @@
 """
 Reminder service.
 """
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
-from backend.db.dynamodb import reminders_table, medications_table, create_item, get_item, update_item, delete_item, query_items
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import date, datetime, time, timedelta
+from backend.repositories import reminder_repository, medication_repository, version_repository
 from backend.core.exceptions import NotFoundException
-from backend.core.utils import generate_uuid, get_current_timestamp
+from backend.core.utils import generate_uuid, get_current_timestamp, normalize_timestamp
 from backend.schemas.reminder import ReminderStatus
 
 async def create_reminder(user_id: str, reminder_data: Dict[str, Any]) -> Dict[str, Any]:
     """Create a new reminder."""
     # Check if medication exists
     medication_id = reminder_data.get("medication_id")
-    medication = await get_item(medications_table, medication_id, "medication_id", user_id, "user_id")
+    medication = await medication_repository.get(user_id, medication_id)
     if not medication:
         raise NotFoundException(f"Medication with ID {medication_id} not found")
     
     reminder_data["user_id"] = user_id
-    reminder = await create_item(reminders_table, reminder_data, "reminder_id", "user_id")
+    reminder_data["scheduled_time"] = normalize_timestamp(reminder_data["scheduled_time"])
+    reminder = await reminder_repository.create(user_id, reminder_data)
+    await version_repository.bump(user_id, "reminders")
     
     # Add medication details to the response
     reminder["medication"] = medication
     
     return reminder
 
+async def create_reminders(user_id: str, reminders_data: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Create many reminders with batched reads and writes."""
+    # Check that the referenced medications exist with one batched read
+    medication_ids = [
+        reminder_data["medication_id"]
+        for reminder_data in reminders_data
+        if reminder_data.get("medication_id")
+    ]
+    medications = await medication_repository.get_many(user_id, medication_ids)
+    medications_by_id = {medication["medication_id"]: medication for medication in medications}
+    
+    valid_reminders = []
+    failed = []
+    for reminder_data in reminders_data:
+        medication_id = reminder_data.get("medication_id")
+        if medication_id not in medications_by_id:
+            failed.append({"item": reminder_data, "error": f"Medication with ID {medication_id} not found"})
+            continue
+        
+        reminder_data["user_id"] = user_id
+        reminder_data["scheduled_time"] = normalize_timestamp(reminder_data["scheduled_time"])
+        valid_reminders.append(reminder_data)
+    
+    result = await reminder_repository.create_many(user_id, valid_reminders)
+    if result["created"]:
+        await version_repository.bump(user_id, "reminders")
+    
+    # Add medication details to the response
+    for reminder in result["created"]:
+        reminder["medication"] = medications_by_id[reminder["medication_id"]]
+    
+    result["failed"] = failed + result["failed"]
+    return result
+
 async def get_reminder(reminder_id: str, user_id: str) -> Dict[str, Any]:
     """Get a reminder by ID."""
-    reminder = await get_item(reminders_table, reminder_id, "reminder_id", user_id, "user_id")
+    reminder = await reminder_repository.get(user_id, reminder_id)
     if not reminder:
         raise NotFoundException(f"Reminder with ID {reminder_id} not found")
     
     # Get medication details
     medication_id = reminder.get("medication_id")
-    medication = await get_item(medications_table, medication_id, "medication_id", user_id, "user_id")
+    medication = await medication_repository.get(user_id, medication_id)
     if medication:
         reminder["medication"] = medication
     
@@ -40,23 +76,15 @@ async def get_reminder(reminder_id: str, user_id: str) -> Dict[str, Any]:
 
 async def update_reminder(reminder_id: str, user_id: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
     """Update a reminder."""
-    # Check if reminder exists
-    reminder = await get_item(reminders_table, reminder_id, "reminder_id", user_id, "user_id")
-    if not reminder:
-        raise NotFoundException(f"Reminder with ID {reminder_id} not found")
+    if update_data.get("scheduled_time"):
+        update_data["scheduled_time"] = normalize_timestamp(update_data["scheduled_time"])
     
-    updated_reminder = await update_item(
-        reminders_table,
-        reminder_id,
-        "reminder_id",
-        update_data,
-        user_id,
-        "user_id"
-    )
+    updated_reminder = await reminder_repository.update(user_id, reminder_id, update_data)
+    await version_repository.bump(user_id, "reminders")
     
     # Get medication details
     medication_id = updated_reminder.get("medication_id")
-    medication = await get_item(medications_table, medication_id, "medication_id", user_id, "user_id")
+    medication = await medication_repository.get(user_id, medication_id)
     if medication:
         updated_reminder["medication"] = medication
     
@@ -64,90 +92,77 @@ async def update_reminder(reminder_id: str, user_id: str, update_data: Dict[str,
 
 async def delete_reminder(reminder_id: str, user_id: str) -> None:
     """Delete a reminder."""
-    # Check if reminder exists
-    reminder = await get_item(reminders_table, reminder_id, "reminder_id", user_id, "user_id")
-    if not reminder:
-        raise NotFoundException(f"Reminder with ID {reminder_id} not found")
-    
-    await delete_item(reminders_table, reminder_id, "reminder_id", user_id, "user_id")
+    await reminder_repository.delete(user_id, reminder_id)
+    await version_repository.bump(user_id, "reminders")
 
-async def list_reminders(user_id: str) -> List[Dict[str, Any]]:
-    """List all reminders for a user."""
-    reminders = await query_items(
-        reminders_table,
-        "user_id = :user_id",
-        {":user_id": user_id},
-        "UserIdIndex"
-    )
+async def _attach_medications(user_id: str, reminders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Add medication details to each reminder with one batched read."""
+    medication_ids = [
+        reminder["medication_id"]
+        for reminder in reminders
+        if reminder.get("medication_id")
+    ]
+    medications = await medication_repository.get_many(user_id, medication_ids)
+    medications_by_id = {medication["medication_id"]: medication for medication in medications}
     
-    # Get medication details for each reminder
     for reminder in reminders:
-        medication_id = reminder.get("medication_id")
-        medication = await get_item(medications_table, medication_id, "medication_id", user_id, "user_id")
+        medication = medications_by_id.get(reminder.get("medication_id"))
         if medication:
             reminder["medication"] = medication
     
     return reminders
 
-async def get_today_reminders(user_id: str) -> List[Dict[str, Any]]:
-    """Get today's reminders for a user."""
-    # Get all reminders for the user
-    reminders = await list_reminders(user_id)
-    
-    # Filter reminders for today
-    today = datetime.utcnow().date()
-    today_reminders = [
-        reminder for reminder in reminders
-        if datetime.fromisoformat(reminder["scheduled_time"].replace("Z", "+00:00")).date() == today
-    ]
+async def list_reminders(user_id: str) -> List[Dict[str, Any]]:
+    """List all reminders for a user, ordered by scheduled time."""
+    reminders = await reminder_repository.list(user_id, newest_first=False)
+    
+    return await _attach_medications(user_id, reminders)
+
+async def list_reminders_page(user_id: str, limit: int, after: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """List one page of a user's reminders, ordered by scheduled time, and the position of the next page."""
+    reminders, position = await reminder_repository.list_page(user_id, limit, after, newest_first=False)
+    return await _attach_medications(user_id, reminders), position
+
+async def get_today_reminders(user_id: str, today: Optional[date] = None) -> List[Dict[str, Any]]:
+    """Get today's (or ``today``'s) reminders for a user, ordered by scheduled time."""
+    start_of_day = datetime.combine(today or datetime.utcnow().date(), time.min)
+    end_of_day = datetime.combine(start_of_day.date(), time.max)
     
-    # Sort by scheduled time
-    today_reminders.sort(key=lambda r: r["scheduled_time"])
+    reminders = await reminder_repository.list(
+        user_id,
+        start=start_of_day.isoformat(),
+        end=end_of_day.isoformat(),
+        newest_first=False
+    )
     
-    return today_reminders
+    return await _attach_medications(user_id, reminders)
 
 async def get_upcoming_reminders(user_id: str, days: int = 7) -> List[Dict[str, Any]]:
-    """Get upcoming reminders for a user."""
-    # Get all reminders for the user
-    reminders = await list_reminders(user_id)
-    
-    # Filter upcoming reminders
+    """Get upcoming reminders for a user, ordered by scheduled time."""
     now = datetime.utcnow()
     end_date = now + timedelta(days=days)
     
-    upcoming_reminders = [
-        reminder for reminder in reminders
-        if now <= datetime.fromisoformat(reminder["scheduled_time"].replace("Z", "+00:00")) <= end_date
-    ]
-    
-    # Sort by scheduled time
-    upcoming_reminders.sort(key=lambda r: r["scheduled_time"])
+    reminders = await reminder_repository.list(
+        user_id,
+        start=now.isoformat(),
+        end=end_date.isoformat(),
+        newest_first=False
+    )
     
-    return upcoming_reminders
+    return await _attach_medications(user_id, reminders)
 
 async def update_reminder_status(reminder_id: str, user_id: str, status: ReminderStatus, notes: Optional[str] = None) -> Dict[str, Any]:
     """Update a reminder's status."""
-    # Check if reminder exists
-    reminder = await get_item(reminders_table, reminder_id, "reminder_id", user_id, "user_id")
-    if not reminder:
-        raise NotFoundException(f"Reminder with ID {reminder_id} not found")
-    
     update_data = {"status": status}
     if notes is not None:
         update_data["notes"] = notes
     
-    updated_reminder = await update_item(
-        reminders_table,
-        reminder_id,
-        "reminder_id",
-        update_data,
-        user_id,
-        "user_id"
-    )
+    updated_reminder = await reminder_repository.update(user_id, reminder_id, update_data)
+    await version_repository.bump(user_id, "reminders")
     
     # Get medication details
     medication_id = updated_reminder.get("medication_id")
-    medication = await get_item(medications_table, medication_id, "medication_id", user_id, "user_id")
+    medication = await medication_repository.get(user_id, medication_id)
     if medication:
         updated_reminder["medication"] = medication
     
@@ -10,6 +10,8 @@ from unittest.mock import patch, MagicMock
 
 from backend.main import app
 from backend.core.security import create_access_token
+from backend.core.rate_limit import login_throttle
+from backend.core.user_cache import user_cache
 from backend.config import settings
 
 # Configure logging
@@ -23,6 +25,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger("api_tests")
 
+# Cached users must not leak between tests
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    """Start every test with an empty user cache."""
+    user_cache.clear()
+    yield
+    user_cache.clear()
+
+# Login attempts must not be throttled by earlier tests
+@pytest.fixture(autouse=True)
+def reset_login_throttle():
+    """Start every test with full login buckets."""
+    login_throttle.reset()
+    yield
+
 # Test client
 @pytest.fixture
 def client() -> TestClient:
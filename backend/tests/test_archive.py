@@ -0,0 +1,124 @@
+"""
+Tests for retention TTLs and the archival of expired chat history and feedback.
+"""
+import gzip
+import json
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+
+from backend.config import settings
+from backend.core.utils import get_current_timestamp
+from backend.db import dynamodb
+from backend.db.memory import MemoryDynamoDB
+from backend.db.tables import TABLE_DEFINITIONS
+from backend.repositories import dynamodb as dynamodb_repositories
+from backend.repositories import sqlite as sqlite_repositories
+from backend.services import archive_service
+
+NOW = datetime(2024, 6, 1)
+
+
+@pytest.fixture(params=["dynamodb", "sqlite"])
+def repos(request, tmp_path):
+    if request.param == "dynamodb":
+        resource = MemoryDynamoDB(TABLE_DEFINITIONS)
+        with patch.object(dynamodb, "dynamodb", resource), \
+             patch.object(dynamodb, "users_table", resource.Table("Users")):
+            yield dynamodb_repositories.create_repositories(resource)
+    else:
+        yield sqlite_repositories.create_repositories(str(tmp_path / "archive.db"))
+
+
+@pytest.fixture
+def uploads():
+    """Archive objects uploaded to S3, by key."""
+    objects = {}
+
+    async def upload_file(file_obj, object_name, content_type=None):
+        assert content_type == "application/gzip"
+        objects[object_name] = [json.loads(line) for line in gzip.decompress(file_obj.read()).splitlines()]
+        return object_name
+
+    with patch.object(archive_service, "upload_file", upload_file):
+        yield objects
+
+
+async def _user(repos, name):
+    user = await repos.users.create({"email": f"{name}@example.com", "password_hash": "hash"})
+    return user["user_id"]
+
+
+@pytest.mark.unit
+def test_expires_at_follows_retention_settings(repos):
+    with patch.object(settings, "CHAT_HISTORY_RETENTION_DAYS", 30), \
+         patch.object(settings, "RETENTION_TTL_GRACE_DAYS", 2), \
+         patch.object(settings, "FEEDBACK_RETENTION_DAYS", 0):
+        ttl = archive_service.expires_at(repos.chat)
+        assert abs(ttl - (get_current_timestamp() + 32 * 86400)) <= 1
+        assert archive_service.expires_at(repos.feedback) is None
+        assert archive_service.expires_at(repos.moods) is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_archive_moves_expired_items_to_date_partitions(repos, uploads):
+    u1, u2 = await _user(repos, "u1"), await _user(repos, "u2")
+    old = [
+        await repos.chat.create(u1, {"message": "a", "timestamp": "2024-01-01T09:00:00"}),
+        await repos.chat.create(u1, {"message": "b", "timestamp": "2024-01-01T10:00:00"}),
+        await repos.chat.create(u2, {"message": "c", "timestamp": "2024-01-02T09:00:00"}),
+    ]
+    recent = await repos.chat.create(u1, {"message": "d", "timestamp": "2024-05-30T09:00:00"})
+    old_feedback = await repos.feedback.create(u2, {"feedback": "x", "timestamp": "2023-01-05T00:00:00"})
+    recent_feedback = await repos.feedback.create(u2, {"feedback": "y", "timestamp": "2024-05-01T00:00:00"})
+
+    with patch.object(settings, "CHAT_HISTORY_RETENTION_DAYS", 90), \
+         patch.object(settings, "FEEDBACK_RETENTION_DAYS", 365):
+        stats = await archive_service.archive_all(repos, now=NOW)
+
+    assert stats == {
+        "chat_history": {"archived": 3, "objects": 2, "failed": 0},
+        "feedback": {"archived": 1, "objects": 1, "failed": 0},
+    }
+    partitions = {key.split("/")[2]: items for key, items in uploads.items() if key.startswith("archive/chat_history/")}
+    assert sorted(partitions) == ["date=2024-01-01", "date=2024-01-02"]
+    assert [item["message"] for item in partitions["date=2024-01-01"]] == ["a", "b"]
+    assert partitions["date=2024-01-02"][0]["message_id"] == old[2]["message_id"]
+    feedback_key, = [key for key in uploads if key.startswith("archive/feedback/date=2023-01-05/")]
+    assert uploads[feedback_key][0]["feedback_id"] == old_feedback["feedback_id"]
+
+    for item in old:
+        assert await repos.chat.get(item["user_id"], item["message_id"]) is None
+    assert await repos.chat.get(u1, recent["message_id"]) is not None
+    assert await repos.feedback.get(u2, recent_feedback["feedback_id"]) is not None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_failed_upload_keeps_items(repos):
+    u1 = await _user(repos, "u1")
+    item = await repos.chat.create(u1, {"message": "a", "timestamp": "2024-01-01T09:00:00"})
+
+    async def failing_upload(*args, **kwargs):
+        raise RuntimeError("S3 unavailable")
+
+    with patch.object(archive_service, "upload_file", failing_upload), \
+         pytest.raises(RuntimeError):
+        await archive_service.archive_all(repos, now=NOW)
+
+    assert await repos.chat.get(u1, item["message_id"]) is not None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_retention_disabled_archives_nothing(repos, uploads):
+    u1 = await _user(repos, "u1")
+    await repos.chat.create(u1, {"message": "a", "timestamp": "2020-01-01T09:00:00"})
+
+    with patch.object(settings, "CHAT_HISTORY_RETENTION_DAYS", 0), \
+         patch.object(settings, "FEEDBACK_RETENTION_DAYS", 0):
+        stats = await archive_service.archive_all(repos, now=NOW)
+
+    assert stats["chat_history"]["archived"] == 0
+    assert uploads == {}
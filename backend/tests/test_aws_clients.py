@@ -0,0 +1,79 @@
+"""
+Tests for the AWS client factory and the lazy handles built on it.
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+
+from backend.config import settings
+from backend.db import aws, dynamodb
+from backend.db.memory import MemoryDynamoDB
+from backend.db.tables import TABLE_DEFINITIONS
+
+
+@pytest.fixture(autouse=True)
+def fresh_clients():
+    aws.reset()
+    yield
+    aws.reset()
+
+
+@pytest.mark.unit
+def test_client_kwargs_follow_settings():
+    with patch.object(settings, "DYNAMODB_ENDPOINT", "http://dynamodb-local:8000"), \
+         patch.object(settings, "AWS_RETRY_MODE", "adaptive"), \
+         patch.object(settings, "AWS_MAX_ATTEMPTS", 4), \
+         patch.object(settings, "AWS_READ_TIMEOUT", 3.0):
+        kwargs = aws.client_kwargs("dynamodb", max_pool_connections=32)
+        s3_kwargs = aws.client_kwargs("s3", max_pool_connections=8)
+
+    config = kwargs["config"]
+    assert kwargs["endpoint_url"] == "http://dynamodb-local:8000"
+    assert kwargs["region_name"] == settings.AWS_REGION
+    assert config.max_pool_connections == 32
+    assert config.retries == {"mode": "adaptive", "max_attempts": 4}
+    assert config.read_timeout == 3.0
+    assert config.connect_timeout == settings.AWS_CONNECT_TIMEOUT
+    assert config.tcp_keepalive is True
+    assert "endpoint_url" not in s3_kwargs
+    assert s3_kwargs["config"].max_pool_connections == 8
+
+
+@pytest.mark.unit
+def test_clients_are_created_once_on_first_use():
+    with patch.object(aws.boto3, "client", side_effect=lambda *args, **kwargs: MagicMock()) as client:
+        lazy = aws.LazyProxy(lambda: aws.get_client("s3", max_pool_connections=8))
+        assert client.call_count == 0
+
+        lazy.delete_object(Bucket="b", Key="k")
+        lazy.delete_object(Bucket="b", Key="k")
+        assert aws.get_client("s3", max_pool_connections=8) is lazy._resolve()
+
+    assert client.call_count == 1
+    assert client.call_args.args == ("s3",)
+
+
+@pytest.mark.unit
+def test_lazy_table_follows_the_current_resource():
+    first = MemoryDynamoDB(TABLE_DEFINITIONS)
+    second = MemoryDynamoDB(TABLE_DEFINITIONS)
+    first.Table("Feedback").put_item(Item={"feedback_id": "f1", "user_id": "u1"})
+    current = {"resource": first}
+    table = aws.LazyTable("Feedback", lambda: current["resource"])
+
+    assert table.name == "Feedback"
+    assert "Item" in table.get_item(Key={"feedback_id": "f1", "user_id": "u1"})
+
+    current["resource"] = second
+    assert "Item" not in table.get_item(Key={"feedback_id": "f1", "user_id": "u1"})
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_data_layer_tables_resolve_through_the_module_resource():
+    resource = MemoryDynamoDB(TABLE_DEFINITIONS)
+    resource.Table("Medications").put_item(Item={"medication_id": "m1", "user_id": "u1", "name": "A"})
+
+    with patch.object(dynamodb, "dynamodb", resource):
+        item = await dynamodb.get_item(dynamodb.medications_table, "m1", "medication_id", "u1", "user_id")
+
+    assert item["name"] == "A"
@@ -0,0 +1,129 @@
+"""
+Tests for consumed-capacity accounting of DynamoDB calls.
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from backend.core.middleware import RequestContextMiddleware
+from backend.db import capacity, dynamodb
+from backend.db.memory import MemoryDynamoDB
+from backend.db.tables import TABLE_DEFINITIONS
+
+
+@pytest.fixture
+def resource():
+    resource = MemoryDynamoDB(TABLE_DEFINITIONS)
+    capacity.calls.reset()
+    with patch.object(dynamodb, "dynamodb", resource):
+        yield resource
+    capacity.calls.reset()
+
+
+def _rows(**labels):
+    return [
+        row for row in capacity.calls.rows()
+        if all(row[name] == value for name, value in labels.items())
+    ]
+
+
+@pytest.mark.unit
+def test_memory_backend_reports_consumed_capacity(resource):
+    table = resource.Table("JournalEntries")
+    small = {"entry_id": "e1", "user_id": "u1", "timestamp": "2024-01-01T00:00:00"}
+    large = {"entry_id": "e2", "user_id": "u1", "timestamp": "2024-01-02T00:00:00", "content": "x" * 5000}
+
+    assert table.put_item(Item=small, ReturnConsumedCapacity="TOTAL")["ConsumedCapacity"] == {
+        "TableName": "JournalEntries", "CapacityUnits": 1.0, "WriteCapacityUnits": 1.0
+    }
+    assert table.put_item(Item=large, ReturnConsumedCapacity="TOTAL")["ConsumedCapacity"]["CapacityUnits"] == 5.0
+    assert "ConsumedCapacity" not in table.put_item(Item=small)
+
+    key = {"entry_id": "e2", "user_id": "u1"}
+    assert table.get_item(Key=key, ReturnConsumedCapacity="TOTAL")["ConsumedCapacity"]["CapacityUnits"] == 1.0
+    assert table.get_item(Key=key, ConsistentRead=True, ReturnConsumedCapacity="TOTAL")["ConsumedCapacity"]["CapacityUnits"] == 2.0
+
+    page = table.query(
+        KeyConditionExpression="user_id = :user_id",
+        ExpressionAttributeValues={":user_id": "u1"},
+        IndexName="UserTimestampIndex",
+        ReturnConsumedCapacity="TOTAL"
+    )
+    assert page["ConsumedCapacity"]["CapacityUnits"] == 1.0
+
+    batch = resource.batch_get_item(
+        RequestItems={"JournalEntries": {"Keys": [key, {"entry_id": "e1", "user_id": "u1"}]}},
+        ReturnConsumedCapacity="TOTAL"
+    )
+    assert batch["ConsumedCapacity"] == [
+        {"TableName": "JournalEntries", "CapacityUnits": 1.5, "ReadCapacityUnits": 1.5}
+    ]
+
+    transaction = resource.meta.client.transact_write_items(
+        TransactItems=[{"Put": {"TableName": "JournalEntries", "Item": {**small, "entry_id": "e3"}}}],
+        ReturnConsumedCapacity="TOTAL"
+    )
+    assert transaction["ConsumedCapacity"][0]["CapacityUnits"] == 2.0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_data_layer_records_every_call(resource):
+    table = resource.Table("MoodEntries")
+
+    created = await dynamodb.create_item(table, {"user_id": "u1", "mood_rating": 5, "timestamp": "2024-01-01T00:00:00"}, "entry_id", "user_id")
+    await dynamodb.get_item(table, created["entry_id"], "entry_id", "u1", "user_id")
+    await dynamodb.get_item(table, "missing", "entry_id", "u1", "user_id")
+    await dynamodb.query_user_range(table, "UserTimestampIndex", "timestamp", "u1")
+    with pytest.raises(Exception):
+        await dynamodb.update_item(table, "missing", "entry_id", {"mood_rating": 1}, "u1", "user_id", must_exist=True)
+
+    put, = _rows(operation="PutItem")
+    assert (put["route"], put["table"], put["index"]) == ("-", "MoodEntries", "-")
+    assert put["count"] == 1 and put["capacity_units"] == 1.0 and put["items"] == 1
+
+    get, = _rows(operation="GetItem")
+    assert get["count"] == 2 and get["items"] == 1 and get["capacity_units"] == 1.0
+
+    query, = _rows(operation="Query")
+    assert query["index"] == "UserTimestampIndex"
+    assert query["pages"] == 1 and query["items"] == 1 and query["seconds"] > 0
+
+    update, = _rows(operation="UpdateItem")
+    assert update["errors"] == 1 and update["capacity_units"] == 0
+
+
+@pytest.mark.unit
+def test_calls_are_attributed_to_the_route(resource):
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+    table = resource.Table("Medications")
+    table.put_item(Item={"medication_id": "m1", "user_id": "u1"})
+
+    @app.get("/medications/{medication_id}")
+    async def get_medication(medication_id: str):
+        return await dynamodb.get_item(table, medication_id, "medication_id", "u1", "user_id")
+
+    client = TestClient(app)
+    client.get("/medications/m1")
+    client.get("/medications/m2")
+
+    row, = _rows(operation="GetItem")
+    assert row["route"] == "GET /medications/{medication_id}"
+    assert row["count"] == 2
+
+    report = capacity.report()
+    assert report["routes"][0]["route"] == "GET /medications/{medication_id}"
+    assert report["routes"][0]["capacity_units"] == 1.0
+    assert report["calls"][0]["avg_ms"] >= 0
+
+
+@pytest.mark.unit
+def test_dynamodb_metrics_endpoint():
+    from backend.main import app
+
+    response = TestClient(app).get("/api/metrics/dynamodb")
+
+    assert response.status_code == 200
+    assert set(response.json()) == {"routes", "calls"}
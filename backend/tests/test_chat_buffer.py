@@ -0,0 +1,92 @@
+"""
+Tests for the write-behind buffer of chat messages.
+"""
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.repositories import sqlite as sqlite_repositories
+from backend.services.chat_buffer import WriteBehindBuffer, chat_buffer
+
+
+@pytest.fixture
+def repos(tmp_path):
+    return sqlite_repositories.create_repositories(str(tmp_path / "chat.db"))
+
+
+def _message(text, second):
+    return {"message": text, "is_user": True, "timestamp": f"2024-01-01T12:00:{second:02d}"}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_buffered_messages_are_read_back_and_written_in_batches(repos):
+    buffer = WriteBehindBuffer(repos.chat, max_bytes=1024 * 1024, interval=60)
+    stored = await repos.chat.create("u1", _message("stored", 0))
+    buffer.start()
+
+    first = await buffer.add("u1", _message("first", 1))
+    second = await buffer.add("u1", _message("second", 2))
+    assert await repos.chat.get("u1", first["message_id"]) is None
+
+    history = buffer.merge("u1", await repos.chat.list("u1"), limit=2)
+    assert [item["message"] for item in history] == ["second", "first"]
+    assert buffer.merge("u2", []) == []
+
+    await buffer.close()
+    assert await repos.chat.get("u1", second["message_id"]) == second
+    assert [item["message"] for item in await repos.chat.list("u1")] == ["second", "first", "stored"]
+    assert buffer.buffered("u1") == []
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_messages_are_written_through_when_not_running_or_over_budget(repos):
+    buffer = WriteBehindBuffer(repos.chat, max_bytes=600, interval=60)
+
+    direct = await buffer.add("u1", _message("direct", 0))
+    assert await repos.chat.get("u1", direct["message_id"]) is not None
+
+    buffer.start()
+    buffered = await buffer.add("u1", _message("buffered", 1))
+    over_budget = await buffer.add("u1", _message("over budget", 2))
+    assert await repos.chat.get("u1", buffered["message_id"]) is None
+    assert await repos.chat.get("u1", over_budget["message_id"]) is not None
+    await buffer.close()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_failed_writes_stay_buffered_and_are_retried(repos):
+    buffer = WriteBehindBuffer(repos.chat, max_bytes=1024 * 1024, interval=0.01)
+    create_many = repos.chat.create_many
+    calls = []
+
+    async def flaky_create_many(user_id, items):
+        calls.append(len(items))
+        if len(calls) == 1:
+            raise RuntimeError("throttled")
+        return await create_many(user_id, items)
+
+    repos.chat.create_many = flaky_create_many
+    buffer.start()
+    item = await buffer.add("u1", _message("retried", 0))
+
+    for _ in range(100):
+        if await repos.chat.get("u1", item["message_id"]):
+            break
+        assert buffer.buffered("u1") == [item]
+        await asyncio.sleep(0.01)
+
+    assert calls[:2] == [1, 1]
+    assert await repos.chat.get("u1", item["message_id"]) == item
+    await buffer.close()
+
+
+@pytest.mark.unit
+def test_lifespan_starts_and_flushes_the_chat_buffer():
+    from backend.main import app
+
+    with TestClient(app):
+        assert chat_buffer.running
+    assert not chat_buffer.running
@@ -0,0 +1,148 @@
+"""
+Tests for response compression.
+"""
+import asyncio
+import gzip
+import json
+import zlib
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from unittest.mock import patch
+
+from backend.core import middleware
+from backend.core.middleware import CompressionMiddleware, negotiate
+
+PAYLOAD = json.dumps([{"entry_id": f"e{i}", "content": "Lorem ipsum " * 20} for i in range(400)]).encode()
+
+inner = FastAPI()
+
+
+@inner.get("/small")
+async def small():
+    return {"status": "ok"}
+
+
+@inner.get("/payload")
+async def payload():
+    return Response(PAYLOAD, media_type="application/json", headers={"ETag": '"v1"'})
+
+
+@inner.get("/image")
+async def image():
+    return Response(PAYLOAD, media_type="image/png")
+
+
+@inner.get("/stream")
+async def stream():
+    async def chunks():
+        for i in range(3):
+            yield json.dumps({"chunk": i, "text": "Lorem ipsum " * 200}).encode()
+    return StreamingResponse(chunks(), media_type="application/json")
+
+
+async def call(app, path: str, accept_encoding: str = "gzip"):
+    """Send a GET through ``app``; return the start message and the body messages."""
+    scope = {
+        "type": "http", "method": "GET", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "headers": [(b"accept-encoding", accept_encoding.encode())], "http_version": "1.1",
+        "scheme": "http", "server": ("test", 80), "client": ("127.0.0.1", 1000), "root_path": "",
+    }
+    messages = []
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        await asyncio.Event().wait()  # The client stays connected
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    headers = {name.decode(): value.decode() for name, value in messages[0]["headers"]}
+    return messages[0], headers, messages[1:]
+
+
+@pytest.mark.unit
+def test_negotiation_follows_quality_then_preference():
+    preference = ["zstd", "br", "gzip"]
+
+    assert negotiate("gzip, br", preference) == "br"
+    assert negotiate("gzip;q=1.0, br;q=0.5", preference) == "gzip"
+    assert negotiate("*", preference) == "zstd"
+    assert negotiate("*;q=0.5, gzip", preference) == "gzip"
+    assert negotiate("gzip;q=0, identity", preference) is None
+    assert negotiate("", preference) is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_small_and_incompressible_bodies_are_sent_as_they_are():
+    app = CompressionMiddleware(inner, minimum_size=1024, stream_size=1024 * 1024, encodings=["gzip"])
+
+    _, small_headers, small_body = await call(app, "/small")
+    _, image_headers, image_body = await call(app, "/image")
+
+    assert "content-encoding" not in small_headers
+    assert small_headers["vary"] == "Accept-Encoding"
+    assert json.loads(small_body[0]["body"]) == {"status": "ok"}
+    assert "content-encoding" not in image_headers and "vary" not in image_headers
+    assert image_body[0]["body"] == PAYLOAD
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_bodies_over_the_threshold_are_compressed_in_place():
+    app = CompressionMiddleware(inner, minimum_size=1024, stream_size=1024 * 1024, encodings=["gzip"])
+
+    _, headers, body = await call(app, "/payload", "br;q=0.9, gzip")
+    _, identity_headers, _ = await call(app, "/payload", "identity")
+
+    assert headers["content-encoding"] == "gzip"
+    assert int(headers["content-length"]) == len(body[0]["body"]) < len(PAYLOAD) // 10
+    assert gzip.decompress(body[0]["body"]) == PAYLOAD
+    assert headers["etag"] == 'W/"v1"'
+    assert "content-encoding" not in identity_headers and identity_headers["etag"] == '"v1"'
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_large_bodies_are_compressed_in_steps_off_the_event_loop():
+    app = CompressionMiddleware(inner, minimum_size=1024, stream_size=16 * 1024, encodings=["gzip"])
+
+    with patch.object(CompressionMiddleware, "run", autospec=True, side_effect=CompressionMiddleware.run) as run:
+        _, headers, body = await call(app, "/payload")
+
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    assert [message.get("more_body", False) for message in body][-1] is False
+    assert run.await_count == -(-len(PAYLOAD) // (16 * 1024))
+    assert gzip.decompress(b"".join(message["body"] for message in body)) == PAYLOAD
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_streamed_chunks_are_flushed_as_they_arrive():
+    app = CompressionMiddleware(inner, minimum_size=1024, stream_size=1024 * 1024, encodings=["gzip"])
+
+    _, headers, body = await call(app, "/stream")
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    assert headers["content-encoding"] == "gzip"
+    assert json.loads(decompressor.decompress(body[0]["body"])) == {"chunk": 0, "text": "Lorem ipsum " * 200}
+    rest = b"".join(decompressor.decompress(message["body"]) for message in body[1:])
+    assert rest.count(b'"chunk"') == 2 and decompressor.eof
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+@pytest.mark.skipif(middleware.zstandard is None, reason="zstandard is not installed")
+async def test_zstd_is_preferred_when_accepted():
+    app = CompressionMiddleware(inner, minimum_size=1024, stream_size=16 * 1024)
+
+    _, headers, body = await call(app, "/payload", "gzip, deflate, zstd")
+
+    assert headers["content-encoding"] == "zstd"
+    compressed = b"".join(message["body"] for message in body)
+    assert middleware.zstandard.ZstdDecompressor().decompressobj().decompress(compressed) == PAYLOAD
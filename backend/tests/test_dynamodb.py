@@ -0,0 +1,468 @@
+"""
+Tests for the DynamoDB data layer.
+"""
+import asyncio
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+from botocore.exceptions import ClientError
+
+from backend.config import settings
+from backend.core.exceptions import ConflictException
+from backend.db import dynamodb
+
+
+@pytest.fixture(autouse=True)
+def exact_requests():
+    """These tests check the exact requests sent; capacity accounting is tested in test_capacity.py."""
+    with patch.object(settings, "DYNAMODB_CAPACITY_METRICS", False):
+        yield
+
+
+class SlowTable:
+    """Table stand-in whose calls block the calling thread like a boto3 round trip."""
+
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.items = {}
+
+    def put_item(self, Item):
+        time.sleep(self.latency)
+        self.items[Item["entry_id"]] = Item
+        return {}
+
+    def get_item(self, Key):
+        time.sleep(self.latency)
+        item = self.items.get(Key["entry_id"])
+        return {"Item": item} if item else {}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_calls_do_not_block_event_loop():
+    """Concurrent reads overlap instead of running back to back on the loop."""
+    table = SlowTable(latency=0.1)
+    table.items["a"] = {"entry_id": "a"}
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(dynamodb.get_item(table, "a", "entry_id") for _ in range(5)),
+        ticker()
+    )
+    elapsed = time.perf_counter() - start
+
+    assert all(item == {"entry_id": "a"} for item in results[:5])
+    assert ticks == 5
+    assert elapsed < 0.3
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_create_and_get_item_round_trip():
+    """Items written through create_item are returned by get_item."""
+    table = SlowTable(latency=0)
+    item = await dynamodb.create_item(table, {"user_id": "u1", "note": "hi"}, "entry_id", "user_id")
+
+    fetched = await dynamodb.get_item(table, item["entry_id"], "entry_id")
+
+    assert fetched["note"] == "hi"
+    assert fetched["created_at"] == fetched["updated_at"]
+
+
+class PagedTable:
+    """Table stand-in that serves query results in fixed-size pages."""
+
+    def __init__(self, items, page_size: int):
+        self.items = items
+        self.page_size = page_size
+        self.calls = []
+
+    def query(self, **kwargs):
+        self.calls.append(kwargs)
+        start = kwargs.get("ExclusiveStartKey", {}).get("position", 0)
+        size = min(self.page_size, kwargs.get("Limit", self.page_size))
+        page = self.items[start:start + size]
+        response = {"Items": page}
+        if start + size < len(self.items):
+            response["LastEvaluatedKey"] = {"position": start + size}
+        return response
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_query_items_follows_last_evaluated_key():
+    """All pages are read when no limit is given."""
+    table = PagedTable([{"n": i} for i in range(25)], page_size=10)
+
+    items = await dynamodb.query_items(table, "user_id = :user_id", {":user_id": "u1"})
+
+    assert [item["n"] for item in items] == list(range(25))
+    assert len(table.calls) == 3
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_query_items_pushes_down_limit():
+    """The limit is sent to DynamoDB and stops pagination once reached."""
+    table = PagedTable([{"n": i} for i in range(25)], page_size=10)
+
+    items = await dynamodb.query_items(
+        table, "user_id = :user_id", {":user_id": "u1"}, limit=12, scan_index_forward=False
+    )
+
+    assert [item["n"] for item in items] == list(range(12))
+    assert [call["Limit"] for call in table.calls] == [12, 2]
+    assert all(call["ScanIndexForward"] is False for call in table.calls)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_iter_query_items_stops_fetching_on_early_exit():
+    """Breaking out of the iterator does not fetch further pages."""
+    table = PagedTable([{"n": i} for i in range(25)], page_size=10)
+
+    async for item in dynamodb.iter_query_items(table, "user_id = :user_id", {":user_id": "u1"}):
+        if item["n"] == 3:
+            break
+
+    assert len(table.calls) == 1
+
+
+@pytest.mark.unit
+def test_user_range_condition_normalizes_bounds():
+    """Range bounds are converted to naive UTC ISO strings."""
+    key_condition, values, names = dynamodb.user_range_condition(
+        "u1", "timestamp", "2023-05-01T10:00:00+02:00", "2023-05-02T00:00:00Z"
+    )
+
+    assert key_condition == "user_id = :user_id AND #sort_key BETWEEN :start AND :end"
+    assert values == {":user_id": "u1", ":start": "2023-05-01T08:00:00", ":end": "2023-05-02T00:00:00"}
+    assert names == {"#sort_key": "timestamp"}
+
+
+@pytest.mark.unit
+def test_user_range_condition_open_ended():
+    """A single bound becomes a comparison, no bound leaves only the hash key."""
+    assert dynamodb.user_range_condition("u1", "timestamp", start="2023-05-01")[0] == \
+        "user_id = :user_id AND #sort_key >= :start"
+    assert dynamodb.user_range_condition("u1", "timestamp", end="2023-05-01")[0] == \
+        "user_id = :user_id AND #sort_key <= :end"
+    assert dynamodb.user_range_condition("u1", "timestamp") == \
+        ("user_id = :user_id", {":user_id": "u1"}, {})
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_query_user_range_reads_latest_items_from_index():
+    """"Latest N" is a descending index query with Limit=N."""
+    table = PagedTable([{"n": i} for i in range(50)], page_size=10)
+
+    items = await dynamodb.query_user_range(table, "UserTimestampIndex", "timestamp", "u1", limit=5)
+
+    assert len(items) == 5
+    assert table.calls == [{
+        "KeyConditionExpression": "user_id = :user_id",
+        "ExpressionAttributeValues": {":user_id": "u1"},
+        "ScanIndexForward": False,
+        "IndexName": "UserTimestampIndex",
+        "Limit": 5
+    }]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_query_user_range_inverted_range_is_empty():
+    """An inverted range returns nothing without querying DynamoDB."""
+    table = PagedTable([{"n": 1}], page_size=10)
+
+    items = await dynamodb.query_user_range(
+        table, "UserTimestampIndex", "timestamp", "u1", start="2023-05-02", end="2023-05-01"
+    )
+
+    assert items == []
+    assert table.calls == []
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_get_user_by_email_queries_email_index():
+    """Email lookup is a single-item EmailIndex query, not a scan."""
+    table = PagedTable([{"user_id": "u1", "email": "a@example.com"}], page_size=10)
+
+    with patch.object(dynamodb, "users_table", table):
+        user = await dynamodb.get_user_by_email("a@example.com")
+
+    assert user["user_id"] == "u1"
+    assert table.calls[0]["IndexName"] == "EmailIndex"
+    assert table.calls[0]["Limit"] == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_create_user_claims_email_in_same_transaction():
+    """The user item is written together with a conditional email claim."""
+    resource = MagicMock()
+
+    with patch.object(dynamodb, "dynamodb", resource):
+        user = await dynamodb.create_user({"email": "a@example.com", "password_hash": "hash"})
+
+    items = resource.meta.client.transact_write_items.call_args.kwargs["TransactItems"]
+    claim, user_put = items[0]["Put"], items[1]["Put"]
+    assert claim["Item"] == {
+        "user_id": "email#a@example.com",
+        "owner_user_id": user["user_id"],
+        "created_at": user["created_at"]
+    }
+    assert claim["ConditionExpression"] == "attribute_not_exists(user_id)"
+    assert user_put["Item"] == user
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_create_user_duplicate_email_raises_conflict():
+    """A failed email claim surfaces as a ConflictException."""
+    resource = MagicMock()
+    resource.meta.client.transact_write_items.side_effect = ClientError(
+        {
+            "Error": {"Code": "TransactionCanceledException", "Message": "cancelled"},
+            "CancellationReasons": [{"Code": "ConditionalCheckFailed"}, {"Code": "None"}]
+        },
+        "TransactWriteItems"
+    )
+
+    with patch.object(dynamodb, "dynamodb", resource):
+        with pytest.raises(ConflictException):
+            await dynamodb.create_user({"email": "a@example.com", "password_hash": "hash"})
+
+
+class BatchResource:
+    """Resource stand-in that leaves some keys unprocessed on the first call."""
+
+    def __init__(self, table_name: str, unprocessed_first: int = 0):
+        self.table_name = table_name
+        self.unprocessed_first = unprocessed_first
+        self.calls = []
+
+    def batch_get_item(self, RequestItems):
+        keys = RequestItems[self.table_name]["Keys"]
+        self.calls.append(keys)
+        unprocessed = keys[:self.unprocessed_first]
+        self.unprocessed_first = 0
+        response = {"Responses": {self.table_name: [dict(key, found=True) for key in keys[len(unprocessed):]]}}
+        if unprocessed:
+            response["UnprocessedKeys"] = {self.table_name: {"Keys": unprocessed}}
+        return response
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_batch_get_items_dedupes_and_chunks_keys():
+    """Duplicate keys are fetched once and requests carry at most 100 keys."""
+    table = MagicMock()
+    table.name = "Medications"
+    resource = BatchResource("Medications")
+    keys = [{"medication_id": f"m{i % 250}", "user_id": "u1"} for i in range(500)]
+
+    with patch.object(dynamodb, "dynamodb", resource):
+        items = await dynamodb.batch_get_items(table, keys)
+
+    assert len(items) == 250
+    assert sorted(len(call) for call in resource.calls) == [50, 100, 100]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_batch_get_items_retries_unprocessed_keys():
+    """Unprocessed keys are requested again until every item is returned."""
+    table = MagicMock()
+    table.name = "Medications"
+    resource = BatchResource("Medications", unprocessed_first=3)
+    keys = [{"medication_id": f"m{i}", "user_id": "u1"} for i in range(10)]
+
+    with patch.object(dynamodb, "dynamodb", resource), patch.object(dynamodb, "BATCH_BASE_DELAY", 0):
+        items = await dynamodb.batch_get_items(table, keys)
+
+    assert len(items) == 10
+    assert [len(call) for call in resource.calls] == [10, 3]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_batch_get_items_without_keys_skips_request():
+    """An empty key list does not call DynamoDB."""
+    resource = BatchResource("Medications")
+
+    with patch.object(dynamodb, "dynamodb", resource):
+        assert await dynamodb.batch_get_items(MagicMock(), []) == []
+
+    assert resource.calls == []
+
+
+class BatchWriteResource:
+    """Resource stand-in recording BatchWriteItem calls and their concurrency."""
+
+    def __init__(self, table_name: str, unprocessed_first: int = 0, fail: bool = False):
+        self.table_name = table_name
+        self.unprocessed_first = unprocessed_first
+        self.fail = fail
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+
+    def batch_write_item(self, RequestItems):
+        requests = RequestItems[self.table_name]
+        self.calls.append(requests)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(0.01)
+            if self.fail:
+                raise ClientError({"Error": {"Code": "ValidationException", "Message": "bad item"}}, "BatchWriteItem")
+            unprocessed = requests[:self.unprocessed_first]
+            self.unprocessed_first = 0
+            return {"UnprocessedItems": {self.table_name: unprocessed} if unprocessed else {}}
+        finally:
+            self.active -= 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_batch_put_items_chunks_with_bounded_concurrency():
+    """Items are written 25 per request with at most the configured number of requests in flight."""
+    table = MagicMock()
+    table.name = "MoodEntries"
+    resource = BatchWriteResource("MoodEntries")
+    items = [{"entry_id": f"e{i}", "user_id": "u1"} for i in range(260)]
+
+    with patch.object(dynamodb, "dynamodb", resource), \
+         patch.object(dynamodb.settings, "DYNAMODB_BATCH_WRITE_CONCURRENCY", 3):
+        results = await dynamodb.batch_put_items(table, items, "entry_id", "user_id")
+
+    assert len(resource.calls) == 11
+    assert max(len(call) for call in resource.calls) == 25
+    assert resource.max_active <= 3
+    assert all(result["success"] for result in results)
+    assert results[0]["key"] == {"entry_id": "e0", "user_id": "u1"}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_batch_put_items_retries_unprocessed_items():
+    """Unprocessed items are resent until written."""
+    table = MagicMock()
+    table.name = "MoodEntries"
+    resource = BatchWriteResource("MoodEntries", unprocessed_first=2)
+    items = [{"entry_id": f"e{i}", "user_id": "u1"} for i in range(5)]
+
+    with patch.object(dynamodb, "dynamodb", resource), patch.object(dynamodb, "BATCH_BASE_DELAY", 0):
+        results = await dynamodb.batch_put_items(table, items, "entry_id", "user_id")
+
+    assert [len(call) for call in resource.calls] == [5, 2]
+    assert all(result["success"] for result in results)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_batch_delete_items_reports_failures_per_key():
+    """A rejected chunk marks each of its keys as failed."""
+    table = MagicMock()
+    table.name = "MoodEntries"
+    resource = BatchWriteResource("MoodEntries", fail=True)
+    keys = [{"entry_id": "e1", "user_id": "u1"}, {"entry_id": "e2", "user_id": "u1"}]
+
+    with patch.object(dynamodb, "dynamodb", resource):
+        results = await dynamodb.batch_delete_items(table, keys)
+
+    assert resource.calls[0][0] == {"DeleteRequest": {"Key": keys[0]}}
+    assert results == [
+        {"key": keys[0], "success": False, "error": "bad item"},
+        {"key": keys[1], "success": False, "error": "bad item"}
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_create_mood_entries_builds_items_for_batch_write():
+    """Bulk mood creation assigns IDs, owner and timestamps before writing."""
+    from backend.services import mood_service
+
+    async def fake_batch_put(table, items, pk_name, sk_name=None):
+        return [{"key": {pk_name: item[pk_name]}, "success": item["mood_rating"] != 1, "error": None if item["mood_rating"] != 1 else "boom"} for item in items]
+
+    with patch.object(dynamodb, "batch_put_items", side_effect=fake_batch_put), \
+         patch.object(dynamodb, "bump_version") as bump_version:
+        result = await mood_service.create_mood_entries("u1", [
+            {"mood_rating": 7, "timestamp": "2023-05-01T10:00:00Z"},
+            {"mood_rating": 1}
+        ])
+
+    bump_version.assert_awaited_once_with("u1", "moods")
+    assert len(result["created"]) == 1
+    created = result["created"][0]
+    assert created["user_id"] == "u1"
+    assert created["timestamp"] == "2023-05-01T10:00:00"
+    assert "entry_id" in created
+    assert result["failed"][0]["error"] == "boom"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_get_item_with_projection_aliases_attributes():
+    """Projected attributes are aliased so reserved words are safe."""
+    table = MagicMock()
+    table.get_item.return_value = {"Item": {"name": "Aspirin"}}
+
+    item = await dynamodb.get_item(table, "m1", "medication_id", "u1", "user_id", attributes=["name", "dosage"])
+
+    assert item == {"name": "Aspirin"}
+    table.get_item.assert_called_once_with(
+        Key={"medication_id": "m1", "user_id": "u1"},
+        ProjectionExpression="#name, #dosage",
+        ExpressionAttributeNames={"#name": "name", "#dosage": "dosage"}
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_query_projection_merges_with_key_condition_names():
+    """Projection placeholders are added to the ones used by the key condition."""
+    table = PagedTable([{"mood_rating": 5}], page_size=10)
+
+    await dynamodb.query_user_range(
+        table, "UserTimestampIndex", "timestamp", "u1",
+        start="2023-05-01", attributes=["mood_rating", "timestamp"]
+    )
+
+    call = table.calls[0]
+    assert call["ProjectionExpression"] == "#mood_rating, #timestamp"
+    assert call["ExpressionAttributeNames"] == {
+        "#sort_key": "timestamp",
+        "#mood_rating": "mood_rating",
+        "#timestamp": "timestamp"
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_mood_statistics_reads_only_needed_attributes():
+    """Mood statistics project the rating, tags and timestamp."""
+    from backend.services import mood_service
+
+    entries = [
+        {"mood_rating": 4, "tags": ["calm"], "timestamp": "2023-05-01T08:00:00"},
+        {"mood_rating": 8, "timestamp": "2023-05-01T20:00:00"}
+    ]
+    with patch.object(mood_service.mood_repository, "list", return_value=entries) as mock_query:
+        stats = await mood_service.get_mood_statistics("u1")
+
+    assert mock_query.call_args.kwargs["attributes"] == ["mood_rating", "tags", "timestamp"]
+    assert stats["average_rating"] == 6
+    assert stats["mood_trend"] == [{"date": "2023-05-01", "average_rating": 6}]
@@ -0,0 +1,127 @@
+"""
+Tests for data versions and conditional GETs of derived read endpoints.
+"""
+import pytest
+from datetime import datetime
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from backend.config import settings
+from backend.core import etag
+from backend.core.dependencies import get_current_user
+from backend.core.etag import etag_matches, make_etag, window_end
+from backend.db import dynamodb
+from backend.db.memory import MemoryDynamoDB
+from backend.db.tables import TABLE_DEFINITIONS
+from backend.repositories import dynamodb as dynamodb_repositories
+from backend.repositories import sqlite as sqlite_repositories
+from backend.services import medication_service, mood_service, reminder_service
+
+
+@pytest.fixture(params=["dynamodb", "sqlite"])
+def repos(request, tmp_path):
+    if request.param == "dynamodb":
+        resource = MemoryDynamoDB(TABLE_DEFINITIONS)
+        with patch.object(dynamodb, "dynamodb", resource):
+            yield dynamodb_repositories.create_repositories(resource)
+    else:
+        yield sqlite_repositories.create_repositories(str(tmp_path / "versions.db"))
+
+
+@pytest.fixture
+def client(tmp_path):
+    """A client of one user, with the services on a fresh SQLite database."""
+    from backend.main import app
+
+    repos = sqlite_repositories.create_repositories(str(tmp_path / "etags.db"))
+    app.dependency_overrides[get_current_user] = lambda: {"user_id": "u1"}
+    try:
+        with patch.object(mood_service, "mood_repository", repos.moods), \
+             patch.object(mood_service, "version_repository", repos.versions), \
+             patch.object(medication_service, "medication_repository", repos.medications), \
+             patch.object(medication_service, "version_repository", repos.versions), \
+             patch.object(reminder_service, "reminder_repository", repos.reminders), \
+             patch.object(reminder_service, "medication_repository", repos.medications), \
+             patch.object(reminder_service, "version_repository", repos.versions), \
+             patch.object(etag, "version_repository", repos.versions):
+            yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_versions_count_writes_per_user_and_collection(repos):
+    assert await repos.versions.get("u1", ["moods", "medications"]) == {"moods": 0, "medications": 0}
+
+    await repos.versions.bump("u1", "moods")
+    await repos.versions.bump("u1", "moods")
+    await repos.versions.bump("u2", "medications")
+
+    assert await repos.versions.get("u1", ["moods", "medications"]) == {"moods": 2, "medications": 0}
+    assert await repos.versions.get("u2", ["medications"]) == {"medications": 1}
+
+
+@pytest.mark.unit
+def test_etags_identify_versions_and_inputs():
+    tag = make_etag("u1", "moods/stats", {"moods": 1}, 30)
+
+    assert tag.startswith('"') and tag.endswith('"')
+    assert tag == make_etag("u1", "moods/stats", {"moods": 1}, 30)
+    assert len({
+        tag,
+        make_etag("u2", "moods/stats", {"moods": 1}, 30),
+        make_etag("u1", "moods/stats", {"moods": 2}, 30),
+        make_etag("u1", "moods/stats", {"moods": 1}, 7),
+        make_etag("u1", "ai/suggestions", {"moods": 1}),
+    }) == 5
+    assert etag_matches(tag, tag)
+    assert etag_matches(f'"other", W/{tag}', tag)
+    assert etag_matches("*", tag)
+    assert not etag_matches('"other"', tag)
+    assert not etag_matches(None, tag)
+
+
+@pytest.mark.unit
+def test_windows_end_on_multiples_of_the_window():
+    with patch.object(settings, "ETAG_WINDOW_SECONDS", 300):
+        assert window_end(datetime(2024, 1, 1, 12, 3, 20)) == datetime(2024, 1, 1, 12, 5)
+        assert window_end(datetime(2024, 1, 1, 12, 5)) == datetime(2024, 1, 1, 12, 10)
+
+
+@pytest.mark.unit
+def test_stats_are_not_recomputed_until_a_mood_changes(client):
+    from backend.api import moods
+
+    client.post("/api/moods", json={"mood_rating": 6})
+    with patch.object(moods, "window_end", return_value=window_end()):
+        first = client.get("/api/moods/stats")
+        tag = first.headers["ETag"]
+        with patch.object(mood_service, "get_mood_statistics", wraps=mood_service.get_mood_statistics) as stats:
+            cached = client.get("/api/moods/stats", headers={"If-None-Match": tag})
+            other_days = client.get("/api/moods/stats", params={"days": 7}, headers={"If-None-Match": tag})
+            client.post("/api/moods", json={"mood_rating": 8})
+            changed = client.get("/api/moods/stats", headers={"If-None-Match": tag})
+
+    assert first.status_code == 200 and first.json()["total_entries"] == 1
+    assert first.headers["Cache-Control"] == "private, no-cache"
+    assert cached.status_code == 304 and cached.headers["ETag"] == tag and not cached.content
+    assert other_days.status_code == 200
+    assert changed.status_code == 200 and changed.json()["total_entries"] == 2
+    assert changed.headers["ETag"] != tag
+    assert stats.await_count == 2
+
+
+@pytest.mark.unit
+def test_today_reminders_change_with_their_medications(client):
+    medication = client.post("/api/medications", json={"name": "Sertraline", "dosage": "50mg", "frequency": "daily", "start_date": "2024-01-01"}).json()
+    first = client.get("/api/reminders/today")
+
+    assert first.status_code == 200
+    assert client.get("/api/reminders/today", headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+    client.put(f"/api/medications/{medication['medication_id']}", json={"dosage": "100mg"})
+    changed = client.get("/api/reminders/today", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != first.headers["ETag"]
@@ -0,0 +1,96 @@
+"""
+Tests for the login throttle in front of password verification.
+"""
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, patch
+
+from backend.core.exceptions import TooManyRequestsException
+from backend.core.rate_limit import Limit, LoginThrottle, MemoryBucketStore, SQLiteBucketStore, take
+from backend.services import auth_service
+
+PER_MINUTE = Limit(burst=5, per_second=1 / 60)
+
+
+@pytest.mark.unit
+def test_buckets_refill_at_their_rate():
+    states = [None]
+    for _ in range(5):
+        wait, states = take(states, [PER_MINUTE], 1000.0)
+        assert wait == 0
+    wait, _ = take(states, [PER_MINUTE], 1000.0)
+    assert wait == pytest.approx(60)
+
+    wait, _ = take(states, [PER_MINUTE], 1060.0)
+    assert wait == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_burst_for_one_email_is_cut_off():
+    throttle = LoginThrottle(MemoryBucketStore(100), email_limit=PER_MINUTE, ip_limit=None)
+
+    for _ in range(5):
+        await throttle.check("victim@example.com", "10.0.0.1")
+    with pytest.raises(TooManyRequestsException) as error:
+        await throttle.check("Victim@Example.com ", "10.0.0.2")
+
+    assert error.value.status_code == 429
+    assert error.value.headers == {"Retry-After": "60"}
+    await throttle.check("other@example.com", "10.0.0.1")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_rejected_attempts_take_no_tokens():
+    throttle = LoginThrottle(MemoryBucketStore(100), email_limit=PER_MINUTE, ip_limit=Limit(3, 1 / 60))
+
+    for number in range(3):
+        await throttle.check(f"user{number}@example.com", "10.0.0.1")
+    # The exhausted IP bucket rejects a burst over many emails ...
+    for number in range(10):
+        with pytest.raises(TooManyRequestsException):
+            await throttle.check(f"user{number % 2}@example.com", "10.0.0.1")
+    # ... without draining the email bucket for logins from elsewhere
+    for number in range(4):
+        await throttle.check("user0@example.com", f"10.0.1.{number}")
+    with pytest.raises(TooManyRequestsException):
+        await throttle.check("user0@example.com", "10.0.2.1")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_file_store_is_shared_between_workers(tmp_path):
+    path = str(tmp_path / "throttle.db")
+    workers = [LoginThrottle(SQLiteBucketStore(path), email_limit=PER_MINUTE, ip_limit=None) for _ in range(2)]
+
+    results = await asyncio.gather(
+        *(workers[number % 2].check("victim@example.com") for number in range(12)),
+        return_exceptions=True
+    )
+
+    assert sum(result is None for result in results) == 5
+    assert all(isinstance(result, TooManyRequestsException) for result in results if result is not None)
+
+
+@pytest.mark.unit
+def test_login_burst_is_rejected_before_hashing():
+    from backend.main import app
+
+    client = TestClient(app)
+    users = AsyncMock()
+    users.get_by_email.return_value = {"user_id": "u1", "email": "victim@example.com", "password_hash": "hash"}
+    verify = AsyncMock(return_value=(False, None))
+
+    with patch.object(auth_service, "user_repository", users), \
+         patch.object(auth_service, "verify_and_update_password", verify):
+        responses = [
+            client.post("/api/auth/login", json={"email": "victim@example.com", "password": "guess"})
+            for _ in range(20)
+        ]
+
+    assert [response.status_code for response in responses] == [401] * 5 + [429] * 15
+    assert int(responses[-1].headers["Retry-After"]) > 0
+    assert verify.await_count == 5
+    assert users.get_by_email.await_count == 5
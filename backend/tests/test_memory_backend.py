@@ -0,0 +1,236 @@
+"""
+Tests for the in-process DynamoDB stand-in.
+"""
+import pytest
+from decimal import Decimal
+from unittest.mock import patch
+from botocore.exceptions import ClientError
+
+from backend.core.exceptions import ConflictException
+from backend.db import dynamodb
+from backend.db.memory import MemoryDynamoDB
+from backend.db.tables import TABLE_DEFINITIONS
+
+
+@pytest.fixture
+def resource():
+    return MemoryDynamoDB(TABLE_DEFINITIONS)
+
+
+def _mood(entry_id, user_id, timestamp, rating=5):
+    return {"entry_id": entry_id, "user_id": user_id, "timestamp": timestamp, "mood_rating": rating}
+
+
+@pytest.mark.unit
+def test_put_and_get_return_dynamodb_types(resource):
+    """Numbers come back as Decimal and stored items are not aliased."""
+    table = resource.Table("MoodEntries")
+    item = _mood("e1", "u1", "2024-01-01T00:00:00")
+    table.put_item(Item=item)
+    item["mood_rating"] = 1
+
+    fetched = table.get_item(Key={"entry_id": "e1", "user_id": "u1"})["Item"]
+    assert fetched["mood_rating"] == Decimal(5)
+    fetched["mood_rating"] = 2
+    assert table.get_item(Key={"entry_id": "e1", "user_id": "u1"})["Item"]["mood_rating"] == 5
+
+    with pytest.raises(TypeError):
+        table.put_item(Item=_mood("e2", "u1", "2024-01-01T00:00:00", rating=1.5))
+
+
+@pytest.mark.unit
+def test_get_rejects_keys_that_do_not_match_schema(resource):
+    with pytest.raises(ClientError) as exc:
+        resource.Table("MoodEntries").get_item(Key={"entry_id": "e1"})
+    assert exc.value.response["Error"]["Code"] == "ValidationException"
+
+
+@pytest.mark.unit
+def test_conditional_update_and_delete(resource):
+    table = resource.Table("MoodEntries")
+    table.put_item(Item=_mood("e1", "u1", "2024-01-01T00:00:00"))
+    key = {"entry_id": "e1", "user_id": "u1"}
+
+    response = table.update_item(
+        Key=key,
+        UpdateExpression="SET #mood_rating = :rating, notes = :notes ADD edits :one",
+        ConditionExpression="attribute_exists(entry_id)",
+        ExpressionAttributeNames={"#mood_rating": "mood_rating"},
+        ExpressionAttributeValues={":rating": 8, ":notes": "better", ":one": 1},
+        ReturnValues="ALL_NEW"
+    )
+    assert response["Attributes"]["mood_rating"] == 8
+    assert response["Attributes"]["edits"] == 1
+
+    with pytest.raises(ClientError) as exc:
+        table.update_item(
+            Key={"entry_id": "missing", "user_id": "u1"},
+            UpdateExpression="SET notes = :notes",
+            ConditionExpression="attribute_exists(entry_id)",
+            ExpressionAttributeValues={":notes": "x"}
+        )
+    assert exc.value.response["Error"]["Code"] == "ConditionalCheckFailedException"
+
+    deleted = table.delete_item(Key=key, ReturnValues="ALL_OLD")
+    assert deleted["Attributes"]["notes"] == "better"
+    assert table.get_item(Key=key) == {}
+
+
+@pytest.mark.unit
+def test_gsi_query_orders_and_filters_by_range_key(resource):
+    table = resource.Table("MoodEntries")
+    for day in (3, 1, 2, 5, 4):
+        table.put_item(Item=_mood(f"e{day}", "u1", f"2024-01-0{day}T00:00:00"))
+    table.put_item(Item=_mood("other", "u2", "2024-01-03T00:00:00"))
+    # Sparse index: items without the sort attribute are not indexed
+    table.put_item(Item={"entry_id": "untimed", "user_id": "u1"})
+
+    response = table.query(
+        IndexName="UserTimestampIndex",
+        KeyConditionExpression="user_id = :user_id AND #ts BETWEEN :start AND :end",
+        ExpressionAttributeNames={"#ts": "timestamp"},
+        ExpressionAttributeValues={
+            ":user_id": "u1", ":start": "2024-01-02T00:00:00", ":end": "2024-01-04T00:00:00"
+        },
+        ScanIndexForward=False
+    )
+    assert [item["entry_id"] for item in response["Items"]] == ["e4", "e3", "e2"]
+
+    with pytest.raises(ClientError):
+        table.query(IndexName="NoSuchIndex", KeyConditionExpression="user_id = :u",
+                    ExpressionAttributeValues={":u": "u1"})
+
+
+@pytest.mark.unit
+def test_query_paginates_with_last_evaluated_key(resource):
+    table = resource.Table("MoodEntries")
+    for day in range(1, 8):
+        table.put_item(Item=_mood(f"e{day}", "u1", f"2024-01-0{day}T00:00:00"))
+
+    kwargs = {
+        "IndexName": "UserTimestampIndex",
+        "KeyConditionExpression": "user_id = :user_id",
+        "ExpressionAttributeValues": {":user_id": "u1"},
+        "Limit": 3,
+    }
+    pages = []
+    while True:
+        response = table.query(**kwargs)
+        pages.append([item["entry_id"] for item in response["Items"]])
+        if "LastEvaluatedKey" not in response:
+            break
+        assert set(response["LastEvaluatedKey"]) == {"entry_id", "user_id", "timestamp"}
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    assert pages == [["e1", "e2", "e3"], ["e4", "e5", "e6"], ["e7"]]
+
+
+@pytest.mark.unit
+def test_scan_with_filter_and_projection(resource):
+    table = resource.Table("MoodEntries")
+    for day, rating in ((1, 3), (2, 8), (3, 9)):
+        table.put_item(Item=_mood(f"e{day}", "u1", f"2024-01-0{day}T00:00:00", rating))
+
+    response = table.scan(
+        FilterExpression="mood_rating >= :min",
+        ProjectionExpression="#entry_id, #mood_rating",
+        ExpressionAttributeNames={"#entry_id": "entry_id", "#mood_rating": "mood_rating"},
+        ExpressionAttributeValues={":min": 8}
+    )
+    assert response["Items"] == [
+        {"entry_id": "e2", "mood_rating": 8},
+        {"entry_id": "e3", "mood_rating": 9},
+    ]
+    assert response["ScannedCount"] == 3
+
+
+@pytest.mark.unit
+def test_transaction_is_all_or_nothing(resource):
+    users = resource.Table("Users")
+    users.put_item(Item={"user_id": "email#a@example.com", "owner_user_id": "u1"})
+
+    with pytest.raises(ClientError) as exc:
+        resource.meta.client.transact_write_items(TransactItems=[
+            {"Put": {"TableName": "Users", "Item": {"user_id": "u2", "email": "a@example.com"}}},
+            {"Put": {
+                "TableName": "Users",
+                "Item": {"user_id": "email#a@example.com", "owner_user_id": "u2"},
+                "ConditionExpression": "attribute_not_exists(user_id)",
+            }},
+        ])
+    error = exc.value.response
+    assert error["Error"]["Code"] == "TransactionCanceledException"
+    assert [reason["Code"] for reason in error["CancellationReasons"]] == ["None", "ConditionalCheckFailed"]
+    assert users.get_item(Key={"user_id": "u2"}) == {}
+
+
+@pytest.mark.unit
+def test_batch_operations(resource):
+    resource.batch_write_item(RequestItems={"MoodEntries": [
+        {"PutRequest": {"Item": _mood(f"e{i}", "u1", f"2024-01-0{i}T00:00:00")}} for i in range(1, 4)
+    ]})
+    resource.batch_write_item(RequestItems={"MoodEntries": [
+        {"DeleteRequest": {"Key": {"entry_id": "e2", "user_id": "u1"}}}
+    ]})
+
+    response = resource.batch_get_item(RequestItems={"MoodEntries": {
+        "Keys": [{"entry_id": f"e{i}", "user_id": "u1"} for i in range(1, 4)]
+    }})
+    assert sorted(item["entry_id"] for item in response["Responses"]["MoodEntries"]) == ["e1", "e3"]
+    assert response["UnprocessedKeys"] == {}
+
+    with pytest.raises(ClientError):
+        resource.batch_write_item(RequestItems={"MoodEntries": [
+            {"PutRequest": {"Item": _mood(f"x{i}", "u1", "2024-01-01T00:00:00")}} for i in range(26)
+        ]})
+
+
+@pytest.mark.unit
+def test_missing_table_raises_resource_not_found(resource):
+    with pytest.raises(ClientError) as exc:
+        resource.Table("Assessments").get_item(Key={"id": "1"})
+    assert exc.value.response["Error"]["Code"] == "ResourceNotFoundException"
+
+
+@pytest.mark.unit
+def test_sqlite_persistence(tmp_path):
+    path = str(tmp_path / "dynamodb.sqlite")
+    resource = MemoryDynamoDB(TABLE_DEFINITIONS, path)
+    table = resource.Table("MoodEntries")
+    table.put_item(Item=_mood("e1", "u1", "2024-01-01T00:00:00"))
+    table.put_item(Item=_mood("e2", "u1", "2024-01-02T00:00:00"))
+    table.delete_item(Key={"entry_id": "e2", "user_id": "u1"})
+    resource.close()
+
+    reopened = MemoryDynamoDB(TABLE_DEFINITIONS, path).Table("MoodEntries")
+    response = reopened.query(
+        IndexName="UserTimestampIndex",
+        KeyConditionExpression="user_id = :user_id",
+        ExpressionAttributeValues={":user_id": "u1"}
+    )
+    assert [item["entry_id"] for item in response["Items"]] == ["e1"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_data_layer_runs_on_memory_backend(resource):
+    """The data layer helpers work unchanged against the stand-in."""
+    users = resource.Table("Users")
+    moods = resource.Table("MoodEntries")
+    with patch.object(dynamodb, "dynamodb", resource), patch.object(dynamodb, "users_table", users):
+        user = await dynamodb.create_user({"email": "a@example.com", "password_hash": "x"})
+        assert (await dynamodb.get_user_by_email("a@example.com"))["user_id"] == user["user_id"]
+        with pytest.raises(ConflictException):
+            await dynamodb.create_user({"email": "a@example.com", "password_hash": "y"})
+
+        result = await dynamodb.create_items(moods, [
+            {"user_id": "u1", "timestamp": f"2024-01-{day:02d}T00:00:00", "mood_rating": day}
+            for day in range(1, 31)
+        ], "entry_id", "user_id")
+        assert len(result["created"]) == 30
+
+        latest = await dynamodb.query_user_range(
+            moods, "UserTimestampIndex", "timestamp", "u1",
+            start="2024-01-10T00:00:00", limit=5, attributes=["mood_rating"]
+        )
+        assert [item["mood_rating"] for item in latest] == [30, 29, 28, 27, 26]
@@ -10,7 +10,7 @@ from backend.tests.utils import (
     assert_validation_error, assert_unauthorized, assert_not_found,
     assert_list_response, assert_empty_response,
     setup_mock_db_get_user, setup_mock_db_create_item,
-    setup_mock_db_get_item, setup_mock_db_update_item,
+    setup_mock_db_get_item, setup_mock_db_update_item, setup_mock_db_update_item_not_found,
     setup_mock_db_query_items, log_response
 )
 from backend.tests.report import TestReporter
@@ -332,7 +332,7 @@ def test_update_mood_entry_not_found(client: TestClient, auth_headers, mock_db_f
     
     # Set up mocks
     setup_mock_db_get_user(mock_db_functions, mock_user)
-    setup_mock_db_get_item(mock_db_functions, None)  # Entry doesn't exist
+    setup_mock_db_update_item_not_found(mock_db_functions)  # Entry doesn't exist
     
     # Make request
     update_data = {
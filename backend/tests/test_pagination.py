@@ -0,0 +1,118 @@
+"""
+Tests for cursor pagination of list endpoints.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from backend.config import settings
+from backend.core.dependencies import get_current_user
+from backend.core.exceptions import AppException
+from backend.core.pagination import decode_cursor, encode_cursor, listing_scope
+from backend.db import dynamodb
+from backend.db.memory import MemoryDynamoDB
+from backend.db.tables import TABLE_DEFINITIONS
+from backend.repositories import dynamodb as dynamodb_repositories
+from backend.repositories import sqlite as sqlite_repositories
+from backend.services import mood_service
+
+
+@pytest.fixture(params=["dynamodb", "dynamodb-fast-reads", "sqlite"])
+def repos(request, tmp_path):
+    if request.param.startswith("dynamodb"):
+        resource = MemoryDynamoDB(TABLE_DEFINITIONS)
+        with patch.object(dynamodb, "dynamodb", resource), \
+             patch.object(settings, "DYNAMODB_FAST_READS", request.param == "dynamodb-fast-reads"):
+            yield dynamodb_repositories.create_repositories(resource)
+    else:
+        yield sqlite_repositories.create_repositories(str(tmp_path / "pages.db"))
+
+
+async def _read_all(repository, limit, **kwargs):
+    """Page through a listing, returning every page."""
+    pages, after = [], None
+    while True:
+        items, after = await repository.list_page("u1", limit, after, **kwargs)
+        pages.append(items)
+        if after is None:
+            return pages
+
+
+@pytest.mark.unit
+def test_cursors_are_signed_and_scoped():
+    scope = listing_scope("u1", "moods", None, None)
+    position = {"entry_id": "e1", "timestamp": "2024-01-01T00:00:00", "user_id": "u1"}
+    cursor = encode_cursor(position, scope)
+
+    assert decode_cursor(cursor, scope) == position
+    assert decode_cursor(None, scope) is None
+    for bad_cursor, bad_scope in [
+        (cursor, listing_scope("u2", "moods", None, None)),
+        (cursor, listing_scope("u1", "moods", "2024-01-01", None)),
+        # A forged position under a genuine signature
+        (encode_cursor({**position, "user_id": "u2"}, scope).split(".")[0] + "." + cursor.split(".")[1], scope),
+        ("not-a-cursor", scope),
+    ]:
+        with pytest.raises(AppException) as error:
+            decode_cursor(bad_cursor, bad_scope)
+        assert error.value.status_code == 400
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_time_ordered_pages_cover_every_item_once(repos):
+    # Pairs of entries share a timestamp, so ties must not break paging
+    for number in range(7):
+        await repos.moods.create("u1", {"mood_rating": number, "timestamp": f"2024-01-0{number // 2 + 1}T00:00:00"})
+    await repos.moods.create("u2", {"mood_rating": 1, "timestamp": "2024-01-02T00:00:00"})
+
+    pages = await _read_all(repos.moods, 3)
+    items = [item for page in pages for item in page]
+
+    assert [len(page) for page in pages[:3]] == [3, 3, 1]
+    assert len({item["entry_id"] for item in items}) == 7
+    assert [item["timestamp"] for item in items] == sorted((item["timestamp"] for item in items), reverse=True)
+
+    ranged = await _read_all(repos.moods, 2, start="2024-01-02T00:00:00", end="2024-01-03T00:00:00", newest_first=False)
+    ratings = [item["mood_rating"] for page in ranged for item in page]
+    assert sorted(ratings) == [2, 3, 4, 5]
+    assert [rating // 2 for rating in ratings] == [1, 1, 2, 2]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_unordered_pages_cover_every_item_once(repos):
+    for number in range(5):
+        await repos.medications.create("u1", {"name": f"Medication {number}"})
+
+    pages = await _read_all(repos.medications, 2)
+
+    assert sorted(item["name"] for page in pages for item in page) == [f"Medication {number}" for number in range(5)]
+    assert all(len(page) <= 2 for page in pages)
+
+
+@pytest.mark.unit
+def test_list_endpoint_returns_next_cursor(tmp_path):
+    from backend.main import app
+
+    repos = sqlite_repositories.create_repositories(str(tmp_path / "pages.db"))
+    client = TestClient(app)
+    app.dependency_overrides[get_current_user] = lambda: {"user_id": "u1"}
+    try:
+        with patch.object(mood_service, "mood_repository", repos.moods), \
+             patch.object(mood_service, "version_repository", repos.versions):
+            for day in range(1, 6):
+                client.post("/api/moods", json={"mood_rating": day, "timestamp": f"2024-01-0{day}T00:00:00"})
+
+            first = client.get("/api/moods", params={"limit": 2})
+            second = client.get("/api/moods", params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]})
+            last = client.get("/api/moods", params={"limit": 2, "cursor": second.headers["X-Next-Cursor"]})
+            tampered = client.get("/api/moods", params={"limit": 2, "cursor": first.headers["X-Next-Cursor"][::-1]})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert [entry["mood_rating"] for entry in first.json()] == [5, 4]
+    assert [entry["mood_rating"] for entry in second.json()] == [3, 2]
+    assert [entry["mood_rating"] for entry in last.json()] == [1]
+    assert "X-Next-Cursor" not in last.headers
+    assert tampered.status_code == 400
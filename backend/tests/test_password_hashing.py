@@ -0,0 +1,80 @@
+"""
+Tests for bcrypt hashing on the password pool.
+"""
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from backend.config import settings
+from backend.core import security
+from backend.core.exceptions import ServiceUnavailableException
+from backend.repositories import sqlite as sqlite_repositories
+from backend.services import auth_service
+
+
+@pytest.fixture
+def pool(request):
+    """A fresh hashing pool of the requested kind (threads by default) at a cheap fixed cost."""
+    executor = getattr(request, "param", "thread")
+    security.shutdown_password_pool()
+    with patch.object(settings, "PASSWORD_HASH_EXECUTOR", executor), \
+         patch.object(settings, "PASSWORD_HASH_WORKERS", 2), \
+         patch.object(settings, "BCRYPT_ROUNDS", 5):
+        yield
+    security.shutdown_password_pool()
+
+
+@pytest.mark.unit
+def test_tuning_stays_within_bounds():
+    assert security.tune_bcrypt_rounds(target_ms=0) == security.BCRYPT_MIN_ROUNDS
+    assert security.tune_bcrypt_rounds(target_ms=10 ** 9) == security.BCRYPT_MAX_ROUNDS
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+@pytest.mark.parametrize("pool", ["thread", "process"], indirect=True)
+async def test_hash_and_verify_on_the_pool(pool):
+    password_hash = await security.hash_password("s3cret-pw")
+
+    assert password_hash.startswith("$2b$05$")
+    assert await security.verify_and_update_password("s3cret-pw", password_hash) == (True, None)
+    assert await security.verify_and_update_password("wrong", password_hash) == (False, None)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_only_cheaper_hashes_are_upgraded(pool):
+    cheaper = security._context(4).hash("pw")
+    costlier = security._context(6).hash("pw")
+
+    valid, new_hash = await security.verify_and_update_password("pw", cheaper)
+    assert valid and new_hash.startswith("$2b$05$")
+    assert await security.verify_and_update_password("pw", costlier) == (True, None)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_pending_limit_rejects_with_503(pool):
+    with patch.object(settings, "PASSWORD_HASH_MAX_PENDING", 2):
+        results = await asyncio.gather(
+            *(security.hash_password("pw") for _ in range(3)),
+            return_exceptions=True
+        )
+
+    rejected = [result for result in results if isinstance(result, Exception)]
+    assert len(rejected) == 1
+    assert isinstance(rejected[0], ServiceUnavailableException)
+    assert rejected[0].status_code == 503
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_login_rehashes_a_cheaper_password_hash(pool, tmp_path):
+    users = sqlite_repositories.create_repositories(str(tmp_path / "auth.db")).users
+    user = await users.create({"email": "a@example.com", "password_hash": security._context(4).hash("pw")})
+
+    with patch.object(auth_service, "user_repository", users):
+        authenticated = await auth_service.authenticate_user("a@example.com", "pw")
+
+    assert "password_hash" not in authenticated
+    assert (await users.get(user["user_id"]))["password_hash"].startswith("$2b$05$")
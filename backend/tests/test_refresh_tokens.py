@@ -0,0 +1,105 @@
+"""
+Tests for rotating, revocable refresh-token sessions.
+"""
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from backend.core.exceptions import AuthException
+from backend.core.security import decode_access_token
+from backend.core.utils import get_current_timestamp
+from backend.db import dynamodb
+from backend.db.memory import MemoryDynamoDB
+from backend.db.tables import TABLE_DEFINITIONS
+from backend.repositories import dynamodb as dynamodb_repositories
+from backend.repositories import sqlite as sqlite_repositories
+from backend.services import auth_service
+
+
+@pytest.fixture(params=["dynamodb", "sqlite"])
+def repos(request, tmp_path):
+    if request.param == "dynamodb":
+        resource = MemoryDynamoDB(TABLE_DEFINITIONS)
+        with patch.object(dynamodb, "dynamodb", resource), \
+             patch.object(dynamodb, "users_table", resource.Table("Users")):
+            yield dynamodb_repositories.create_repositories(resource)
+    else:
+        yield sqlite_repositories.create_repositories(str(tmp_path / "sessions.db"))
+
+
+@pytest.fixture
+def sessions(repos):
+    with patch.object(auth_service, "session_repository", repos.sessions):
+        yield repos.sessions
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_refresh_rotates_the_token(sessions):
+    refresh_token = await auth_service.create_refresh_token("u1", "u1@example.com")
+
+    tokens = await auth_service.refresh_session(refresh_token)
+
+    assert decode_access_token(tokens["access_token"])["sub"] == "u1"
+    assert decode_access_token(tokens["access_token"])["email"] == "u1@example.com"
+    assert tokens["refresh_token"] != refresh_token
+    assert tokens["refresh_token"].split(".")[0] == refresh_token.split(".")[0]
+    assert (await auth_service.refresh_session(tokens["refresh_token"]))["access_token"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_reusing_a_rotated_token_ends_the_session(sessions):
+    refresh_token = await auth_service.create_refresh_token("u1")
+    rotated = (await auth_service.refresh_session(refresh_token))["refresh_token"]
+
+    with pytest.raises(AuthException):
+        await auth_service.refresh_session(refresh_token)
+    # The legitimate holder is logged out as well
+    with pytest.raises(AuthException):
+        await auth_service.refresh_session(rotated)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_expired_and_revoked_sessions_are_rejected(sessions):
+    valid = await auth_service.create_refresh_token("u1")
+    revoked = await auth_service.create_refresh_token("u1")
+    await auth_service.revoke_refresh_token(revoked)
+
+    with patch.object(auth_service, "get_current_timestamp", lambda: get_current_timestamp() - 31 * 86400):
+        stale = await auth_service.create_refresh_token("u1")
+
+    for refresh_token in (stale, revoked, "malformed", f"{valid.split('.')[0]}.wrong"):
+        with pytest.raises(AuthException):
+            await auth_service.refresh_session(refresh_token)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_sessions_stay_out_of_user_lookups(repos):
+    user = await repos.users.create({"email": "u1@example.com", "password_hash": "hash"})
+    with patch.object(auth_service, "session_repository", repos.sessions):
+        await auth_service.create_refresh_token(user["user_id"], user["email"])
+
+    assert [user_id async for user_id in repos.users.iter_ids()] == [user["user_id"]]
+    assert (await repos.users.get_by_email("u1@example.com"))["user_id"] == user["user_id"]
+
+
+@pytest.mark.unit
+def test_refresh_and_logout_endpoints(tmp_path):
+    from backend.main import app
+
+    repos = sqlite_repositories.create_repositories(str(tmp_path / "sessions.db"))
+    client = TestClient(app)
+    with patch.object(auth_service, "session_repository", repos.sessions):
+        refresh_token = asyncio.run(auth_service.create_refresh_token("u1"))
+
+        response = client.post("/api/auth/refresh", json={"refresh_token": refresh_token})
+        assert response.status_code == 200
+        rotated = response.json()["refresh_token"]
+
+        assert client.post("/api/auth/logout", json={"refresh_token": rotated}).status_code == 204
+        assert client.post("/api/auth/refresh", json={"refresh_token": rotated}).status_code == 401
+        assert client.post("/api/auth/refresh").status_code == 401
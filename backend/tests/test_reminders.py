@@ -386,3 +386,30 @@ def test_get_reminder(client: TestClient, auth_headers, mock_db_functions, mock_
     assert_status_code(response, 200)
     assert_json_response(response, ["reminder_id", "user_id", "medication_id", "scheduled_time", "status", "notes", "created_at", "updated_at", "medication"])
     assert response.json()["reminder_id"] == test_reminder_id
+
+@pytest.mark.unit
+@pytest.mark.reminders
+@pytest.mark.asyncio
+async def test_list_reminders_fetches_medications_in_one_batch(mock_user, test_medication_id):
+    """Test that listing reminders joins medications with a single batched read."""
+    from backend.services import reminder_service
+    
+    reminders = [
+        {"reminder_id": f"r{i}", "medication_id": test_medication_id if i % 2 else "other-medication"}
+        for i in range(200)
+    ]
+    medications = [
+        {"medication_id": test_medication_id, "name": "Test Medication"},
+        {"medication_id": "other-medication", "name": "Other Medication"}
+    ]
+    
+    with patch.object(reminder_service.reminder_repository, "list", return_value=reminders), \
+         patch.object(reminder_service.medication_repository, "get_many", return_value=medications) as mock_batch_get, \
+         patch.object(reminder_service.medication_repository, "get") as mock_get_item:
+        result = await reminder_service.list_reminders(mock_user["user_id"])
+    
+    assert mock_batch_get.call_count == 1
+    assert mock_get_item.call_count == 0
+    assert len(mock_batch_get.call_args.args[1]) == 200
+    assert result[0]["medication"]["name"] == "Other Medication"
+    assert result[1]["medication"]["name"] == "Test Medication"
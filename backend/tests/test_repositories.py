@@ -0,0 +1,152 @@
+"""
+Conformance tests shared by the repository implementations.
+
+Every test runs against each backend: DynamoDB (served by the in-process
+stand-in) and SQLite.
+"""
+import pytest
+from unittest.mock import patch
+
+from backend.core.exceptions import ConflictException, NotFoundException
+from backend.db import dynamodb
+from backend.db.memory import MemoryDynamoDB
+from backend.db.tables import TABLE_DEFINITIONS
+from backend.repositories import dynamodb as dynamodb_repositories
+from backend.repositories import sqlite as sqlite_repositories
+
+
+@pytest.fixture(params=["dynamodb", "sqlite"])
+def repos(request, tmp_path):
+    if request.param == "dynamodb":
+        resource = MemoryDynamoDB(TABLE_DEFINITIONS)
+        with patch.object(dynamodb, "dynamodb", resource), \
+             patch.object(dynamodb, "users_table", resource.Table("Users")):
+            yield dynamodb_repositories.create_repositories(resource)
+    else:
+        yield sqlite_repositories.create_repositories(str(tmp_path / "repositories.db"))
+
+
+def _moods(count, day_offset=0):
+    return [
+        {"mood_rating": i % 10 + 1, "timestamp": f"2024-01-{i + 1 + day_offset:02d}T12:00:00"}
+        for i in range(count)
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_create_get_update_delete(repos):
+    created = await repos.moods.create("u1", {"mood_rating": 5, "tags": ["calm"], "timestamp": "2024-01-01T00:00:00"})
+    entry_id = created["entry_id"]
+    assert created["user_id"] == "u1"
+    assert created["created_at"] == created["updated_at"]
+
+    assert await repos.moods.get("u1", entry_id) == created
+    assert await repos.moods.get("u2", entry_id) is None
+    assert await repos.moods.get("u1", entry_id, attributes=["mood_rating", "missing"]) == {"mood_rating": 5}
+
+    updated = await repos.moods.update("u1", entry_id, {"mood_rating": 9, "entry_id": "other", "created_at": 0})
+    assert updated["mood_rating"] == 9
+    assert updated["entry_id"] == entry_id
+    assert updated["created_at"] == created["created_at"]
+    assert (await repos.moods.get("u1", entry_id))["mood_rating"] == 9
+
+    deleted = await repos.moods.delete("u1", entry_id)
+    assert deleted["mood_rating"] == 9
+    assert await repos.moods.get("u1", entry_id) is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_update_and_delete_missing_item(repos):
+    created = await repos.medications.create("u1", {"name": "Medication"})
+
+    with pytest.raises(NotFoundException, match="Medication with ID missing not found"):
+        await repos.medications.update("u1", "missing", {"name": "Other"})
+    with pytest.raises(NotFoundException):
+        await repos.medications.update("u2", created["medication_id"], {"name": "Other"})
+    with pytest.raises(NotFoundException, match="Medication with ID missing not found"):
+        await repos.medications.delete("u1", "missing")
+
+    # Neither the failed update nor the failed delete touched any item
+    assert await repos.medications.get("u2", created["medication_id"]) is None
+    assert await repos.medications.get("u1", created["medication_id"]) == created
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_create_many_and_get_many(repos):
+    result = await repos.medications.create_many("u1", [
+        {"name": f"Medication {i}", "dosage": "10mg"} for i in range(30)
+    ])
+    assert len(result["created"]) == 30
+    assert result["failed"] == []
+
+    ids = [item["medication_id"] for item in result["created"]]
+    fetched = await repos.medications.get_many("u1", ids[:3] + ids[:1] + ["missing"], attributes=["medication_id", "name"])
+    assert sorted(item["medication_id"] for item in fetched) == sorted(ids[:3])
+    assert all(set(item) == {"medication_id", "name"} for item in fetched)
+
+    assert await repos.medications.get_many("u2", ids[:3]) == []
+    assert await repos.medications.get_many("u1", []) == []
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_list_time_ordered_range(repos):
+    await repos.moods.create_many("u1", _moods(10))
+    await repos.moods.create_many("u2", _moods(3))
+
+    newest = await repos.moods.list("u1", limit=3)
+    assert [item["timestamp"][:10] for item in newest] == ["2024-01-10", "2024-01-09", "2024-01-08"]
+
+    in_range = await repos.moods.list(
+        "u1", start="2024-01-03T00:00:00", end="2024-01-05T23:59:59", newest_first=False
+    )
+    assert [item["timestamp"][:10] for item in in_range] == ["2024-01-03", "2024-01-04", "2024-01-05"]
+
+    projected = await repos.moods.list("u1", limit=1, attributes=["mood_rating"])
+    assert projected == [{"mood_rating": 10}]
+
+    assert len(await repos.moods.list("u2")) == 3
+    assert await repos.moods.list("u3") == []
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_list_excludes_items_without_order_field(repos):
+    await repos.chat.create("u1", {"message": "hello", "timestamp": "2024-01-01T00:00:00"})
+    await repos.chat.create("u1", {"message": "no timestamp"})
+
+    assert [item["message"] for item in await repos.chat.list("u1")] == ["hello"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_list_unordered_collection(repos):
+    await repos.medications.create_many("u1", [{"name": f"Medication {i}"} for i in range(5)])
+    await repos.medications.create("u2", {"name": "Other"})
+
+    medications = await repos.medications.list("u1", attributes=["name"])
+    assert sorted(item["name"] for item in medications) == [f"Medication {i}" for i in range(5)]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_users(repos):
+    user = await repos.users.create({"email": "a@example.com", "password_hash": "hash", "name": "A"})
+    assert user["email"] == "a@example.com"
+
+    assert await repos.users.get(user["user_id"]) == user
+    assert await repos.users.get(user["user_id"], attributes=["name"]) == {"name": "A"}
+    assert (await repos.users.get_by_email("a@example.com"))["user_id"] == user["user_id"]
+    assert await repos.users.get_by_email("b@example.com") is None
+    assert await repos.users.get("missing") is None
+
+    with pytest.raises(ConflictException):
+        await repos.users.create({"email": "a@example.com", "password_hash": "other"})
+
+    updated = await repos.users.update(user["user_id"], {"name": "B", "email": "c@example.com"})
+    assert updated["name"] == "B"
+    assert updated["email"] == "a@example.com"
+    assert (await repos.users.get_by_email("a@example.com"))["name"] == "B"
@@ -0,0 +1,163 @@
+"""
+Tests for the request-scoped identity map of the data layer.
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from backend.core.metrics import metrics
+from backend.core.middleware import RequestCacheMiddleware
+from backend.db import dynamodb
+from backend.db.memory import MemoryDynamoDB
+from backend.db.request_cache import current_cache, request_cache_scope
+from backend.db.tables import TABLE_DEFINITIONS
+
+
+class CountingTable:
+    """Wraps a stand-in table and counts the calls made to it."""
+
+    def __init__(self, table):
+        self.table = table
+        self.name = table.name
+        self.calls = []
+
+    def __getattr__(self, operation):
+        method = getattr(self.table, operation)
+
+        def call(*args, **kwargs):
+            self.calls.append(operation)
+            return method(*args, **kwargs)
+        return call
+
+
+@pytest.fixture
+def resource():
+    return MemoryDynamoDB(TABLE_DEFINITIONS)
+
+
+@pytest.fixture
+def medications(resource):
+    table = CountingTable(resource.Table("Medications"))
+    for i in range(3):
+        table.table.put_item(Item={"medication_id": f"m{i}", "user_id": "u1", "name": f"Medication {i}"})
+    return table
+
+
+def _counter(name):
+    return metrics.snapshot().get(name, 0)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_repeated_get_item_is_served_from_cache(medications):
+    avoided = _counter("dynamodb_round_trips_avoided")
+    with request_cache_scope():
+        first = await dynamodb.get_item(medications, "m0", "medication_id", "u1", "user_id")
+        first["name"] = "changed by caller"
+        second = await dynamodb.get_item(medications, "m0", "medication_id", "u1", "user_id")
+        projected = await dynamodb.get_item(medications, "m0", "medication_id", "u1", "user_id", attributes=["name"])
+        missing = await dynamodb.get_item(medications, "nope", "medication_id", "u1", "user_id")
+        missing_again = await dynamodb.get_item(medications, "nope", "medication_id", "u1", "user_id")
+
+    assert medications.calls == ["get_item", "get_item"]
+    assert second["name"] == "Medication 0"
+    assert projected == {"name": "Medication 0"}
+    assert missing is None and missing_again is None
+    assert _counter("dynamodb_round_trips_avoided") - avoided == 3
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_no_caching_outside_a_request(medications):
+    await dynamodb.get_item(medications, "m0", "medication_id", "u1", "user_id")
+    await dynamodb.get_item(medications, "m0", "medication_id", "u1", "user_id")
+
+    assert medications.calls == ["get_item", "get_item"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_query_results_answer_later_reads(medications):
+    with request_cache_scope():
+        listed = await dynamodb.query_items(medications, "user_id = :user_id", {":user_id": "u1"}, "UserIdIndex")
+        again = await dynamodb.query_items(medications, "user_id = :user_id", {":user_id": "u1"}, "UserIdIndex")
+        fetched = await dynamodb.batch_get_items(medications, [
+            {"medication_id": f"m{i}", "user_id": "u1"} for i in range(3)
+        ])
+        single = await dynamodb.get_item(medications, "m1", "medication_id", "u1", "user_id")
+
+    assert medications.calls == ["query"]
+    assert again == listed
+    assert sorted(item["medication_id"] for item in fetched) == ["m0", "m1", "m2"]
+    assert single["name"] == "Medication 1"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_batch_get_fetches_only_uncached_keys(resource, medications):
+    requested = []
+    batch_get_item = resource.batch_get_item
+
+    def counting_batch_get_item(RequestItems, **kwargs):
+        requested.extend(RequestItems["Medications"]["Keys"])
+        return batch_get_item(RequestItems=RequestItems, **kwargs)
+
+    keys = [{"medication_id": f"m{i}", "user_id": "u1"} for i in range(3)] + [{"medication_id": "gone", "user_id": "u1"}]
+    with patch.object(dynamodb, "dynamodb", resource), \
+         patch.object(resource, "batch_get_item", side_effect=counting_batch_get_item):
+        with request_cache_scope():
+            await dynamodb.get_item(medications, "m0", "medication_id", "u1", "user_id")
+            first = await dynamodb.batch_get_items(medications, keys)
+            second = await dynamodb.batch_get_items(medications, keys)
+
+    assert len(requested) == 3
+    assert sorted(item["medication_id"] for item in first) == ["m0", "m1", "m2"]
+    assert sorted(item["medication_id"] for item in second) == ["m0", "m1", "m2"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_writes_invalidate_the_table(medications):
+    with request_cache_scope():
+        await dynamodb.get_item(medications, "m0", "medication_id", "u1", "user_id")
+        await dynamodb.query_items(medications, "user_id = :user_id", {":user_id": "u1"}, "UserIdIndex")
+        await dynamodb.update_item(medications, "m0", "medication_id", {"dosage": "20mg"}, "u1", "user_id")
+
+        item = await dynamodb.get_item(medications, "m0", "medication_id", "u1", "user_id")
+        await dynamodb.create_item(medications, {"user_id": "u1", "name": "New"}, "medication_id", "user_id")
+        listed = await dynamodb.query_items(medications, "user_id = :user_id", {":user_id": "u1"}, "UserIdIndex")
+
+    assert item["dosage"] == "20mg"
+    assert len(listed) == 4
+    assert medications.calls == ["get_item", "query", "update_item", "get_item", "put_item", "query"]
+
+
+@pytest.mark.unit
+def test_middleware_gives_each_request_its_own_cache():
+    app = FastAPI()
+    app.add_middleware(RequestCacheMiddleware)
+    seen = []
+
+    @app.get("/cache")
+    async def cache_endpoint():
+        seen.append(current_cache())
+        return {}
+
+    client = TestClient(app)
+    client.get("/cache")
+    client.get("/cache")
+
+    assert seen[0] is not None and seen[1] is not None
+    assert seen[0] is not seen[1]
+    assert current_cache() is None
+
+
+@pytest.mark.unit
+def test_metrics_endpoint_reports_counters():
+    from backend.main import app
+
+    response = TestClient(app).get("/api/metrics")
+
+    assert response.status_code == 200
+    assert "dynamodb_round_trips_avoided" in response.json()
@@ -0,0 +1,64 @@
+"""
+Tests for the fast JSON response encoding.
+"""
+import json
+import pytest
+from decimal import Decimal
+from typing import List
+from fastapi import Response
+from unittest.mock import patch
+
+from backend.core import responses
+from backend.core.responses import FastJSONResponse, dumps, model_response, serialize, type_adapter
+from backend.schemas.mood import MoodResponse
+
+ITEM = {
+    "entry_id": "e1",
+    "user_id": "u1",
+    "mood_rating": Decimal("7"),
+    "timestamp": "2024-01-01T00:00:00",
+    "created_at": Decimal("1700000000"),
+    "updated_at": Decimal("1700000000"),
+    "expires_at": 1800000000,
+}
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("encoder", ["orjson", "stdlib"])
+def test_dumps_encodes_dynamodb_items(encoder):
+    content = {"rating": Decimal("7"), "score": Decimal("2.5"), "tags": {"calm", "anxious"}, 1: "ü"}
+
+    with patch.object(responses, "orjson", responses.orjson if encoder == "orjson" else None):
+        body = dumps(content)
+
+    assert json.loads(body) == {"rating": 7, "score": 2.5, "tags": ["anxious", "calm"], "1": "ü"}
+    assert b" " not in body
+    with pytest.raises(TypeError):
+        dumps({"value": object()})
+
+
+@pytest.mark.unit
+def test_fast_response_matches_the_stdlib_response():
+    content = [{"message": "héllo", "count": 3, "nested": {"ok": True, "none": None}}]
+
+    assert json.loads(FastJSONResponse(content).body) == content
+    assert FastJSONResponse(content).headers["content-type"] == "application/json"
+
+
+@pytest.mark.unit
+def test_model_response_validates_against_the_response_model():
+    cursor = Response()
+    cursor.headers["X-Next-Cursor"] = "next"
+
+    response = model_response(List[MoodResponse], [ITEM], cursor)
+
+    # Numbers are coerced, unknown attributes dropped and defaults filled in
+    assert json.loads(response.body) == [{
+        "entry_id": "e1", "user_id": "u1", "mood_rating": 7, "tags": None, "notes": None,
+        "timestamp": "2024-01-01T00:00:00", "created_at": 1700000000, "updated_at": 1700000000,
+    }]
+    assert response.headers["X-Next-Cursor"] == "next"
+    assert response.media_type == "application/json"
+    assert type_adapter(List[MoodResponse]) is type_adapter(List[MoodResponse])
+    with pytest.raises(ValueError):
+        serialize(List[MoodResponse], [{**ITEM, "mood_rating": 11}])
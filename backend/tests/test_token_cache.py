@@ -0,0 +1,64 @@
+"""
+Tests for the cache of verified access tokens.
+"""
+import pytest
+from unittest.mock import patch
+
+from backend.config import settings
+from backend.core import security
+from backend.core.exceptions import AuthException
+from backend.core.security import VerifiedTokenCache, create_access_token, decode_access_token
+
+
+@pytest.fixture
+def jwt_decode():
+    """Count signature verifications, starting from an empty cache."""
+    security.verified_tokens.clear()
+    with patch.object(security.jwt, "decode", wraps=security.jwt.decode) as decode:
+        yield decode
+    security.verified_tokens.clear()
+
+
+@pytest.mark.unit
+def test_tokens_are_verified_once_until_they_expire(jwt_decode):
+    token = create_access_token({"sub": "u1"})
+
+    claims = decode_access_token(token)
+    claims["sub"] = "changed by caller"
+    assert decode_access_token(token)["sub"] == "u1"
+    assert jwt_decode.call_count == 1
+
+    # Once its exp has passed the token goes back to python-jose, which checks it
+    with patch.object(security.time, "time", return_value=claims["exp"]):
+        decode_access_token(token)
+    assert jwt_decode.call_count == 2
+
+
+@pytest.mark.unit
+def test_cached_claims_follow_the_secret_key(jwt_decode):
+    token = create_access_token({"sub": "u1"})
+    decode_access_token(token)
+
+    with patch.object(settings, "SECRET_KEY", "rotated"), pytest.raises(AuthException):
+        decode_access_token(token)
+
+
+@pytest.mark.unit
+def test_invalid_tokens_are_not_cached(jwt_decode):
+    for _ in range(2):
+        with pytest.raises(AuthException):
+            decode_access_token("not-a-token")
+    assert jwt_decode.call_count == 2
+
+
+@pytest.mark.unit
+def test_cache_is_bounded():
+    cache = VerifiedTokenCache(max_entries=2)
+    for token in ("a", "b", "c"):
+        cache.set(token, {"sub": token, "exp": 4102444800})
+    cache.set("no-exp", {"sub": "x"})
+
+    assert cache.get("a") is None
+    assert cache.get("b") == {"sub": "b", "exp": 4102444800}
+    assert cache.get("c") is not None
+    assert cache.get("no-exp") is None
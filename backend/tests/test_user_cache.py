@@ -0,0 +1,104 @@
+"""
+Tests for the authenticated-user cache and token-claim authentication.
+"""
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from backend.config import settings
+from backend.core import dependencies, user_cache as user_cache_module
+from backend.core.dependencies import get_current_user, get_current_user_profile
+from backend.core.security import create_access_token
+from backend.core.user_cache import UserCache, user_cache
+from backend.repositories import sqlite as sqlite_repositories
+from backend.services import auth_service
+
+
+@pytest.fixture
+def users(tmp_path):
+    """SQLite user repository used by the dependencies and auth service, counting reads."""
+    users = sqlite_repositories.create_repositories(str(tmp_path / "users.db")).users
+    users.reads = 0
+    get = users.get
+
+    async def counting_get(user_id, attributes=None):
+        users.reads += 1
+        return await get(user_id, attributes)
+
+    users.get = counting_get
+    with patch.object(dependencies, "user_repository", users), \
+         patch.object(auth_service, "user_repository", users):
+        yield users
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.get("/user")
+    async def current(current_user: dict = Depends(get_current_user)):
+        return current_user
+
+    @app.get("/profile")
+    async def profile(current_user: dict = Depends(get_current_user_profile)):
+        return current_user
+
+    return TestClient(app)
+
+
+async def _user_and_headers(users):
+    user = await users.create({"email": "a@example.com", "password_hash": "hash", "name": "A"})
+    token = await auth_service.create_user_token(user["user_id"], user["email"])
+    return user, {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.unit
+def test_user_cache_expires_and_evicts():
+    cache = UserCache(ttl=10, max_entries=2)
+    now = [1000.0]
+    with patch.object(user_cache_module.time, "monotonic", lambda: now[0]):
+        assert cache.set({"user_id": "u1", "password_hash": "hash"}) == {"user_id": "u1"}
+        cache.set({"user_id": "u2"})
+        assert cache.get("u1") == {"user_id": "u1"}
+        cache.set({"user_id": "u3"})
+
+        assert cache.get("u2") is None
+        assert cache.get("u1") is not None
+
+        now[0] += 11
+        assert cache.get("u1") is None
+        assert UserCache(ttl=0, max_entries=10).get("u1") is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_current_user_is_read_once_and_invalidated_by_updates(users, client):
+    user, headers = await _user_and_headers(users)
+
+    assert client.get("/user", headers=headers).json()["name"] == "A"
+    response = client.get("/user", headers=headers).json()
+    assert response["name"] == "A" and "password_hash" not in response
+    assert users.reads == 1
+
+    await auth_service.update_user_profile(user["user_id"], {"name": "B"})
+    assert client.get("/user", headers=headers).json()["name"] == "B"
+
+    user_cache.invalidate(user["user_id"])
+    await users.update(user["user_id"], {"name": "C"})
+    assert client.get("/user", headers=headers).json()["name"] == "C"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_trusted_token_claims_skip_the_read(users, client):
+    user, headers = await _user_and_headers(users)
+
+    with patch.object(settings, "AUTH_TRUST_TOKEN_CLAIMS", True):
+        assert client.get("/user", headers=headers).json() == {"user_id": user["user_id"], "email": "a@example.com"}
+        assert users.reads == 0
+        assert client.get("/profile", headers=headers).json()["name"] == "A"
+        assert users.reads == 1
+
+        legacy = create_access_token({"sub": user["user_id"]})
+        assert client.get("/user", headers={"Authorization": f"Bearer {legacy}"}).json()["email"] is None
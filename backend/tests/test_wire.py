@@ -0,0 +1,71 @@
+"""
+Tests for the fast wire-format read path.
+"""
+import pytest
+from decimal import Decimal
+from boto3.dynamodb.types import Binary, TypeDeserializer, TypeSerializer
+from unittest.mock import patch
+
+from backend.config import settings
+from backend.db import dynamodb, memory, wire
+from backend.db.memory import MemoryDynamoDB
+from backend.db.tables import TABLE_DEFINITIONS
+
+
+@pytest.fixture
+def resource():
+    resource = MemoryDynamoDB(TABLE_DEFINITIONS)
+    with patch.object(dynamodb, "dynamodb", resource):
+        yield resource
+
+
+@pytest.mark.unit
+def test_deserialize_item_matches_type_deserializer():
+    item = {
+        "entry_id": "e1",
+        "mood_rating": Decimal(7),
+        "score": Decimal("0.25"),
+        "tags": ["calm", "rested"],
+        "details": {"nested": [Decimal(1), True, None]},
+        "labels": {"a", "b"},
+        "counts": {Decimal(1), Decimal(2)},
+        "blob": Binary(b"\x00\x01"),
+    }
+    wire_item = {name: TypeSerializer().serialize(value) for name, value in item.items()}
+
+    assert wire.deserialize_item(wire_item, {}) == {
+        name: TypeDeserializer().deserialize(value) for name, value in wire_item.items()
+    }
+
+    typed = wire.deserialize_item(wire_item, wire.NUMERIC_FIELDS["MoodEntries"])
+    assert typed["mood_rating"] == 7 and type(typed["mood_rating"]) is int
+    assert type(typed["score"]) is Decimal
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_fast_reads_return_the_same_items(resource):
+    for day in range(1, 21):
+        resource.Table("MoodEntries").put_item(Item={
+            "entry_id": f"e{day:02d}", "user_id": "u1", "mood_rating": day % 10 + 1,
+            "tags": ["calm"], "timestamp": f"2024-01-{day:02d}T12:00:00", "created_at": 1700000000 + day
+        })
+
+    async def read(**kwargs):
+        return await dynamodb.query_user_range(
+            dynamodb.mood_entries_table, "UserTimestampIndex", "timestamp", "u1",
+            start="2024-01-05T00:00:00", **kwargs
+        )
+
+    with patch.object(memory, "MAX_PAGE_BYTES", 500):
+        slow = await read()
+        with patch.object(settings, "DYNAMODB_FAST_READS", True):
+            fast = await read()
+            projected = await read(attributes=["mood_rating", "timestamp"], limit=3)
+
+    assert len(fast) == 16
+    assert fast == slow
+    assert all(type(item["mood_rating"]) is int and type(item["created_at"]) is int for item in fast)
+    assert projected == [
+        {"mood_rating": item["mood_rating"], "timestamp": item["timestamp"]} for item in slow[:3]
+    ]
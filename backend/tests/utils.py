@@ -6,6 +6,7 @@ import logging
 from typing import Dict, Any, List, Optional, Callable
 from fastapi.testclient import TestClient
 from unittest.mock import MagicMock
+from backend.core.exceptions import NotFoundException
 
 logger = logging.getLogger("api_tests")
 
@@ -99,6 +100,10 @@ def setup_mock_db_update_item(mock_db_functions, mock_item):
     """Set up the mock database function to return the mock item on update."""
     mock_db_functions["update_item"].return_value = mock_item
 
+def setup_mock_db_update_item_not_found(mock_db_functions):
+    """Set up the mock database function to fail the conditional update of a missing item."""
+    mock_db_functions["update_item"].side_effect = NotFoundException()
+
 def setup_mock_db_query_items(mock_db_functions, mock_items):
     """Set up the mock database function to return the mock items on query."""
     mock_db_functions["query_items"].return_value = mock_items
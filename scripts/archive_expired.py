@@ -0,0 +1,23 @@
+"""
+Script to archive expired chat history and feedback to S3.
+
+Moves items older than CHAT_HISTORY_RETENTION_DAYS / FEEDBACK_RETENTION_DAYS
+into date-partitioned, gzipped JSON lines objects under ARCHIVE_PREFIX and
+deletes them from the hot tables. Meant to run from cron; it is safe to
+re-run after a failure.
+"""
+import asyncio
+import os
+import sys
+from dotenv import load_dotenv
+
+# Add the parent directory to the path so we can import from the backend package
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+load_dotenv()
+
+from backend.services.archive_service import archive_all
+
+if __name__ == "__main__":
+    for table, stats in asyncio.run(archive_all()).items():
+        print(f"{table}: {stats['archived']} items archived in {stats['objects']} objects, {stats['failed']} failed")
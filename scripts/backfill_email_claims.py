@@ -0,0 +1,72 @@
+"""
+Script to create email-claim items for existing users.
+
+Registration reserves each email with a conditional write on an
+``email#<address>`` item in the Users table. Users created before that
+change have no claim, so this script scans the table and writes the missing
+claims. It is idempotent and can be re-run safely.
+"""
+import boto3
+import os
+import sys
+from dotenv import load_dotenv
+
+# Add the parent directory to the path so we can import from the backend package
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+load_dotenv()
+
+# AWS settings
+aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID")
+aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY")
+aws_region = os.getenv("AWS_REGION", "us-east-1")
+dynamodb_endpoint = os.getenv("DYNAMODB_ENDPOINT")
+
+# Initialize DynamoDB client
+dynamodb_kwargs = {
+    "region_name": aws_region,
+    "aws_access_key_id": aws_access_key_id,
+    "aws_secret_access_key": aws_secret_access_key,
+}
+if dynamodb_endpoint:
+    dynamodb_kwargs["endpoint_url"] = dynamodb_endpoint
+
+dynamodb = boto3.resource("dynamodb", **dynamodb_kwargs)
+users_table = dynamodb.Table("Users")
+
+def backfill_email_claims() -> None:
+    """Write an email claim for every user that does not have one."""
+    created = 0
+    duplicates = []
+    scan_kwargs = {"FilterExpression": "attribute_exists(email)"}
+
+    while True:
+        response = users_table.scan(**scan_kwargs)
+        for user in response.get("Items", []):
+            claim_key = f"email#{user['email']}"
+            try:
+                users_table.put_item(
+                    Item={
+                        "user_id": claim_key,
+                        "owner_user_id": user["user_id"],
+                        "created_at": user.get("created_at", 0)
+                    },
+                    ConditionExpression="attribute_not_exists(user_id) OR owner_user_id = :owner",
+                    ExpressionAttributeValues={":owner": user["user_id"]}
+                )
+                created += 1
+            except users_table.meta.client.exceptions.ConditionalCheckFailedException:
+                # Another user already holds this email
+                duplicates.append((user["email"], user["user_id"]))
+
+        last_evaluated_key = response.get("LastEvaluatedKey")
+        if not last_evaluated_key:
+            break
+        scan_kwargs["ExclusiveStartKey"] = last_evaluated_key
+
+    print(f"Wrote {created} email claims")
+    for email, user_id in duplicates:
+        print(f"Duplicate email {email} on user {user_id} needs manual review")
+
+if __name__ == "__main__":
+    backfill_email_claims()
@@ -0,0 +1,131 @@
+"""
+Load-test the API end to end against the in-process DynamoDB stand-in.
+
+Seeds the memory backend (``DYNAMODB_BACKEND=memory``) with users, mood
+entries, journal entries and reminders, then drives the read endpoints
+concurrently through the ASGI app and reports throughput and latency
+percentiles per endpoint. No network access or AWS credentials are needed.
+Set ``REPOSITORY_BACKEND=sqlite`` to benchmark the SQLite repositories instead.
+
+Usage:
+    python -m scripts.benchmarks.bench_api --users 50 --entries 1000 --requests 500 --concurrency 50
+    REPOSITORY_BACKEND=sqlite SQLITE_PATH=/tmp/bench.db python -m scripts.benchmarks.bench_api
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# Must be set before the data layer is imported
+os.environ.setdefault("DYNAMODB_BACKEND", "memory")
+
+import httpx
+
+from backend.core.security import create_access_token, get_password_hash
+from backend.main import app
+from backend.repositories import repositories
+
+ENDPOINTS = [
+    "/api/auth/me",
+    "/api/moods?limit=50",
+    "/api/moods/stats",
+    "/api/journal?limit=20",
+    "/api/reminders/today",
+    "/api/medications",
+]
+
+
+async def seed(users: int, entries: int) -> list:
+    """Create ``users`` users with ``entries`` mood and journal entries each; return their tokens."""
+    password_hash = get_password_hash("benchmark-password")
+    now = datetime.utcnow()
+    tokens = []
+    for i in range(users):
+        user = await repositories.users.create({"email": f"user{i}@example.com", "password_hash": password_hash})
+        user_id = user["user_id"]
+        tokens.append(create_access_token({"sub": user_id}))
+
+        timestamps = [(now - timedelta(hours=h)).isoformat() for h in range(entries)]
+        await repositories.moods.create_many(user_id, [
+            {"timestamp": ts, "mood_rating": random.randint(1, 10),
+             "tags": random.sample(["calm", "tired", "happy", "anxious", "focused"], 2)}
+            for ts in timestamps
+        ])
+        await repositories.journals.create_many(user_id, [
+            {"timestamp": ts, "title": "Entry", "content": "Lorem ipsum " * 40}
+            for ts in timestamps
+        ])
+
+        medications = await repositories.medications.create_many(user_id, [
+            {"name": f"Medication {m}", "dosage": "10mg", "frequency": "daily",
+             "start_date": now.date().isoformat()}
+            for m in range(3)
+        ])
+        await repositories.reminders.create_many(user_id, [
+            {"medication_id": medication["medication_id"], "status": "pending",
+             "scheduled_time": (now.replace(hour=8) + timedelta(hours=4 * m)).isoformat()}
+            for m, medication in enumerate(medications["created"])
+        ])
+    return tokens
+
+
+async def run(endpoint: str, tokens: list, requests: int, concurrency: int) -> dict:
+    """Issue ``requests`` GETs to ``endpoint`` with at most ``concurrency`` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def one(i: int):
+            nonlocal errors
+            headers = {"Authorization": f"Bearer {tokens[i % len(tokens)]}"}
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(endpoint, headers=headers)
+                latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "rps": requests / elapsed,
+        "p50": quantiles[49] * 1000,
+        "p95": quantiles[94] * 1000,
+        "p99": quantiles[98] * 1000,
+        "errors": errors,
+    }
+
+
+async def main_async(args):
+    start = time.perf_counter()
+    tokens = await seed(args.users, args.entries)
+    print(f"Seeded {args.users} users x {args.entries} entries in {time.perf_counter() - start:.1f}s")
+    print(f"{'endpoint':<26}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for endpoint in ENDPOINTS:
+        result = await run(endpoint, tokens, args.requests, args.concurrency)
+        print(f"{endpoint:<26}{result['rps']:>10.1f}{result['p50']:>10.2f}"
+              f"{result['p95']:>10.2f}{result['p99']:>10.2f}{result['errors']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--entries", type=int, default=1000, help="Mood and journal entries per user")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=50)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Benchmark connection pooling of the DynamoDB client under concurrency.
+
+Runs waves of concurrent ``backend.db.dynamodb.get_item`` calls against a
+local stub of the DynamoDB HTTP API (pointed at via ``DYNAMODB_ENDPOINT``),
+once with a client on default botocore settings (10 pooled connections) and
+once with the client from ``backend.db.aws`` (pool sized to
+``DYNAMODB_MAX_WORKERS``). For each it reports throughput, latency and how
+many TCP connections the stub saw and how many pooled connections urllib3
+discarded because the pool was full.
+
+Usage:
+    python -m scripts.benchmarks.bench_client_pool --requests 200 --waves 5 --latency 0.01
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+
+import boto3
+from botocore.config import Config
+
+from backend.config import settings
+from backend.db import aws, dynamodb
+
+
+class StubDynamoDB(ThreadingHTTPServer):
+    """Answers every DynamoDB call with an item after ``latency`` seconds."""
+
+    daemon_threads = True
+
+    def __init__(self, latency: float):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.latency = latency
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def count_connection(self) -> None:
+        with self._lock:
+            self.connections += 1
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.count_connection()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.server.latency)
+        body = json.dumps({"Item": {"entry_id": {"S": "e"}, "user_id": {"S": "u"}}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-amz-json-1.0")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class DiscardCounter(logging.Handler):
+    """Counts urllib3's "Connection pool is full, discarding connection" warnings."""
+
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.discarded = 0
+
+    def emit(self, record):
+        if "Connection pool is full" in record.getMessage():
+            self.discarded += 1
+
+
+async def timed_get(table, i: int) -> float:
+    start = time.perf_counter()
+    await dynamodb.get_item(table, str(i), "entry_id", "u", "user_id")
+    return time.perf_counter() - start
+
+
+async def run_waves(resource, requests: int, waves: int):
+    table = resource.Table("MoodEntries")
+    latencies = []
+    start = time.perf_counter()
+    with patch.object(dynamodb, "dynamodb", resource):
+        for _ in range(waves):
+            latencies += await asyncio.gather(*(timed_get(table, i) for i in range(requests)))
+    return requests * waves / (time.perf_counter() - start), latencies
+
+
+def measure(label: str, resource, server: StubDynamoDB, requests: int, waves: int) -> None:
+    counter = DiscardCounter()
+    pool_logger = logging.getLogger("urllib3.connectionpool")
+    pool_logger.addHandler(counter)
+    connections_before = server.connections
+    try:
+        throughput, latencies = asyncio.run(run_waves(resource, requests, waves))
+    finally:
+        pool_logger.removeHandler(counter)
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"  {label:<24} {throughput:8.1f} req/s   p50 {quantiles[49] * 1000:7.1f} ms   "
+          f"p99 {quantiles[98] * 1000:7.1f} ms   "
+          f"{server.connections - connections_before:5d} connections   {counter.discarded:5d} discarded")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200, help="Concurrent requests per wave")
+    parser.add_argument("--waves", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.01, help="Simulated service time in seconds")
+    args = parser.parse_args()
+
+    server = StubDynamoDB(args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    settings.DYNAMODB_ENDPOINT = server.url
+    aws.reset()
+
+    kwargs = aws.client_kwargs("dynamodb", settings.DYNAMODB_MAX_WORKERS)
+    default_resource = boto3.resource("dynamodb", **{**kwargs, "config": Config()})
+    factory_resource = aws.get_resource("dynamodb", max_pool_connections=settings.DYNAMODB_MAX_WORKERS)
+
+    print(f"{args.waves} waves of {args.requests} concurrent requests, {args.latency * 1000:.1f} ms per call, "
+          f"{dynamodb._executor._max_workers} workers")
+    measure("default botocore config", default_resource, server, args.requests, args.waves)
+    measure("client factory", factory_resource, server, args.requests, args.waves)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
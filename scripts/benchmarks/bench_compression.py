@@ -0,0 +1,156 @@
+"""
+Benchmark response compression.
+
+Sends JSON bodies shaped like ``/api/journal?limit=1000``, ``/api/ai/visualization_data``
+and ``/api/ai/chat/history`` through ``CompressionMiddleware`` once per
+content coding and reports, per request, the bytes on the wire, the CPU
+time of the process (including the compression threads) and the longest
+time a single step held the event loop.
+
+Usage:
+    python -m scripts.benchmarks.bench_compression --requests 50
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.core import middleware
+from backend.core.middleware import CompressionMiddleware
+from backend.core.responses import dumps
+
+CODINGS = ["identity", "gzip", "br", "zstd"]
+
+
+def journal_entries(count: int) -> List[dict]:
+    return [
+        {
+            "entry_id": f"entry-{i:06d}",
+            "user_id": "user-1",
+            "title": f"Evening entry {i}",
+            "content": "Went for a walk after work and felt calmer afterwards. " * 8,
+            "tags": ["walk", "work"] if i % 2 else ["sleep"],
+            "timestamp": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}T21:00:00",
+            "created_at": 1700000000 + i,
+            "updated_at": 1700000000 + i,
+        }
+        for i in range(count)
+    ]
+
+
+def mood_entries(count: int) -> List[dict]:
+    return [
+        {
+            "entry_id": f"entry-{i:06d}",
+            "user_id": "user-1",
+            "mood_rating": i % 10 + 1,
+            "tags": ["calm", "rested"] if i % 2 else ["anxious"],
+            "notes": "Slept well.",
+            "timestamp": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}T12:00:00",
+            "created_at": 1700000000 + i,
+            "updated_at": 1700000000 + i,
+        }
+        for i in range(count)
+    ]
+
+
+def chat_history(count: int) -> List[dict]:
+    return [
+        {
+            "message_id": f"message-{i:06d}",
+            "message": "Could you suggest something to help me wind down before bed?" if i % 2 else
+                       "Try a short breathing exercise: breathe in for four counts, hold, and breathe out slowly.",
+            "is_user": bool(i % 2),
+            "timestamp": f"2024-01-01T12:{i // 60 % 60:02d}:{i % 60:02d}",
+        }
+        for i in range(count)
+    ]
+
+
+PAYLOADS = [
+    ("/api/journal?limit=1000", dumps(journal_entries(1000))),
+    ("/api/ai/visualization_data", dumps(mood_entries(2000))),
+    ("/api/ai/chat/history", dumps(chat_history(100))),
+]
+
+
+def body_app(body: bytes):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [
+            (b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())
+        ]})
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+
+class LoopMonitor:
+    """Track the longest gap between ticks of the event loop."""
+
+    def __init__(self):
+        self.longest = 0.0
+        self._running = True
+
+    async def run(self):
+        last = time.perf_counter()
+        while self._running:
+            await asyncio.sleep(0)
+            now = time.perf_counter()
+            self.longest = max(self.longest, now - last)
+            last = now
+
+    def stop(self):
+        self._running = False
+
+
+async def request(app, coding: str) -> int:
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", coding.encode())]}
+    sent = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal sent
+        sent += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return sent
+
+
+async def measure(body: bytes, coding: str, requests: int):
+    app = CompressionMiddleware(body_app(body), encodings=[coding] if coding != "identity" else ["gzip"])
+    await request(app, coding)  # Warm up the compression pool
+    monitor = LoopMonitor()
+    ticker = asyncio.create_task(monitor.run())
+    cpu, wall = time.process_time(), time.perf_counter()
+    for _ in range(requests):
+        sent = await request(app, coding)
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    monitor.stop()
+    await ticker
+    return sent, cpu / requests, wall / requests, monitor.longest
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    available = set(middleware.available_encodings())
+    for path, body in PAYLOADS:
+        print(f"{path} ({len(body):,} bytes)")
+        for coding in CODINGS:
+            if coding != "identity" and coding not in available:
+                print(f"  {coding:<9} not available")
+                continue
+            sent, cpu, wall, blocked = await measure(body, coding, args.requests)
+            print(f"  {coding:<9} {sent:>11,} bytes on wire ({sent / len(body):6.1%})   "
+                  f"cpu {cpu * 1000:7.2f} ms   wall {wall * 1000:7.2f} ms   loop blocked {blocked * 1000:6.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+"""
+Benchmark deserialization of large Query responses.
+
+Builds wire-format responses of 10k mood entries, full and projected to the
+attributes ``get_mood_statistics`` reads, and times three steps for each
+read path:
+
+- decode: ``TypeDeserializer`` on every attribute, as the boto3 resource
+  does, vs. ``backend.db.wire.deserialize_item``
+- stats: summing the ratings (``Decimal`` vs. ``int``)
+- encode: FastAPI's ``jsonable_encoder`` on the items
+
+Usage:
+    python -m scripts.benchmarks.bench_deserializer --items 10000 --repeat 5
+"""
+import argparse
+import os
+import sys
+import time
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from fastapi.encoders import jsonable_encoder
+
+from backend.db import wire
+
+PROJECTION = ["mood_rating", "tags", "timestamp"]
+
+
+def build_items(count: int):
+    serializer = TypeSerializer()
+    items = []
+    for i in range(count):
+        item = {
+            "entry_id": f"entry-{i:06d}",
+            "user_id": "user-1",
+            "mood_rating": i % 10 + 1,
+            "notes": "Slept well, went for a walk in the afternoon.",
+            "tags": ["calm", "rested"] if i % 2 else ["anxious"],
+            "activities": ["walk", "reading"],
+            "timestamp": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}T12:00:00",
+            "created_at": 1700000000 + i,
+            "updated_at": 1700000000 + i,
+        }
+        items.append({name: serializer.serialize(value) for name, value in item.items()})
+    return items
+
+
+def resource_decode(items):
+    deserializer = TypeDeserializer()
+    return [{name: deserializer.deserialize(value) for name, value in item.items()} for item in items]
+
+
+def fast_decode(items):
+    numeric_fields = wire.NUMERIC_FIELDS["MoodEntries"]
+    return [wire.deserialize_item(item, numeric_fields) for item in items]
+
+
+def stats(items):
+    ratings = [item["mood_rating"] for item in items]
+    return sum(ratings) / len(ratings), max(ratings), min(ratings)
+
+
+def best_of(repeat: int, func, *args):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def measure(label: str, items, repeat: int) -> None:
+    print(f"{label} ({len(items)} items)")
+    for path, decode in (("resource", resource_decode), ("fast", fast_decode)):
+        decode_time, decoded = best_of(repeat, decode, items)
+        stats_time, _ = best_of(repeat, stats, decoded)
+        encode_time, _ = best_of(repeat, jsonable_encoder, decoded)
+        total = decode_time + stats_time + encode_time
+        print(f"  {path:<9} decode {decode_time * 1000:8.1f} ms   stats {stats_time * 1000:6.2f} ms   "
+              f"encode {encode_time * 1000:8.1f} ms   total {total * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    items = build_items(args.items)
+    projected = [{name: item[name] for name in PROJECTION} for item in items]
+    measure("Full items", items, args.repeat)
+    measure("Projected to " + ", ".join(PROJECTION), projected, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
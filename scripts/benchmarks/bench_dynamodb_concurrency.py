@@ -0,0 +1,67 @@
+"""
+Benchmark concurrent-request throughput of the DynamoDB data layer.
+
+Compares the old pattern (calling the synchronous boto3 table inside an
+``async def``) with the executor-backed ``backend.db.dynamodb.get_item``.
+A stand-in table sleeps for a fixed latency to model a network round trip,
+so the benchmark runs offline.
+
+Usage:
+    python -m scripts.benchmarks.bench_dynamodb_concurrency --requests 200 --latency 0.01
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.db import dynamodb
+
+
+class LatencyTable:
+    """Table stand-in that blocks for ``latency`` seconds per call."""
+
+    name = "LatencyTable"
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def get_item(self, Key, **kwargs):
+        time.sleep(self.latency)
+        return {"Item": dict(Key)}
+
+
+async def blocking_get_item(table, pk_value: str, pk_name: str):
+    """The pre-executor implementation: blocks the event loop for the whole call."""
+    response = table.get_item(Key={pk_name: pk_value})
+    return response.get("Item")
+
+
+async def run(get_item, table, requests: int) -> float:
+    """Issue ``requests`` concurrent reads and return requests per second."""
+    start = time.perf_counter()
+    await asyncio.gather(*(get_item(table, str(i), "entry_id") for i in range(requests)))
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.01, help="Simulated round trip in seconds")
+    args = parser.parse_args()
+
+    table = LatencyTable(args.latency)
+    before = asyncio.run(run(blocking_get_item, table, args.requests))
+    after = asyncio.run(run(dynamodb.get_item, table, args.requests))
+
+    print(f"{args.requests} concurrent requests, {args.latency * 1000:.1f} ms per round trip, "
+          f"{dynamodb._executor._max_workers} workers")
+    print(f"  before (blocking):  {before:10.1f} req/s")
+    print(f"  after  (executor):  {after:10.1f} req/s")
+    print(f"  speedup:            {after / before:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
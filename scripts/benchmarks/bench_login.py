@@ -0,0 +1,121 @@
+"""
+Benchmark login throughput and event-loop responsiveness under a login burst.
+
+Seeds users on the in-memory backend, then fires concurrent
+``POST /api/auth/login`` requests through the ASGI app while a probe calls
+``GET /api/health`` every 10 ms. It runs once with bcrypt verified inline on
+the event loop (the old behaviour) and once per hashing pool kind. For each
+run it reports login throughput and latency, how many logins got 503, and
+the probe delay, which shows how long other traffic stalls behind bcrypt.
+
+Usage:
+    python -m scripts.benchmarks.bench_login --users 20 --logins 200 --concurrency 50 --rounds 10
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# Must be set before the data layer is imported
+os.environ.setdefault("DYNAMODB_BACKEND", "memory")
+
+import httpx
+
+from backend.config import settings
+from backend.core import security
+from backend.main import app
+from backend.repositories import repositories
+from backend.services import auth_service
+
+PASSWORD = "benchmark-password"
+PROBE_INTERVAL = 0.01
+
+
+async def inline_verify(plain_password, hashed_password):
+    """The pre-pool implementation: bcrypt runs on the event loop."""
+    return security._verify_and_update(plain_password, hashed_password, await security._rounds())
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event, latencies: list) -> None:
+    """Every 10 ms, call the health check; record how late it completes beyond that."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        await client.get("/api/health")
+        latencies.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+
+async def burst(users: int, logins: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, probes, statuses = [], [], {}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def login(i: int):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post(
+                    "/api/auth/login", json={"email": f"login{i % users}@example.com", "password": PASSWORD}
+                )
+                latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        stop = asyncio.Event()
+        prober = asyncio.create_task(probe(client, stop, probes))
+        start = time.perf_counter()
+        await asyncio.gather(*(login(i) for i in range(logins)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await prober
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "rps": statuses.get(200, 0) / elapsed,
+        "p50": quantiles[49] * 1000,
+        "p99": quantiles[98] * 1000,
+        "rejected": statuses.get(503, 0),
+        "probe_p99": statistics.quantiles(probes, n=100, method="inclusive")[98] * 1000 if len(probes) > 1 else 0.0,
+        "probe_max": max(probes, default=0) * 1000,
+    }
+
+
+async def main_async(args):
+    settings.BCRYPT_ROUNDS = args.rounds
+    settings.PASSWORD_HASH_WORKERS = args.workers
+    password_hash = security.get_password_hash(PASSWORD)
+    for i in range(args.users):
+        await repositories.users.create({"email": f"login{i}@example.com", "password_hash": password_hash})
+
+    print(f"{args.logins} logins, {args.concurrency} concurrent, bcrypt cost {args.rounds}, "
+          f"{args.workers or os.cpu_count()} pool workers")
+    print(f"{'mode':<10}{'logins/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'503s':>7}{'stall p99 ms':>14}{'stall max ms':>14}")
+    for mode in ("inline", "thread", "process"):
+        settings.PASSWORD_HASH_EXECUTOR = "thread" if mode == "inline" else mode
+        security.shutdown_password_pool()
+        await security.start_password_pool()
+        if mode == "inline":
+            with patch.object(auth_service, "verify_and_update_password", inline_verify):
+                result = await burst(args.users, args.logins, args.concurrency)
+        else:
+            result = await burst(args.users, args.logins, args.concurrency)
+        print(f"{mode:<10}{result['rps']:>10.1f}{result['p50']:>10.1f}{result['p99']:>10.1f}"
+              f"{result['rejected']:>7}{result['probe_p99']:>14.1f}{result['probe_max']:>14.1f}")
+    security.shutdown_password_pool()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=10, help="bcrypt cost of the seeded hashes")
+    parser.add_argument("--workers", type=int, default=0, help="Hashing pool size; 0 uses one per CPU")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark the email lookup behind /api/auth/login as the Users table grows.
+
+Compares the old Scan + FilterExpression lookup with the EmailIndex query now
+used by ``backend.db.dynamodb.get_user_by_email``. The stand-in table charges
+one simulated round trip per page, with DynamoDB's 1 MB page size expressed
+as a number of user items, so the benchmark runs offline.
+
+Usage:
+    python -m scripts.benchmarks.bench_login_lookup --users 1000 10000 100000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.db import dynamodb
+
+
+class UsersTable:
+    """Users table stand-in with a hash index on email."""
+
+    name = "Users"
+
+    def __init__(self, users: int, latency: float, items_per_page: int):
+        self.latency = latency
+        self.items_per_page = items_per_page
+        self.items = [{"user_id": str(i), "email": f"user{i}@example.com"} for i in range(users)]
+        self.email_index = {item["email"]: item for item in self.items}
+
+    def scan(self, FilterExpression, ExpressionAttributeValues, ExclusiveStartKey=None):
+        time.sleep(self.latency)
+        start = ExclusiveStartKey["position"] if ExclusiveStartKey else 0
+        page = self.items[start:start + self.items_per_page]
+        email = ExpressionAttributeValues[":email"]
+        response = {"Items": [item for item in page if item["email"] == email]}
+        if start + self.items_per_page < len(self.items):
+            response["LastEvaluatedKey"] = {"position": start + self.items_per_page}
+        return response
+
+    def query(self, ExpressionAttributeValues, **kwargs):
+        time.sleep(self.latency)
+        item = self.email_index.get(ExpressionAttributeValues[":email"])
+        return {"Items": [item] if item else []}
+
+
+async def scan_lookup(table: UsersTable, email: str):
+    """The pre-index lookup, following every scan page until the user is found."""
+    scan_kwargs = {}
+    while True:
+        response = await dynamodb._run(
+            table.scan,
+            FilterExpression="email = :email",
+            ExpressionAttributeValues={":email": email},
+            **scan_kwargs
+        )
+        if response["Items"]:
+            return response["Items"][0]
+        if "LastEvaluatedKey" not in response:
+            return None
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+async def measure(lookup, table: UsersTable, email: str, repeat: int) -> float:
+    """Average latency of ``lookup`` in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        assert await lookup(table, email)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--latency", type=float, default=0.005, help="Simulated round trip in seconds")
+    parser.add_argument("--items-per-page", type=int, default=4000, help="Users per 1 MB scan page")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'users':>10} {'scan (ms)':>12} {'index (ms)':>12}")
+    for users in args.users:
+        table = UsersTable(users, args.latency, args.items_per_page)
+        # Worst case for the scan: the user is on the last page
+        email = f"user{users - 1}@example.com"
+
+        async def index_lookup(table, email):
+            with patch.object(dynamodb, "users_table", table):
+                return await dynamodb.get_user_by_email(email)
+
+        scan_ms = asyncio.run(measure(scan_lookup, table, email, args.repeat))
+        index_ms = asyncio.run(measure(index_lookup, table, email, args.repeat))
+        print(f"{users:>10} {scan_ms:>12.1f} {index_ms:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark JSON serialization of list responses.
+
+Times encoding 1k and 10k mood entries the ways an endpoint can:
+
+- response model, stdlib: validate against ``List[MoodResponse]``, dump to
+  dicts and ``json.dumps`` them, as FastAPI does with ``JSONResponse``
+- response model, orjson: the same, encoding with ``FastJSONResponse``
+- response model, one pass: ``backend.core.responses.serialize``, which
+  validates and dumps to JSON bytes through a cached TypeAdapter
+- raw items, stdlib: ``jsonable_encoder`` then ``json.dumps``, as FastAPI
+  does for endpoints without a response model (``/api/ai/visualization_data``)
+- raw items, orjson: ``FastJSONResponse`` on the items as read, with
+  ``Decimal`` numbers as the boto3 resource returns them
+
+Usage:
+    python -m scripts.benchmarks.bench_serialization --items 1000 10000 --repeat 5
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from decimal import Decimal
+from typing import List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from fastapi.encoders import jsonable_encoder
+
+from backend.core import responses
+from backend.schemas.mood import MoodResponse
+
+RESPONSE_TYPE = List[MoodResponse]
+
+
+def build_items(count: int):
+    return [
+        {
+            "entry_id": f"entry-{i:06d}",
+            "user_id": "user-1",
+            "mood_rating": Decimal(i % 10 + 1),
+            "notes": "Slept well, went for a walk in the afternoon.",
+            "tags": ["calm", "rested"] if i % 2 else ["anxious"],
+            "timestamp": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}T12:00:00",
+            "created_at": Decimal(1700000000 + i),
+            "updated_at": Decimal(1700000000 + i),
+        }
+        for i in range(count)
+    ]
+
+
+def stdlib_dumps(content) -> bytes:
+    # What starlette's JSONResponse.render does
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def model_stdlib(items) -> bytes:
+    adapter = responses.type_adapter(RESPONSE_TYPE)
+    return stdlib_dumps(adapter.dump_python(adapter.validate_python(items), mode="json"))
+
+
+def model_orjson(items) -> bytes:
+    adapter = responses.type_adapter(RESPONSE_TYPE)
+    return responses.dumps(adapter.dump_python(adapter.validate_python(items), mode="json"))
+
+
+def model_one_pass(items) -> bytes:
+    return responses.serialize(RESPONSE_TYPE, items)
+
+
+def raw_stdlib(items) -> bytes:
+    return stdlib_dumps(jsonable_encoder(items))
+
+
+def raw_orjson(items) -> bytes:
+    return responses.dumps(items)
+
+
+PATHS = [
+    ("response model, stdlib", model_stdlib),
+    ("response model, orjson", model_orjson),
+    ("response model, one pass", model_one_pass),
+    ("raw items, stdlib", raw_stdlib),
+    ("raw items, orjson", raw_orjson),
+]
+
+
+def best_of(repeat: int, func, *args):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"orjson {'installed' if responses.orjson else 'not installed; the fast paths use the stdlib'}")
+    for count in args.items:
+        items = build_items(count)
+        print(f"{count} items")
+        for label, encode in PATHS:
+            elapsed, body = best_of(args.repeat, encode, items)
+            print(f"  {label:<25} {elapsed * 1000:8.2f} ms   {count / elapsed:>12,.0f} items/s   {len(body):>10,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark resolving the current user from a bearer token.
+
+Calls ``backend.core.dependencies.get_current_user`` in a loop, cycling
+through the tokens of ``--users`` users on the in-memory backend, with the
+verified-token cache off and on, in both authentication modes: loading the
+user (through the warm user cache) and trusting the token claims. Reports
+resolutions per second, i.e. the per-request ceiling authentication imposes.
+
+Usage:
+    python -m scripts.benchmarks.bench_token_cache --users 100 --requests 50000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# Must be set before the data layer is imported
+os.environ.setdefault("DYNAMODB_BACKEND", "memory")
+
+from backend.config import settings
+from backend.core import security
+from backend.core.dependencies import get_current_user
+from backend.repositories import repositories
+from backend.services.auth_service import create_user_token
+
+
+async def resolve(headers: list, requests: int) -> float:
+    start = time.perf_counter()
+    for i in range(requests):
+        await get_current_user(headers[i % len(headers)])
+    return requests / (time.perf_counter() - start)
+
+
+async def main_async(args):
+    headers = []
+    for i in range(args.users):
+        user = await repositories.users.create({"email": f"token{i}@example.com", "password_hash": "-"})
+        headers.append(f"Bearer {await create_user_token(user['user_id'], user['email'])}")
+
+    print(f"{args.requests} resolutions over {args.users} tokens")
+    print(f"{'mode':<16}{'token cache':<14}{'req/s':>12}")
+    for trust_claims in (False, True):
+        for cache_entries in (0, settings.TOKEN_CACHE_MAX_ENTRIES):
+            cache = security.VerifiedTokenCache(cache_entries)
+            with patch.object(settings, "AUTH_TRUST_TOKEN_CLAIMS", trust_claims), \
+                 patch.object(security, "verified_tokens", cache):
+                await resolve(headers, len(headers))  # Warm the caches
+                rate = await resolve(headers, args.requests)
+            mode = "token claims" if trust_claims else "load user"
+            print(f"{mode:<16}{'on' if cache_entries else 'off':<14}{rate:>12.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=50000)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
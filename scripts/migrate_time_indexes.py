@@ -0,0 +1,142 @@
+"""
+Script to add the time-ordered GSIs to existing DynamoDB tables.
+
+Creates ``UserTimestampIndex`` (user_id, timestamp) on MoodEntries,
+JournalEntries and ChatHistory, and ``UserScheduledTimeIndex``
+(user_id, scheduled_time) on Reminders. It then backfills the sort attribute
+so every existing item is indexed and ordered correctly:
+
+- items without a sort attribute get one derived from ``created_at``
+- values with a ``Z`` suffix or a UTC offset are rewritten as naive UTC ISO
+  strings, the format the services now store
+
+The script is idempotent and can be re-run safely.
+"""
+import boto3
+import os
+import sys
+import time
+from datetime import datetime
+from dotenv import load_dotenv
+
+# Add the parent directory to the path so we can import from the backend package
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.core.utils import normalize_timestamp
+from backend.db.tables import TABLE_DEFINITIONS
+
+load_dotenv()
+
+# AWS settings
+aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID")
+aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY")
+aws_region = os.getenv("AWS_REGION", "us-east-1")
+dynamodb_endpoint = os.getenv("DYNAMODB_ENDPOINT")
+
+# Initialize DynamoDB client
+dynamodb_kwargs = {
+    "region_name": aws_region,
+    "aws_access_key_id": aws_access_key_id,
+    "aws_secret_access_key": aws_secret_access_key,
+}
+if dynamodb_endpoint:
+    dynamodb_kwargs["endpoint_url"] = dynamodb_endpoint
+
+dynamodb = boto3.resource("dynamodb", **dynamodb_kwargs)
+dynamodb_client = boto3.client("dynamodb", **dynamodb_kwargs)
+
+# Table name -> (index name, sort key, hash key of the base table)
+TIME_INDEXES = {
+    "MoodEntries": ("UserTimestampIndex", "timestamp", "entry_id"),
+    "JournalEntries": ("UserTimestampIndex", "timestamp", "entry_id"),
+    "ChatHistory": ("UserTimestampIndex", "timestamp", "message_id"),
+    "Reminders": ("UserScheduledTimeIndex", "scheduled_time", "reminder_id"),
+}
+
+def _table_definition(table_name: str) -> dict:
+    """Get the definition of a table."""
+    return next(t for t in TABLE_DEFINITIONS if t["TableName"] == table_name)
+
+def _wait_for_index(table_name: str, index_name: str) -> None:
+    """Wait until a GSI has finished building."""
+    while True:
+        description = dynamodb_client.describe_table(TableName=table_name)["Table"]
+        statuses = {
+            index["IndexName"]: index["IndexStatus"]
+            for index in description.get("GlobalSecondaryIndexes", [])
+        }
+        if statuses.get(index_name) == "ACTIVE":
+            return
+        print(f"  waiting for {table_name}.{index_name} ({statuses.get(index_name)})")
+        time.sleep(10)
+
+def create_index(table_name: str, index_name: str) -> None:
+    """Create a GSI on an existing table if it does not exist yet."""
+    description = dynamodb_client.describe_table(TableName=table_name)["Table"]
+    existing = {index["IndexName"] for index in description.get("GlobalSecondaryIndexes", [])}
+    if index_name in existing:
+        print(f"Index {table_name}.{index_name} already exists")
+        return
+
+    table_def = _table_definition(table_name)
+    index_def = next(i for i in table_def["GlobalSecondaryIndexes"] if i["IndexName"] == index_name)
+
+    update_kwargs = {
+        "TableName": table_name,
+        "AttributeDefinitions": table_def["AttributeDefinitions"],
+        "GlobalSecondaryIndexUpdates": [{"Create": index_def}],
+    }
+    # On-demand tables reject provisioned throughput on new indexes
+    if description.get("BillingModeSummary", {}).get("BillingMode") == "PAY_PER_REQUEST":
+        update_kwargs["GlobalSecondaryIndexUpdates"][0]["Create"] = {
+            k: v for k, v in index_def.items() if k != "ProvisionedThroughput"
+        }
+
+    dynamodb_client.update_table(**update_kwargs)
+    print(f"Index {table_name}.{index_name} creation started")
+    _wait_for_index(table_name, index_name)
+    print(f"Index {table_name}.{index_name} is active")
+
+def backfill(table_name: str, sort_key: str, hash_key: str) -> int:
+    """Set or normalize the sort attribute on every item of a table."""
+    table = dynamodb.Table(table_name)
+    updated = 0
+    scan_kwargs = {}
+
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response.get("Items", []):
+            value = item.get(sort_key)
+            if value:
+                new_value = normalize_timestamp(value)
+            elif "created_at" in item:
+                new_value = datetime.utcfromtimestamp(int(item["created_at"])).isoformat()
+            else:
+                continue
+
+            if new_value == value:
+                continue
+
+            table.update_item(
+                Key={hash_key: item[hash_key], "user_id": item["user_id"]},
+                UpdateExpression="SET #sort_key = :value",
+                ExpressionAttributeNames={"#sort_key": sort_key},
+                ExpressionAttributeValues={":value": new_value}
+            )
+            updated += 1
+
+        last_evaluated_key = response.get("LastEvaluatedKey")
+        if not last_evaluated_key:
+            return updated
+        scan_kwargs["ExclusiveStartKey"] = last_evaluated_key
+
+def migrate() -> None:
+    """Create the time-ordered indexes and backfill their sort attributes."""
+    for table_name, (index_name, sort_key, hash_key) in TIME_INDEXES.items():
+        updated = backfill(table_name, sort_key, hash_key)
+        print(f"Backfilled {updated} items in {table_name}")
+        create_index(table_name, index_name)
+
+if __name__ == "__main__":
+    migrate()
+    print("Migration completed successfully")